@@ -0,0 +1,11 @@
+from app.caches.hashed_redis import HashedRedisCache
+from app.caches.json_redis import ChunkSummaryCache, DocumentInfoCache, RedisJSONCache
+from app.caches.tiered import TieredCache
+
+__all__ = [
+    'ChunkSummaryCache',
+    'DocumentInfoCache',
+    'HashedRedisCache',
+    'RedisJSONCache',
+    'TieredCache',
+]
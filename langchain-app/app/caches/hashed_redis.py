@@ -0,0 +1,169 @@
+import hashlib
+import json
+import logging
+import zlib
+from typing import Any, Sequence
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from redis import Redis
+
+
+logger = logging.getLogger(__name__)
+
+
+class HashedRedisCache(BaseCache):
+    """
+    Redis-backed LLM cache storing compressed generations under compact, hashed keys.
+
+    Entries are keyed on `<namespace>:v<version>:<sha256(llm_string, prompt)>`, so keys have a
+    fixed size however long the prompt is, and bumping `version` invalidates every entry
+    written by a previous version. Generations are serialized with `langchain_core.load.dumps`
+    and compressed with zlib, and entries expire after `ttl` seconds (if set).
+
+    As `langchain_community.cache.RedisCache`, Redis failures are logged and treated as cache
+    misses, so an unavailable cache does not fail the generations.
+
+    Attributes
+    ----------
+    redis : Redis
+        The Redis client; it must not decode responses, as the values are binary.
+    namespace : str
+        The prefix shared by every key of the cache.
+    version : int
+        The version of the cache entries, part of every key.
+    ttl : int or None
+        The time to live of the entries, in seconds (None means no expiration).
+    compression_level : int
+        The zlib compression level of the stored generations.
+    """
+
+    DEFAULT_NAMESPACE = 'llm-cache'
+    DEFAULT_VERSION = 1
+    DEFAULT_TTL = 7 * 24 * 60 * 60  # one week
+    DEFAULT_COMPRESSION_LEVEL = 6
+
+    def __init__(
+        self,
+        redis_: Redis,
+        namespace: str = DEFAULT_NAMESPACE,
+        version: int = DEFAULT_VERSION,
+        ttl: int | None = DEFAULT_TTL,
+        compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+    ) -> None:
+        """
+        Initializes the HashedRedisCache.
+
+        Parameters
+        ----------
+        redis_ : Redis
+            The Redis client, created with `decode_responses=False`.
+        namespace : str, optional
+            The prefix shared by every key of the cache (default is 'llm-cache').
+        version : int, optional
+            The version of the cache entries; bump it to invalidate the cache (default is 1).
+        ttl : int or None, optional
+            The time to live of the entries, in seconds, or None for entries without
+            expiration (default is one week).
+        compression_level : int, optional
+            The zlib compression level, from 0 to 9 (default is 6).
+        """
+        self.redis = redis_
+        self.namespace = namespace
+        self.version = version
+        self.ttl = ttl
+        self.compression_level = compression_level
+
+    def get_key(self, prompt: str, llm_string: str) -> str:
+        """
+        Computes the key of the entry of a prompt and LLM configuration.
+
+        Parameters
+        ----------
+        prompt : str
+            The rendered prompt.
+        llm_string : str
+            The string representation of the LLM configuration.
+
+        Returns
+        -------
+        str
+            The cache key.
+        """
+        digest = hashlib.sha256()
+        digest.update(llm_string.encode())
+        digest.update(b'\0')
+        digest.update(prompt.encode())
+        return f"{self.namespace}:v{self.version}:{digest.hexdigest()}"
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        """
+        Looks up the generations cached for a prompt and LLM configuration.
+
+        Parameters
+        ----------
+        prompt : str
+            The rendered prompt.
+        llm_string : str
+            The string representation of the LLM configuration.
+
+        Returns
+        -------
+        RETURN_VAL_TYPE or None
+            The cached generations, or None on a cache miss.
+        """
+        try:
+            value = self.redis.get(self.get_key(prompt, llm_string))
+            return self._deserialize(value) if value is not None else None
+        except Exception as error:
+            logger.error("Hashed Redis cache lookup failed: %s", error)
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """
+        Caches the generations of a prompt and LLM configuration.
+
+        Parameters
+        ----------
+        prompt : str
+            The rendered prompt.
+        llm_string : str
+            The string representation of the LLM configuration.
+        return_val : RETURN_VAL_TYPE
+            The generations to cache.
+        """
+        try:
+            self.redis.set(
+                self.get_key(prompt, llm_string), self._serialize(return_val), ex=self.ttl
+            )
+        except Exception as error:
+            logger.error("Hashed Redis cache update failed: %s", error)
+
+    def clear(self, **kwargs: Any) -> None:
+        """
+        Deletes every entry of the namespace, whatever its version.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            Unused, accepted for compatibility with BaseCache.
+        """
+        try:
+            keys = []
+            for key in self.redis.scan_iter(match=f"{self.namespace}:*", count=1000):
+                keys.append(key)
+                if len(keys) >= 1000:
+                    self.redis.unlink(*keys)
+                    keys = []
+            if keys:
+                self.redis.unlink(*keys)
+        except Exception as error:
+            logger.error("Hashed Redis cache clear failed: %s", error)
+
+    def _serialize(self, return_val: Sequence) -> bytes:
+        payload = json.dumps([dumps(generation) for generation in return_val])
+        return zlib.compress(payload.encode(), level=self.compression_level)
+
+    def _deserialize(self, value: bytes) -> RETURN_VAL_TYPE:
+        payload = json.loads(zlib.decompress(value))
+        return [loads(generation) for generation in payload]
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import logging
+from typing import Any
+
+from redis.asyncio import Redis
+
+
+logger = logging.getLogger(__name__)
+
+
+class RedisJSONCache:
+    """
+    Redis-backed cache of JSON-serializable values, shared by every worker using the same Redis
+    server.
+
+    Entries are keyed on `<namespace>:v<version>:<digest>`, the digest covering every part of
+    the key passed to `get_key` (e.g. the text hash, the extraction model and the schema
+    version), and expire after `ttl` seconds (if set). Redis failures are logged and treated as
+    cache misses.
+
+    Attributes
+    ----------
+    redis : Redis
+        The asynchronous Redis client.
+    namespace : str
+        The prefix shared by every key of the cache.
+    version : int
+        The version of the cache entries, part of every key.
+    ttl : int or None
+        The time to live of the entries, in seconds (None means no expiration).
+    """
+
+    DEFAULT_NAMESPACE = 'json-cache'
+    DEFAULT_VERSION = 1
+    DEFAULT_TTL = 30 * 24 * 60 * 60  # thirty days
+
+    def __init__(
+        self,
+        redis_: Redis,
+        namespace: str = None,
+        version: int = DEFAULT_VERSION,
+        ttl: int | None = DEFAULT_TTL,
+    ) -> None:
+        """
+        Initializes the cache.
+
+        Parameters
+        ----------
+        redis_ : Redis
+            The asynchronous Redis client, created with `decode_responses=True`.
+        namespace : str, optional
+            The prefix shared by every key of the cache (default is None, which uses the
+            `DEFAULT_NAMESPACE` of the class).
+        version : int, optional
+            The version of the cache entries; bump it to invalidate the cache (default is 1).
+        ttl : int or None, optional
+            The time to live of the entries, in seconds, or None for entries without
+            expiration (default is thirty days).
+        """
+        self.redis = redis_
+        self.namespace = namespace or self.DEFAULT_NAMESPACE
+        self.version = version
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get_key(self, **key_parts: Any) -> str:
+        """
+        Computes the key of an entry from its JSON-serializable parts.
+
+        Parameters
+        ----------
+        **key_parts : dict
+            The values identifying the entry.
+
+        Returns
+        -------
+        str
+            The cache key.
+        """
+        digest = hashlib.sha256(json.dumps(key_parts, sort_keys=True).encode()).hexdigest()
+        return f"{self.namespace}:v{self.version}:{digest}"
+
+    async def get(self, key: str) -> Any:
+        """
+        Retrieves the value cached under a key.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        Any
+            The cached value, or None on a cache miss.
+        """
+        try:
+            value = await self.redis.get(key)
+        except Exception as error:
+            self.errors += 1
+            logger.error("%s lookup failed: %s", self.__class__.__name__, error)
+            return None
+
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    async def set(self, key: str, value: Any) -> None:
+        """
+        Caches a value under a key.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        value : Any
+            The JSON-serializable value to cache.
+        """
+        try:
+            await self.redis.set(key, json.dumps(value), ex=self.ttl)
+        except Exception as error:
+            self.errors += 1
+            logger.error("%s update failed: %s", self.__class__.__name__, error)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Reports the cache hits, misses and errors.
+
+        Returns
+        -------
+        dict[str, Any]
+            The cache statistics.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class DocumentInfoCache(RedisJSONCache):
+    """
+    Cache of the structured information extracted from documents (see RedisJSONCache).
+    """
+
+    DEFAULT_NAMESPACE = 'document-info'
+
+
+class ChunkSummaryCache(RedisJSONCache):
+    """
+    Cache of the summaries of document chunks, so unchanged chunks of a new revision of a
+    document are not summarized again (see RedisJSONCache).
+    """
+
+    DEFAULT_NAMESPACE = 'chunk-summary'
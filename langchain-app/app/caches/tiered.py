@@ -0,0 +1,179 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps
+
+
+class TieredCache(BaseCache):
+    """
+    LLM cache serving hot entries from a size-bounded, in-process LRU in front of a shared
+    backend cache (e.g. HashedRedisCache).
+
+    Lookups check the LRU first and fall back to the backend, promoting backend hits into the
+    LRU; updates are written to both tiers. The LRU is bounded by the (estimated) size of the
+    cached generations: the least recently used entries are evicted once `max_size_bytes` is
+    exceeded, and entries larger than the budget are only stored in the backend.
+
+    Local entries do not expire, so they may outlive the TTL of the backend entries until they
+    are evicted.
+
+    Attributes
+    ----------
+    backend : BaseCache
+        The shared cache backing the LRU.
+    max_size_bytes : int
+        The size budget of the LRU, in bytes.
+    """
+
+    DEFAULT_MAX_SIZE_BYTES = 64 * 1024 * 1024  # 64MB
+
+    def __init__(self, backend: BaseCache, max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES) -> None:
+        """
+        Initializes the TieredCache with an empty LRU.
+
+        Parameters
+        ----------
+        backend : BaseCache
+            The shared cache backing the LRU.
+        max_size_bytes : int, optional
+            The size budget of the LRU, in bytes (default is 64MB).
+        """
+        self.backend = backend
+        self.max_size_bytes = max_size_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[bytes, tuple[RETURN_VAL_TYPE, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        """
+        Looks up the generations cached for a prompt and LLM configuration.
+
+        Parameters
+        ----------
+        prompt : str
+            The rendered prompt.
+        llm_string : str
+            The string representation of the LLM configuration.
+
+        Returns
+        -------
+        RETURN_VAL_TYPE or None
+            The cached generations, or None on a miss of both tiers.
+        """
+        key = self._get_key(prompt, llm_string)
+        return_val = self._lookup_local(key)
+        if return_val is None:
+            return_val = self._promote(key, self.backend.lookup(prompt, llm_string))
+        return return_val
+
+    async def alookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        key = self._get_key(prompt, llm_string)
+        return_val = self._lookup_local(key)
+        if return_val is None:
+            return_val = self._promote(key, await self.backend.alookup(prompt, llm_string))
+        return return_val
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """
+        Caches the generations of a prompt and LLM configuration in both tiers.
+
+        Parameters
+        ----------
+        prompt : str
+            The rendered prompt.
+        llm_string : str
+            The string representation of the LLM configuration.
+        return_val : RETURN_VAL_TYPE
+            The generations to cache.
+        """
+        self._store_local(self._get_key(prompt, llm_string), return_val)
+        self.backend.update(prompt, llm_string, return_val)
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self._store_local(self._get_key(prompt, llm_string), return_val)
+        await self.backend.aupdate(prompt, llm_string, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        """
+        Clears both tiers.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            Keyword arguments passed to the `clear` method of the backend.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+        self.backend.clear(**kwargs)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Reports the LRU usage, hits, misses and evictions.
+
+        Returns
+        -------
+        dict[str, Any]
+            The cache statistics.
+        """
+        lookups = self.hits + self.backend_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'size_bytes': self.size_bytes,
+            'max_size_bytes': self.max_size_bytes,
+            'hits': self.hits,
+            'backend_hits': self.backend_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'local_hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+    def _get_key(self, prompt: str, llm_string: str) -> bytes:
+        digest = hashlib.sha256()
+        digest.update(llm_string.encode())
+        digest.update(b'\0')
+        digest.update(prompt.encode())
+        return digest.digest()
+
+    def _lookup_local(self, key: bytes) -> RETURN_VAL_TYPE | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _promote(self, key: bytes, return_val: RETURN_VAL_TYPE | None) -> RETURN_VAL_TYPE | None:
+        with self._lock:
+            if return_val is None:
+                self.misses += 1
+            else:
+                self.backend_hits += 1
+        if return_val is not None:
+            self._store_local(key, return_val)
+        return return_val
+
+    def _store_local(self, key: bytes, return_val: RETURN_VAL_TYPE) -> None:
+        size = len(key) + sum(len(dumps(generation)) for generation in return_val)
+        if size > self.max_size_bytes:
+            return
+
+        with self._lock:
+            previous_entry = self._entries.pop(key, None)
+            if previous_entry is not None:
+                self.size_bytes -= previous_entry[1]
+            self._entries[key] = (return_val, size)
+            self.size_bytes += size
+
+            while self.size_bytes > self.max_size_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_size
+                self.evictions += 1
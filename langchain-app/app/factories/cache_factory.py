@@ -1,13 +1,26 @@
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
 
 from langchain_core.caches import BaseCache
 from langchain_community.cache import RedisCache
 
+from app.caches import (
+    ChunkSummaryCache,
+    DocumentInfoCache,
+    HashedRedisCache,
+    RedisJSONCache,
+    TieredCache,
+)
+from app.resources import get_or_create_resource
+
 
 class CacheFactory:
     """
     Factory class for creating cache instances.
 
+    Caches are shared through the application resource registry, so creating the same cache
+    configuration twice returns the same instance (and the same connection pool).
+
     Attributes
     ----------
     available_caches : dict
@@ -17,22 +30,27 @@ class CacheFactory:
     def __init__(self):
         self.available_caches = {
             'redis': self._get_redis_cache,
+            'hashed-redis': self._get_hashed_redis_cache,
+            'tiered': self._get_tiered_cache,
+            'document-info': self._get_document_info_cache,
+            'chunk-summary': self._get_chunk_summary_cache,
         }
 
-    def create(self, cache: str, **kwargs) -> BaseCache:
+    def create(self, cache: str, **kwargs) -> BaseCache | RedisJSONCache:
         """
         Create a cache instance based on the specified cache type.
 
         Parameters
         ----------
         cache : str
-            The cache type to create (e.g., 'redis').
+            The cache type to create (e.g., 'redis', 'hashed-redis' or 'tiered' for LLM caches,
+            'document-info' and 'chunk-summary' for the caches of the summarizers).
         **kwargs : dict
             Additional keyword arguments passed to the cache factory method.
 
         Returns
         -------
-        BaseCache
+        BaseCache or RedisJSONCache
             The cache instance created.
 
         Raises
@@ -50,7 +68,9 @@ class CacheFactory:
                 f"Invalid cache type '{cache}'. "
                 f"Valid cache types are: {self.get_valid_cache_types()}"
             )
-        return self.available_caches[cache](**kwargs)
+        return get_or_create_resource(
+            'cache', lambda: self.available_caches[cache](**kwargs), cache, **kwargs
+        )
 
     def _get_redis_cache(
         self,
@@ -78,9 +98,159 @@ class CacheFactory:
         RedisCache
             A RedisCache instance.
         """
-        return RedisCache(
-            redis_=Redis(host=host, port=port, decode_responses=decode_responses),
-            **kwargs,
+        redis_client = self._get_redis_client(
+            host=host, port=port, decode_responses=decode_responses
+        )
+        return RedisCache(redis_=redis_client, **kwargs)
+
+    def _get_hashed_redis_cache(self, host: str, port: int, **kwargs) -> HashedRedisCache:
+        """
+        Creates a Redis cache instance storing compressed generations under hashed keys.
+
+        Parameters
+        ----------
+        host : str
+            The Redis server hostname.
+        port : int
+            The Redis server port.
+        **kwargs : dict
+            Additional keyword arguments for configuring the cache (e.g., `ttl`, `namespace`
+            and `version`).
+
+        Returns
+        -------
+        HashedRedisCache
+            A HashedRedisCache instance.
+        """
+        redis_client = self._get_redis_client(host=host, port=port, decode_responses=False)
+        return HashedRedisCache(redis_=redis_client, **kwargs)
+
+    def _get_tiered_cache(
+        self,
+        host: str,
+        port: int,
+        max_size_bytes: int = TieredCache.DEFAULT_MAX_SIZE_BYTES,
+        backend: str = 'hashed-redis',
+        **kwargs
+    ) -> TieredCache:
+        """
+        Creates a cache serving hot entries from an in-process LRU in front of a Redis cache.
+
+        Parameters
+        ----------
+        host : str
+            The Redis server hostname.
+        port : int
+            The Redis server port.
+        max_size_bytes : int, optional
+            The size budget of the in-process LRU, in bytes (default is 64MB).
+        backend : str, optional
+            The cache type backing the LRU (default is 'hashed-redis').
+        **kwargs : dict
+            Additional keyword arguments for configuring the backend cache.
+
+        Returns
+        -------
+        TieredCache
+            A TieredCache instance.
+        """
+        return TieredCache(
+            backend=self.create(cache=backend, host=host, port=port, **kwargs),
+            max_size_bytes=max_size_bytes,
+        )
+
+    def _get_document_info_cache(self, host: str, port: int, **kwargs) -> DocumentInfoCache:
+        """
+        Creates a Redis cache of the structured information extracted from documents.
+
+        Parameters
+        ----------
+        host : str
+            The Redis server hostname.
+        port : int
+            The Redis server port.
+        **kwargs : dict
+            Additional keyword arguments for configuring the cache (e.g., `ttl`, `namespace`
+            and `version`).
+
+        Returns
+        -------
+        DocumentInfoCache
+            A DocumentInfoCache instance.
+        """
+        return DocumentInfoCache(redis_=self._get_async_redis_client(host, port), **kwargs)
+
+    def _get_chunk_summary_cache(self, host: str, port: int, **kwargs) -> ChunkSummaryCache:
+        """
+        Creates a Redis cache of the summaries of document chunks.
+
+        Parameters
+        ----------
+        host : str
+            The Redis server hostname.
+        port : int
+            The Redis server port.
+        **kwargs : dict
+            Additional keyword arguments for configuring the cache (e.g., `ttl`, `namespace`
+            and `version`).
+
+        Returns
+        -------
+        ChunkSummaryCache
+            A ChunkSummaryCache instance.
+        """
+        return ChunkSummaryCache(redis_=self._get_async_redis_client(host, port), **kwargs)
+
+    def _get_async_redis_client(self, host: str, port: int) -> AsyncRedis:
+        """
+        Retrieves the asynchronous Redis client (and connection pool) shared by the caches of a
+        server, decoding responses.
+
+        Parameters
+        ----------
+        host : str
+            The Redis server hostname.
+        port : int
+            The Redis server port.
+
+        Returns
+        -------
+        AsyncRedis
+            The asynchronous Redis client.
+        """
+        return get_or_create_resource(
+            'redis',
+            lambda: AsyncRedis(host=host, port=port, decode_responses=True),
+            host=host,
+            port=port,
+            decode_responses=True,
+            asynchronous=True,
+        )
+
+    def _get_redis_client(self, host: str, port: int, decode_responses: bool) -> Redis:
+        """
+        Retrieves the Redis client (and connection pool) shared by the caches of a server.
+
+        Parameters
+        ----------
+        host : str
+            The Redis server hostname.
+        port : int
+            The Redis server port.
+        decode_responses : bool
+            Whether to decode responses from Redis.
+
+        Returns
+        -------
+        Redis
+            The Redis client.
+        """
+        return get_or_create_resource(
+            'redis',
+            lambda: Redis(host=host, port=port, decode_responses=decode_responses),
+            host=host,
+            port=port,
+            decode_responses=decode_responses,
         )
 
     def get_valid_cache_types(self) -> list[str]:
@@ -3,11 +3,16 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_google_vertexai import ChatVertexAI
 from langchain_ollama import ChatOllama
 
+from app.resources import get_or_create_resource
+
 
 class ChatModelFactory:
     """
     Factory class for creating chat model instances.
 
+    Chat models are shared through the application resource registry, so their HTTP clients are
+    reused by every request asking for the same model configuration.
+
     Attributes
     ----------
     available_chatmodels : dict
@@ -52,7 +57,9 @@ class ChatModelFactory:
                 f"Invalid chat model '{chatmodel}'. "
                 f"Valid chat models are: {self.get_valid_chat_models()}"
             )
-        return self.available_chatmodels[chatmodel](**kwargs)
+        return get_or_create_resource(
+            'chatmodel', lambda: self.available_chatmodels[chatmodel](**kwargs), chatmodel, **kwargs
+        )
 
     def get_valid_chat_models(self) -> list[str]:
         """
@@ -1,4 +1,9 @@
-from app.strategies.execution import BaseExecutionStrategy, InvokeStrategy, StreamingStrategy
+from app.strategies.execution import (
+    BaseExecutionStrategy,
+    InvokeStrategy,
+    PipelinedStreamingStrategy,
+    StreamingStrategy,
+)
 
 
 class ExecutionStrategyFactory:
@@ -15,6 +20,7 @@ class ExecutionStrategyFactory:
         self.available_execution_strategies = {
             'stream': StreamingStrategy,
             'invoke': InvokeStrategy,
+            'pipelined-stream': PipelinedStreamingStrategy,
         }
 
     def create(self, strategy: str, **kwargs) -> BaseExecutionStrategy:
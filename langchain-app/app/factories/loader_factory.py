@@ -1,26 +1,69 @@
 from langchain_core.document_loaders import BaseLoader
 from langchain_community.document_loaders import PyMuPDFLoader
 from langchain_community.document_loaders.generic import GenericLoader
-from langchain_community.document_loaders.parsers.audio import FasterWhisperParser
+
+from app.loaders import (
+    CachedFasterWhisperParser,
+    ParallelPyMuPDFLoader,
+    RemoteSegmentedTranscriptionLoader,
+    RemoteTranscriptionLoader,
+    SegmentedTranscriptionLoader,
+)
 
 
 class LoaderFactory:
     """
     Factory class for creating document loader instances based on the file type (MIME type).
 
+    Every MIME type has a default loader, which can be replaced by any other loader supporting
+    the MIME type, either for a single loader or for every loader of the factory.
+
     Attributes
     ----------
-    loader_from_mime_type : dict
-        A dictionary mapping MIME types (str) to their respective loader factory methods.
+    available_loaders : dict
+        A dictionary mapping loader names (str) to their respective loader factory methods.
+    mime_types_from_loader : dict
+        A dictionary mapping loader names (str) to the MIME types they support.
+    default_loader_from_mime_type : dict
+        A dictionary mapping MIME types (str) to the name of their default loader.
     """
 
-    def __init__(self):
-        self.loader_from_mime_type = {
-            'application/pdf': self._get_pdf_loader,
-            'video/mp4': self._get_audio_loader,
+    DEFAULT_LOADER_FROM_MIME_TYPE = {
+        'application/pdf': 'parallel-pymupdf',
+        'video/mp4': 'remote-whisper',
+    }
+
+    def __init__(self, default_loaders: dict[str, str] = None):
+        """
+        Initializes the LoaderFactory.
+
+        Parameters
+        ----------
+        default_loaders : dict[str, str], optional
+            A dictionary mapping MIME types to the name of their default loader, overriding the
+            `DEFAULT_LOADER_FROM_MIME_TYPE` of the corresponding MIME types (default is None).
+        """
+        self.available_loaders = {
+            'pymupdf': self._get_pdf_loader,
+            'parallel-pymupdf': self._get_parallel_pdf_loader,
+            'faster-whisper': self._get_audio_loader,
+            'remote-whisper': self._get_remote_audio_loader,
+            'segmented-whisper': self._get_segmented_audio_loader,
+            'remote-segmented-whisper': self._get_remote_segmented_audio_loader,
+        }
+        self.mime_types_from_loader = {
+            'pymupdf': ['application/pdf'],
+            'parallel-pymupdf': ['application/pdf'],
+            'faster-whisper': ['video/mp4'],
+            'remote-whisper': ['video/mp4'],
+            'segmented-whisper': ['video/mp4'],
+            'remote-segmented-whisper': ['video/mp4'],
+        }
+        self.default_loader_from_mime_type = {
+            **self.DEFAULT_LOADER_FROM_MIME_TYPE, **(default_loaders or {})
         }
 
-    def create(self, file_type: str, file_path: str, **kwargs) -> BaseLoader:
+    def create(self, file_type: str, file_path: str, loader: str = None, **kwargs) -> BaseLoader:
         """
         Create a document loader instance based on the specified file type (MIME type).
 
@@ -30,6 +73,9 @@ class LoaderFactory:
             The MIME type of the file (e.g., 'application/pdf').
         file_path : str
             The path to the file that needs to be loaded.
+        loader : str, optional
+            The name of the loader (e.g., 'pymupdf'), which must support the file type (default
+            is None, which uses the default loader of the file type).
         **kwargs : dict
             Additional keyword arguments passed to the loader class.
 
@@ -41,19 +87,31 @@ class LoaderFactory:
         Raises
         ------
         ValueError
-            If the specified file type is not valid.
+            If the specified file type or loader is not valid, or if the loader does not support
+            the file type.
 
         Examples
         --------
         >>> factory = LoaderFactory()
         >>> loader = factory.create('application/pdf', '/path/to/file.pdf')
+        >>> loader = factory.create('application/pdf', '/path/to/file.pdf', loader='pymupdf')
         """
-        if file_type not in self.loader_from_mime_type:
+        if file_type not in self.default_loader_from_mime_type:
             raise ValueError(
                 f"Invalid file type '{file_type}'. "
                 f"Valid file types are: {self.get_valid_mime_types()}"
             )
-        return self.loader_from_mime_type[file_type](file_path=file_path, **kwargs)
+        loader = loader or self.default_loader_from_mime_type[file_type]
+        if loader not in self.available_loaders:
+            raise ValueError(
+                f"Invalid loader '{loader}'. Valid loaders are: {self.get_valid_loaders()}"
+            )
+        if file_type not in self.mime_types_from_loader[loader]:
+            raise ValueError(
+                f"Loader '{loader}' does not support the file type '{file_type}'. "
+                f"Valid loaders are: {self.get_valid_loaders(file_type=file_type)}"
+            )
+        return self.available_loaders[loader](file_path=file_path, **kwargs)
 
     def _get_pdf_loader(self, file_path: str, **kwargs) -> PyMuPDFLoader:
         """
@@ -73,18 +131,49 @@ class LoaderFactory:
         """
         return PyMuPDFLoader(file_path=file_path, **kwargs)
 
-    def _get_audio_loader(self, file_path: str, model_size: str = 'large-v3') -> GenericLoader:
+    def _get_parallel_pdf_loader(self, file_path: str, **kwargs) -> ParallelPyMuPDFLoader:
+        """
+        Creates a ParallelPyMuPDFLoader instance for parsing the pages of PDF documents in
+        parallel.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the PDF file.
+        **kwargs : dict
+            Additional keyword arguments for configuring the loader.
+
+        Returns
+        -------
+        ParallelPyMuPDFLoader
+            The loader instance for handling PDF documents.
+        """
+        return ParallelPyMuPDFLoader(file_path=file_path, **kwargs)
+
+    def _get_audio_loader(
+        self,
+        file_path: str,
+        model_size: str = CachedFasterWhisperParser.DEFAULT_MODEL_SIZE,
+        device: str = CachedFasterWhisperParser.DEFAULT_DEVICE,
+        compute_type: str = CachedFasterWhisperParser.DEFAULT_COMPUTE_TYPE,
+    ) -> GenericLoader:
         """
         Creates a GenericLoader instance for loading audio files.
 
-        The audio files are processed using the FasterWhisperParser.
+        The audio files are processed using the CachedFasterWhisperParser, which reuses the
+        transcription models loaded by the process.
 
         Parameters
         ----------
         file_path : str
             The path to the audio file.
         model_size : str, optional
-            The model size for the FasterWhisperParser (default is 'large-v3').
+            The model size for the CachedFasterWhisperParser (default is 'large-v3').
+        device : str, optional
+            The device running the model: 'cpu', 'cuda' or 'auto' (default is 'auto').
+        compute_type : str, optional
+            The type of the model weights during the computation, e.g. 'int8' (default is
+            'default').
 
         Returns
         -------
@@ -93,9 +182,93 @@ class LoaderFactory:
         """
         return GenericLoader.from_filesystem(
             path=file_path,
-            parser=FasterWhisperParser(model_size=model_size),
+            parser=CachedFasterWhisperParser(
+                model_size=model_size, device=device, compute_type=compute_type
+            ),
         )
 
+    def _get_remote_audio_loader(self, file_path: str, **kwargs) -> RemoteTranscriptionLoader:
+        """
+        Creates a RemoteTranscriptionLoader instance for transcribing audio files with the
+        transcription server.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the audio file.
+        **kwargs : dict
+            Additional keyword arguments for configuring the loader (e.g. `base_url`).
+
+        Returns
+        -------
+        RemoteTranscriptionLoader
+            The loader instance for handling audio files.
+        """
+        return RemoteTranscriptionLoader(file_path=file_path, **kwargs)
+
+    def _get_segmented_audio_loader(
+        self,
+        file_path: str,
+        model_size: str = CachedFasterWhisperParser.DEFAULT_MODEL_SIZE,
+        device: str = CachedFasterWhisperParser.DEFAULT_DEVICE,
+        compute_type: str = CachedFasterWhisperParser.DEFAULT_COMPUTE_TYPE,
+        **kwargs,
+    ) -> SegmentedTranscriptionLoader:
+        """
+        Creates a SegmentedTranscriptionLoader instance for transcribing long audio files as
+        segments transcribed in parallel.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the audio file.
+        model_size : str, optional
+            The model size of the CachedFasterWhisperParser (default is 'large-v3').
+        device : str, optional
+            The device running the model: 'cpu', 'cuda' or 'auto' (default is 'auto').
+        compute_type : str, optional
+            The type of the model weights during the computation, e.g. 'int8' (default is
+            'default').
+        **kwargs : dict
+            Additional keyword arguments for configuring the loader (e.g. `max_segment_seconds`).
+
+        Returns
+        -------
+        SegmentedTranscriptionLoader
+            The loader instance for handling audio files.
+        """
+        return SegmentedTranscriptionLoader(
+            file_path=file_path,
+            parser=CachedFasterWhisperParser(
+                model_size=model_size, device=device, compute_type=compute_type
+            ),
+            **kwargs,
+        )
+
+    def _get_remote_segmented_audio_loader(
+        self,
+        file_path: str,
+        **kwargs,
+    ) -> RemoteSegmentedTranscriptionLoader:
+        """
+        Creates a RemoteSegmentedTranscriptionLoader instance for transcribing long audio files
+        as segments transcribed concurrently by the transcription server.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the audio file.
+        **kwargs : dict
+            Additional keyword arguments for configuring the loader (e.g. `base_url` or
+            `max_segment_seconds`).
+
+        Returns
+        -------
+        RemoteSegmentedTranscriptionLoader
+            The loader instance for handling audio files.
+        """
+        return RemoteSegmentedTranscriptionLoader(file_path=file_path, **kwargs)
+
     def get_valid_mime_types(self) -> list[str]:
         """
         Get a list of valid MIME types that can be used to create loaders.
@@ -105,5 +278,24 @@ class LoaderFactory:
         list[str]
             A list of valid MIME type keys.
         """
-        return list(self.loader_from_mime_type.keys())
+        return list(self.default_loader_from_mime_type.keys())
+
+    def get_valid_loaders(self, file_type: str = None) -> list[str]:
+        """
+        Get a list of valid loaders, optionally restricted to those supporting a MIME type.
+
+        Parameters
+        ----------
+        file_type : str, optional
+            The MIME type the loaders must support (default is None, which lists every loader).
+
+        Returns
+        -------
+        list[str]
+            A list of valid loader keys.
+        """
+        return [
+            loader for loader, mime_types in self.mime_types_from_loader.items()
+            if file_type is None or file_type in mime_types
+        ]
 
@@ -1,3 +1,5 @@
+from app.resources import get_or_create_resource
+from app.storage.async_mongodb import AsyncMongoDBStoreManager
 from app.storage.mongodb import MongoDBStoreManager
 
 
@@ -5,6 +7,9 @@ class StoreManagerFactory:
     """
     Factory class for creating store manager instances.
 
+    Store managers are shared through the application resource registry, so their database
+    connection pools are reused across requests.
+
     Attributes
     ----------
     store_managers : dict
@@ -14,6 +19,7 @@ class StoreManagerFactory:
     def __init__(self):
         self.store_managers = {
             'mongodb': MongoDBStoreManager,
+            'async-mongodb': AsyncMongoDBStoreManager,
         }
 
     def create(self, store_manager: str, **kwargs):
@@ -47,7 +53,12 @@ class StoreManagerFactory:
                 f"Invalid store manager '{store_manager}'. "
                 f"Valid store managers are: {self.get_valid_store_managers()}"
             )
-        return self.store_managers[store_manager](**kwargs)
+        return get_or_create_resource(
+            'store_manager',
+            lambda: self.store_managers[store_manager](**kwargs),
+            store_manager,
+            **kwargs,
+        )
 
     def get_valid_store_managers(self) -> list[str]:
         """
@@ -0,0 +1,6 @@
+from app.ingestion.upload import SpooledUpload, spool_upload
+
+__all__ = [
+    'SpooledUpload',
+    'spool_upload',
+]
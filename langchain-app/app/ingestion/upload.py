@@ -0,0 +1,104 @@
+import hashlib
+import os
+from tempfile import NamedTemporaryFile
+
+import magic
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+
+DEFAULT_CHUNK_SIZE_IN_BYTES = 1024 * 1024  # 1MB
+DEFAULT_SNIFF_SIZE_IN_BYTES = 8 * 1024  # libmagic only needs the first few KB of a file
+
+
+class SpooledUpload:
+    """
+    An uploaded file copied to disk, along with the information gathered while copying it.
+
+    Attributes
+    ----------
+    file_name : str
+        The name of the file as sent by the client.
+    file_path : str
+        The path of the temporary file holding the uploaded bytes.
+    mime_type : str
+        The MIME type sniffed from the first bytes of the upload.
+    content_hash : str
+        The SHA-256 hex digest of the uploaded bytes.
+    size : int
+        The size of the upload in bytes.
+    """
+
+    def __init__(
+        self,
+        file_name: str,
+        file_path: str,
+        mime_type: str,
+        content_hash: str,
+        size: int,
+    ) -> None:
+        self.file_name = file_name
+        self.file_path = file_path
+        self.mime_type = mime_type
+        self.content_hash = content_hash
+        self.size = size
+
+    def cleanup(self) -> None:
+        """
+        Removes the temporary file holding the uploaded bytes, if it still exists.
+        """
+        try:
+            os.remove(self.file_path)
+        except FileNotFoundError:
+            pass
+
+
+async def spool_upload(
+    file: UploadFile,
+    chunk_size: int = DEFAULT_CHUNK_SIZE_IN_BYTES,
+    sniff_size: int = DEFAULT_SNIFF_SIZE_IN_BYTES,
+) -> SpooledUpload:
+    """
+    Copies an uploaded file to a temporary file on disk in fixed-size chunks.
+
+    The MIME type is sniffed from the first `sniff_size` bytes and the content hash is computed
+    incrementally while the chunks are written, so the upload is never fully held in memory.
+
+    Parameters
+    ----------
+    file : UploadFile
+        The file received by the endpoint.
+    chunk_size : int, optional
+        The number of bytes read from the upload at a time (default is 1MB).
+    sniff_size : int, optional
+        The number of leading bytes used to detect the MIME type (default is 8KB).
+
+    Returns
+    -------
+    SpooledUpload
+        The spooled upload, pointing to a temporary file that must be removed with `cleanup`.
+    """
+    hasher = hashlib.sha256()
+    head = b""
+    size = 0
+
+    with NamedTemporaryFile(delete=False) as tmp_file:
+        try:
+            while chunk := await file.read(chunk_size):
+                if len(head) < sniff_size:
+                    head += chunk[:sniff_size - len(head)]
+                hasher.update(chunk)
+                size += len(chunk)
+                await run_in_threadpool(tmp_file.write, chunk)
+        except BaseException:
+            tmp_file.close()
+            os.remove(tmp_file.name)
+            raise
+
+    return SpooledUpload(
+        file_name=file.filename,
+        file_path=tmp_file.name,
+        mime_type=magic.from_buffer(head, mime=True),
+        content_hash=hasher.hexdigest(),
+        size=size,
+    )
@@ -0,0 +1,216 @@
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+from app.models import JobStatus
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the job queue is full."""
+    pass
+
+
+class Job:
+    """
+    A unit of work submitted to the JobManager.
+
+    Attributes
+    ----------
+    job_id : str
+        The unique identifier of the job.
+    status : str
+        The job status: 'queued', 'running', 'completed' or 'failed'.
+    result : Any
+        The value returned by the job, once completed.
+    error : str
+        The error message, if the job failed.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[], Awaitable[Any]],
+        on_finish: Callable[[], None] | None = None,
+    ) -> None:
+        self.job_id = uuid.uuid4().hex
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at = None
+        self.finished_at = None
+        self._run = run
+        self._on_finish = on_finish
+
+    def get_status(self) -> JobStatus:
+        """
+        Describes the current state of the job.
+
+        Returns
+        -------
+        JobStatus
+            The job status, along with its result or error when finished.
+        """
+        return JobStatus(
+            job_id=self.job_id,
+            status=self.status,
+            result=self.result,
+            error=self.error,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+        )
+
+
+class JobManager:
+    """
+    Runs submitted jobs in the background with a fixed number of workers and a bounded queue.
+
+    Submitting a job while the queue is full raises `JobQueueFullError`, so bursts are rejected
+    instead of piling up an unbounded number of in-flight jobs.
+
+    Attributes
+    ----------
+    max_workers : int
+        The number of jobs executed concurrently.
+    max_queue_size : int
+        The maximum number of jobs waiting for a worker.
+    max_finished_jobs : int
+        The number of finished jobs kept around so their results can be retrieved.
+    """
+
+    DEFAULT_MAX_WORKERS = 2
+    DEFAULT_MAX_QUEUE_SIZE = 32
+    DEFAULT_MAX_FINISHED_JOBS = 1024
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        max_finished_jobs: int = DEFAULT_MAX_FINISHED_JOBS,
+    ) -> None:
+        """
+        Initializes the JobManager without starting its workers.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            The number of jobs executed concurrently (default is 2).
+        max_queue_size : int, optional
+            The maximum number of jobs waiting for a worker (default is 32).
+        max_finished_jobs : int, optional
+            The number of finished jobs kept for retrieval (default is 1024).
+        """
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs: OrderedDict[str, Job] = OrderedDict()
+        self._queue: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        """
+        Starts the workers in the running event loop.
+        """
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self.max_workers)
+        ]
+
+    async def aclose(self) -> None:
+        """
+        Cancels the workers; jobs still queued or running are marked as failed.
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        while self._queue is not None and not self._queue.empty():
+            self._finish(self._queue.get_nowait(), error='The application shut down')
+
+    def submit(
+        self,
+        run: Callable[[], Awaitable[Any]],
+        on_finish: Callable[[], None] | None = None,
+    ) -> Job:
+        """
+        Queues a job to be executed by the next available worker.
+
+        Parameters
+        ----------
+        run : Callable[[], Awaitable[Any]]
+            A coroutine function executing the job and returning its result.
+        on_finish : Callable[[], None], optional
+            A callable invoked once the job finished, whatever the outcome (default is None).
+
+        Returns
+        -------
+        Job
+            The queued job.
+
+        Raises
+        ------
+        JobQueueFullError
+            If the queue already holds `max_queue_size` jobs.
+        """
+        self.start()
+        job = Job(run=run, on_finish=on_finish)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFullError(
+                f"The job queue is full ({self.max_queue_size} jobs waiting)"
+            ) from None
+        self.jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """
+        Retrieves a job by its ID.
+
+        Parameters
+        ----------
+        job_id : str
+            The ID of the job.
+
+        Returns
+        -------
+        Job or None
+            The job, or None if it does not exist or was already discarded.
+        """
+        return self.jobs.get(job_id)
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = 'running'
+            job.started_at = datetime.now(timezone.utc)
+            try:
+                self._finish(job, result=await job._run())
+            except asyncio.CancelledError:
+                self._finish(job, error='The application shut down')
+                raise
+            except Exception as error:
+                self._finish(job, error=str(error) or repr(error))
+            finally:
+                self._queue.task_done()
+
+    def _finish(self, job: Job, result: Any = None, error: str | None = None) -> None:
+        job.status = 'failed' if error is not None else 'completed'
+        job.result = result
+        job.error = error
+        job.finished_at = datetime.now(timezone.utc)
+        if job._on_finish is not None:
+            job._on_finish()
+        self._discard_finished_jobs()
+
+    def _discard_finished_jobs(self) -> None:
+        finished_jobs = [
+            job_id for job_id, job in self.jobs.items() if job.finished_at is not None
+        ]
+        for job_id in finished_jobs[:max(0, len(finished_jobs) - self.max_finished_jobs)]:
+            del self.jobs[job_id]
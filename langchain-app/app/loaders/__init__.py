@@ -0,0 +1,25 @@
+from app.loaders.parallel_pdf import ParallelPyMuPDFLoader
+from app.loaders.remote_transcription import RemoteTranscriptionLoader
+from app.loaders.whisper import (
+    CachedFasterWhisperParser,
+    WhisperModelCache,
+    get_whisper_model_cache,
+    preload_whisper_models,
+)
+from app.loaders.segmented_transcription import (
+    RemoteSegmentedTranscriptionLoader,
+    SegmentedTranscriptionLoader,
+)
+from app.loaders.executor import LoaderExecutor
+
+__all__ = [
+    'CachedFasterWhisperParser',
+    'LoaderExecutor',
+    'ParallelPyMuPDFLoader',
+    'RemoteSegmentedTranscriptionLoader',
+    'RemoteTranscriptionLoader',
+    'SegmentedTranscriptionLoader',
+    'WhisperModelCache',
+    'get_whisper_model_cache',
+    'preload_whisper_models',
+]
@@ -0,0 +1,275 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator
+
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents.base import Document
+from langchain_community.document_loaders.generic import GenericLoader
+
+from app.loaders.parallel_pdf import ParallelPyMuPDFLoader
+from app.loaders.remote_transcription import RemoteTranscriptionLoader
+from app.loaders.segmented_transcription import SegmentedTranscriptionLoader
+from app.loaders.whisper import preload_whisper_models
+
+
+def _load(loader: BaseLoader) -> list[Document]:
+    return loader.load()
+
+
+def _warm_up() -> None:
+    pass
+
+
+# resident memory of a worker transcribing with large-v3 (float32 weights and decoding buffers)
+WHISPER_WORKER_MEMORY_IN_BYTES = 4 * 1024 ** 3
+CGROUP_MEMORY_LIMIT_PATH = '/sys/fs/cgroup/memory.max'
+
+
+def get_memory_limit() -> int | None:
+    """
+    Get the memory available to the application: the limit of its container (cgroup v2), or
+    the physical memory of the host.
+
+    Returns
+    -------
+    int or None
+        The memory limit in bytes, or None if it cannot be determined.
+    """
+    try:
+        with open(CGROUP_MEMORY_LIMIT_PATH) as file:
+            limit = file.read().strip()
+        if limit != 'max':
+            return int(limit)
+    except (OSError, ValueError):
+        pass
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def get_default_max_processes() -> int:
+    """
+    Get the number of transcription workers: one per CPU, as long as every worker can hold a
+    transcription model in memory (see `WHISPER_WORKER_MEMORY_IN_BYTES`).
+
+    Returns
+    -------
+    int
+        The number of workers of the process pool, at least 1.
+    """
+    max_processes = os.cpu_count() or 1
+    memory_limit = get_memory_limit()
+    if memory_limit is not None:
+        max_processes = min(max_processes, memory_limit // WHISPER_WORKER_MEMORY_IN_BYTES)
+    return max(1, max_processes)
+
+
+class LoaderExecutor:
+    """
+    Runs document loaders outside of the event loop.
+
+    I/O-bound loaders (e.g. PDF parsing) run in a thread pool, while CPU-heavy loaders (e.g.
+    audio transcription) run in a process pool, so they neither block the event loop nor compete
+    for the GIL with the request handling.
+
+    Workers of the process pool keep the transcription models they load, and preload the
+    `preloaded_whisper_models` when they start, so the weights are not loaded for every file.
+
+    Loaders doing their work elsewhere (e.g. ParallelPyMuPDFLoader, SegmentedTranscriptionLoader,
+    or RemoteTranscriptionLoader on a transcription server) are consumed directly from the event
+    loop through `alazy_load`.
+    PDF pages are parsed in the page pool, which is separate from the process pool so long
+    transcriptions do not hold back the parsing of PDF pages.
+
+    Attributes
+    ----------
+    max_threads : int
+        The maximum number of threads running loaders.
+    max_processes : int
+        The maximum number of processes running loaders.
+    max_page_processes : int
+        The maximum number of processes parsing PDF pages.
+    process_pool_loaders : tuple[type, ...]
+        The loader classes executed in the process pool.
+    async_loaders : tuple[type, ...]
+        The loader classes consumed from the event loop.
+    preloaded_whisper_models : tuple[dict[str, str], ...]
+        The transcription models loaded by every worker of the process pool when it starts.
+    """
+
+    DEFAULT_MAX_THREADS = 4
+    DEFAULT_MAX_PROCESSES = get_default_max_processes()
+    DEFAULT_MAX_PAGE_PROCESSES = os.cpu_count() or 1
+    DEFAULT_PROCESS_POOL_LOADERS = (GenericLoader,)
+    DEFAULT_ASYNC_LOADERS = (
+        ParallelPyMuPDFLoader,
+        RemoteTranscriptionLoader,
+        SegmentedTranscriptionLoader,
+    )
+    # transcription runs on the transcription server by default; deployments transcribing in
+    # process can preload e.g. `CachedFasterWhisperParser().get_model_spec()` here
+    DEFAULT_PRELOADED_WHISPER_MODELS = ()
+
+    def __init__(
+        self,
+        max_threads: int = DEFAULT_MAX_THREADS,
+        max_processes: int = DEFAULT_MAX_PROCESSES,
+        max_page_processes: int = DEFAULT_MAX_PAGE_PROCESSES,
+        process_pool_loaders: tuple[type, ...] = DEFAULT_PROCESS_POOL_LOADERS,
+        async_loaders: tuple[type, ...] = DEFAULT_ASYNC_LOADERS,
+        preloaded_whisper_models: tuple[dict[str, str], ...] = DEFAULT_PRELOADED_WHISPER_MODELS,
+    ) -> None:
+        """
+        Initializes the LoaderExecutor; the pools are only started when first needed.
+
+        Parameters
+        ----------
+        max_threads : int, optional
+            The maximum number of threads running loaders (default is 4).
+        max_processes : int, optional
+            The maximum number of processes running loaders (default is the number of CPUs, as
+            long as each worker has `WHISPER_WORKER_MEMORY_IN_BYTES` of memory).
+        max_page_processes : int, optional
+            The maximum number of processes parsing PDF pages (default is the number of CPUs).
+        process_pool_loaders : tuple[type, ...], optional
+            The loader classes executed in the process pool (default is `(GenericLoader,)`, used
+            for audio transcription).
+        async_loaders : tuple[type, ...], optional
+            The loader classes consumed from the event loop (default is the PDF and
+            transcription loaders of `app.loaders`).
+        preloaded_whisper_models : tuple[dict[str, str], ...], optional
+            The transcription models loaded by every worker of the process pool when it starts,
+            as dictionaries with the `model_size`, `device` and `compute_type` keys (default is
+            no model).
+        """
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self.max_page_processes = max_page_processes
+        self.process_pool_loaders = process_pool_loaders
+        self.async_loaders = async_loaders
+        self.preloaded_whisper_models = preloaded_whisper_models
+        self._thread_pool = None
+        self._process_pool = None
+        self._page_pool = None
+
+    @property
+    def thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.max_threads, thread_name_prefix='loader'
+            )
+        return self._thread_pool
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            # forking a process running database and HTTP client threads is unsafe
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.max_processes,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=preload_whisper_models,
+                initargs=(self.preloaded_whisper_models,),
+            )
+        return self._process_pool
+
+    @property
+    def page_pool(self) -> ProcessPoolExecutor:
+        if self._page_pool is None:
+            self._page_pool = ProcessPoolExecutor(
+                max_workers=self.max_page_processes,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return self._page_pool
+
+    async def start(self) -> None:
+        """
+        Starts every worker of the process pool, which preload the transcription models, so
+        the first transcriptions do not wait for them.
+
+        Does nothing if no model is preloaded, as the pool is then started when first needed.
+        """
+        if not self.preloaded_whisper_models:
+            return
+
+        loop = asyncio.get_running_loop()
+        # each task submitted while no worker is idle starts a new worker
+        await asyncio.gather(*(
+            loop.run_in_executor(self.process_pool, _warm_up) for _ in range(self.max_processes)
+        ))
+
+    def get_executor(self, loader: BaseLoader) -> Executor:
+        """
+        Selects the pool running the given loader.
+
+        Parameters
+        ----------
+        loader : BaseLoader
+            The loader to run.
+
+        Returns
+        -------
+        Executor
+            The process pool for the loaders in `process_pool_loaders`, the thread pool otherwise.
+        """
+        if isinstance(loader, self.process_pool_loaders):
+            return self.process_pool
+        return self.thread_pool
+
+    async def load(self, loader: BaseLoader) -> list[Document]:
+        """
+        Loads the documents of the given loader in the appropriate pool.
+
+        Parameters
+        ----------
+        loader : BaseLoader
+            The loader to run.
+
+        Returns
+        -------
+        list[Document]
+            The loaded documents.
+        """
+        if isinstance(loader, self.async_loaders):
+            return [document async for document in loader.alazy_load()]
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.get_executor(loader), _load, loader)
+
+    async def alazy_load(self, loader: BaseLoader) -> AsyncIterator[Document]:
+        """
+        Yields the documents of the given loader, in order, as soon as they are loaded.
+
+        Documents of the loaders in `async_loaders` are yielded while the next ones are still
+        being loaded; the other loaders are run by `load` and their documents yielded at once.
+
+        Parameters
+        ----------
+        loader : BaseLoader
+            The loader to run.
+
+        Yields
+        ------
+        Document
+            The loaded documents.
+        """
+        if isinstance(loader, self.async_loaders):
+            async for document in loader.alazy_load():
+                yield document
+            return
+
+        for document in await self.load(loader):
+            yield document
+
+    def close(self) -> None:
+        """
+        Shuts down the pools, cancelling the loaders which did not start yet.
+        """
+        for pool in (self._thread_pool, self._process_pool, self._page_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool = None
+        self._process_pool = None
+        self._page_pool = None
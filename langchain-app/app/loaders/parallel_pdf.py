@@ -0,0 +1,201 @@
+import asyncio
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Iterator
+
+import pymupdf
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.document_loaders.blob_loaders import Blob
+from langchain_core.documents.base import Document
+from langchain_community.document_loaders.parsers.pdf import PyMuPDFParser, _validate_metadata
+
+from app.resources import get_or_create_resource, get_resource_registry
+
+
+def _parse_pages(
+    file_path: str,
+    start: int,
+    stop: int,
+    password: str | None,
+    parser_kwargs: dict[str, Any],
+) -> list[Document]:
+    """
+    Parses the pages `start` to `stop` (excluded) of a PDF file.
+
+    The page contents and metadata are extracted by PyMuPDFParser, so the documents are the
+    same as those of PyMuPDFLoader.
+    """
+    parser = PyMuPDFParser(password=password, **parser_kwargs)
+    with pymupdf.open(file_path) as doc:
+        if doc.is_encrypted:
+            doc.authenticate(password)
+        doc_metadata = {
+            "producer": "PyMuPDF",
+            "creator": "PyMuPDF",
+            "creationdate": "",
+        } | parser._extract_metadata(doc, Blob.from_path(file_path))
+        return [
+            Document(
+                page_content=parser._get_page_content(doc, page, parser.text_kwargs).strip(),
+                metadata=_validate_metadata(doc_metadata | {"page": page.number}),
+            )
+            for page in doc.pages(start, stop)
+        ]
+
+
+class ParallelPyMuPDFLoader(BaseLoader):
+    """
+    PDF loader parsing shards of consecutive pages in parallel, in a process pool.
+
+    Pages are yielded in order by `lazy_load` and `alazy_load` as soon as their shard (and the
+    shards before it) is parsed, so consumers can start on the first pages while later ones are
+    still being parsed. Documents fitting in a single shard are parsed in the calling process,
+    as they would not benefit from the pool. The documents are the same as those of
+    PyMuPDFLoader (in 'page' mode).
+
+    By default, the shards run in the page pool of the shared LoaderExecutor; outside of the
+    application, a pool is started for each load.
+
+    Attributes
+    ----------
+    file_path : str
+        The path to the PDF file.
+    pages_per_shard : int
+        The number of consecutive pages parsed by each task of the pool.
+    password : str or None
+        The password of encrypted PDF files.
+    executor : Executor or None
+        The pool parsing the shards, or None to use the default one.
+    parser_kwargs : dict
+        Additional keyword arguments passed to PyMuPDFParser.
+    """
+
+    DEFAULT_PAGES_PER_SHARD = 16
+
+    def __init__(
+        self,
+        file_path: str,
+        pages_per_shard: int = DEFAULT_PAGES_PER_SHARD,
+        password: str | None = None,
+        executor: Executor | None = None,
+        **parser_kwargs,
+    ) -> None:
+        """
+        Initializes the ParallelPyMuPDFLoader.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the PDF file.
+        pages_per_shard : int, optional
+            The number of consecutive pages parsed by each task of the pool (default is 16).
+        password : str, optional
+            The password of encrypted PDF files (default is None).
+        executor : Executor, optional
+            The process pool parsing the shards (default is None, which uses the page pool of
+            the shared LoaderExecutor).
+        **parser_kwargs : dict
+            Additional keyword arguments passed to PyMuPDFParser (e.g. `extract_tables`).
+        """
+        self.file_path = file_path
+        self.pages_per_shard = pages_per_shard
+        self.password = password
+        self.executor = executor
+        self.parser_kwargs = parser_kwargs
+
+    def lazy_load(self) -> Iterator[Document]:
+        """
+        Parses the pages in the pool and yields them in order.
+
+        Yields
+        ------
+        Document
+            One document per page.
+        """
+        shards = self._get_shards()
+        if len(shards) <= 1:
+            for start, stop in shards:
+                yield from self._parse_pages(start, stop)
+            return
+
+        with self._get_executor() as executor:
+            futures = self._submit_shards(executor, shards)
+            try:
+                for future in futures:
+                    yield from future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    async def alazy_load(self) -> AsyncIterator[Document]:
+        """
+        Parses the pages in the pool and yields them in order, without blocking the event loop.
+
+        Yields
+        ------
+        Document
+            One document per page.
+        """
+        shards = self._get_shards()
+        if len(shards) <= 1:
+            for start, stop in shards:
+                for document in await asyncio.to_thread(self._parse_pages, start, stop):
+                    yield document
+            return
+
+        with self._get_executor() as executor:
+            futures = self._submit_shards(executor, shards)
+            try:
+                for future in futures:
+                    for document in await asyncio.wrap_future(future):
+                        yield document
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def get_num_pages(self) -> int:
+        """
+        Counts the pages of the PDF file.
+
+        Returns
+        -------
+        int
+            The number of pages.
+        """
+        with pymupdf.open(self.file_path) as doc:
+            return doc.page_count
+
+    def _get_shards(self) -> list[tuple[int, int]]:
+        num_pages = self.get_num_pages()
+        return [
+            (start, min(start + self.pages_per_shard, num_pages))
+            for start in range(0, num_pages, self.pages_per_shard)
+        ]
+
+    def _parse_pages(self, start: int, stop: int) -> list[Document]:
+        return _parse_pages(self.file_path, start, stop, self.password, self.parser_kwargs)
+
+    def _submit_shards(self, executor: Executor, shards: list[tuple[int, int]]) -> list[Future]:
+        # the loader itself is not sent to the pool, as its executor cannot be pickled
+        return [
+            executor.submit(
+                _parse_pages, self.file_path, start, stop, self.password, self.parser_kwargs
+            )
+            for start, stop in shards
+        ]
+
+    @contextmanager
+    def _get_executor(self) -> Iterator[Executor]:
+        if self.executor is not None:
+            yield self.executor
+            return
+
+        # imported here as the executor module refers to this loader
+        from app.loaders.executor import LoaderExecutor
+
+        loader_executor = get_or_create_resource('loader_executor', LoaderExecutor)
+        try:
+            yield loader_executor.page_pool
+        finally:
+            if get_resource_registry() is None:
+                loader_executor.close()
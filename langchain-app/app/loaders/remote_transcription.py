@@ -0,0 +1,234 @@
+import mimetypes
+import os
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, BinaryIO, Iterator
+
+import httpx
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents.base import Document
+
+from app.resources import get_or_create_resource, get_resource_registry
+
+
+class RemoteTranscriptionLoader(BaseLoader):
+    """
+    Loader transcribing audio (or video) files with an OpenAI-compatible transcription endpoint,
+    such as the `faster-whisper-server` service.
+
+    The file is streamed to `<base_url>/v1/audio/transcriptions` and the `verbose_json`
+    response is turned into one document per transcribed segment, with the same metadata as
+    FasterWhisperParser (except the language probability, which is not reported). Transcription
+    therefore runs on the transcription server instead of the application workers.
+
+    The HTTP clients are shared through the application resource registry, so connections to the
+    server are pooled across requests.
+
+    Attributes
+    ----------
+    file_path : str
+        The path to the audio file.
+    base_url : str
+        The base URL of the transcription server.
+    model : str
+        The transcription model requested to the server.
+    language : str or None
+        The language of the audio, or None to let the server detect it.
+    timeout : float
+        The timeout of the transcription requests, in seconds.
+    """
+
+    DEFAULT_BASE_URL = 'http://faster-whisper-server:9000'
+    DEFAULT_MODEL = 'Systran/faster-whisper-large-v3'
+    DEFAULT_TIMEOUT = 600.0
+    TRANSCRIPTIONS_PATH = '/v1/audio/transcriptions'
+
+    def __init__(
+        self,
+        file_path: str,
+        base_url: str = DEFAULT_BASE_URL,
+        model: str = DEFAULT_MODEL,
+        language: str | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        """
+        Initializes the RemoteTranscriptionLoader.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the audio file.
+        base_url : str, optional
+            The base URL of the transcription server (default is
+            'http://faster-whisper-server:9000').
+        model : str, optional
+            The transcription model requested to the server (default is
+            'Systran/faster-whisper-large-v3').
+        language : str, optional
+            The language of the audio, e.g. 'en' (default is None, which lets the server detect
+            it).
+        timeout : float, optional
+            The timeout of the transcription requests, in seconds (default is 600).
+        """
+        self.file_path = file_path
+        self.base_url = base_url
+        self.model = model
+        self.language = language
+        self.timeout = timeout
+
+    def lazy_load(self) -> Iterator[Document]:
+        """
+        Transcribes the file, yielding one document per transcribed segment.
+
+        Yields
+        ------
+        Document
+            The transcribed segments, in order.
+
+        Raises
+        ------
+        httpx.HTTPError
+            If the transcription request fails.
+        """
+        with open(self.file_path, 'rb') as file:
+            transcription = self.transcribe(file)
+        yield from self._get_documents(transcription)
+
+    async def alazy_load(self) -> AsyncIterator[Document]:
+        """
+        Transcribes the file without blocking the event loop, yielding one document per
+        transcribed segment.
+
+        Yields
+        ------
+        Document
+            The transcribed segments, in order.
+
+        Raises
+        ------
+        httpx.HTTPError
+            If the transcription request fails.
+        """
+        with open(self.file_path, 'rb') as file:
+            transcription = await self.atranscribe(file)
+        for document in self._get_documents(transcription):
+            yield document
+
+    def transcribe(self, file: BinaryIO, file_name: str = None) -> dict[str, Any]:
+        """
+        Transcribes an audio file (or a part of it) with the transcription server.
+
+        Parameters
+        ----------
+        file : BinaryIO
+            The audio file, streamed to the server.
+        file_name : str, optional
+            The name of the uploaded file, from which the server infers its format (default is
+            None, which uses the name of `file_path`).
+
+        Returns
+        -------
+        dict[str, Any]
+            The `verbose_json` transcription.
+
+        Raises
+        ------
+        httpx.HTTPError
+            If the transcription request fails.
+        """
+        with self._get_client() as client:
+            response = client.post(
+                self.TRANSCRIPTIONS_PATH,
+                files=self._get_files(file, file_name=file_name),
+                data=self._get_data(),
+            )
+            response.raise_for_status()
+        return response.json()
+
+    async def atranscribe(self, file: BinaryIO, file_name: str = None) -> dict[str, Any]:
+        """
+        Transcribes an audio file (or a part of it) with the transcription server, without
+        blocking the event loop.
+
+        Parameters
+        ----------
+        file : BinaryIO
+            The audio file, streamed to the server.
+        file_name : str, optional
+            The name of the uploaded file, from which the server infers its format (default is
+            None, which uses the name of `file_path`).
+
+        Returns
+        -------
+        dict[str, Any]
+            The `verbose_json` transcription.
+
+        Raises
+        ------
+        httpx.HTTPError
+            If the transcription request fails.
+        """
+        async with self._get_async_client() as client:
+            response = await client.post(
+                self.TRANSCRIPTIONS_PATH,
+                files=self._get_files(file, file_name=file_name),
+                data=self._get_data(),
+            )
+            response.raise_for_status()
+        return response.json()
+
+    def _get_files(self, file: BinaryIO, file_name: str = None) -> dict[str, tuple]:
+        # file objects are sent in chunks, so the file is never read into memory at once
+        file_name = file_name or os.path.basename(self.file_path)
+        mime_type = mimetypes.guess_type(file_name)[0] or 'application/octet-stream'
+        return {'file': (file_name, file, mime_type)}
+
+    def _get_data(self) -> dict[str, str]:
+        data = {'model': self.model, 'response_format': 'verbose_json'}
+        if self.language is not None:
+            data['language'] = self.language
+        return data
+
+    def _get_documents(self, transcription: dict[str, Any], offset: float = 0.0) -> list[Document]:
+        # `offset` is the start of the transcribed part of the file, in seconds
+        return [
+            Document(
+                page_content=segment['text'],
+                metadata={
+                    'source': self.file_path,
+                    'timestamps': "[%.2fs -> %.2fs]" % (
+                        offset + segment['start'], offset + segment['end']
+                    ),
+                    'language': transcription.get('language'),
+                },
+            )
+            for segment in transcription.get('segments', [])
+        ]
+
+    @contextmanager
+    def _get_client(self) -> Iterator[httpx.Client]:
+        client = get_or_create_resource(
+            'http_client',
+            lambda: httpx.Client(base_url=self.base_url, timeout=self.timeout),
+            base_url=self.base_url,
+            timeout=self.timeout,
+        )
+        try:
+            yield client
+        finally:
+            if get_resource_registry() is None:
+                client.close()
+
+    @asynccontextmanager
+    async def _get_async_client(self) -> AsyncIterator[httpx.AsyncClient]:
+        client = get_or_create_resource(
+            'http_client',
+            lambda: httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout),
+            base_url=self.base_url,
+            timeout=self.timeout,
+            asynchronous=True,
+        )
+        try:
+            yield client
+        finally:
+            if get_resource_registry() is None:
+                await client.aclose()
@@ -0,0 +1,467 @@
+import asyncio
+import io
+import os
+import re
+import subprocess
+import tempfile
+import wave
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from typing import AsyncIterator, Iterator
+
+import numpy as np
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents.base import Document
+
+from app.loaders.remote_transcription import RemoteTranscriptionLoader
+from app.loaders.whisper import CachedFasterWhisperParser, get_whisper_model_cache
+from app.resources import get_or_create_resource, get_resource_registry
+
+
+SAMPLE_RATE = 16000  # the sampling rate expected by Whisper models
+
+
+def parse_silences(ffmpeg_output: str, duration: float) -> list[tuple[float, float]]:
+    """
+    Extracts the silences reported by the `silencedetect` filter of ffmpeg.
+
+    Parameters
+    ----------
+    ffmpeg_output : str
+        The log output of ffmpeg.
+    duration : float
+        The duration of the audio, ending silences still running at the end of the audio.
+
+    Returns
+    -------
+    list[tuple[float, float]]
+        The start and end of every silence, in seconds.
+    """
+    silences, silence_start = [], None
+    for match in re.finditer(r"silence_(start|end): (-?[\d.]+)", ffmpeg_output):
+        if match.group(1) == 'start':
+            silence_start = max(0.0, float(match.group(2)))
+        elif silence_start is not None:
+            silences.append((silence_start, float(match.group(2))))
+            silence_start = None
+
+    if silence_start is not None:
+        silences.append((silence_start, duration))
+    return silences
+
+
+def get_split_points(
+    silences: list[tuple[float, float]],
+    duration: float,
+    min_seconds: float,
+    max_seconds: float,
+) -> list[float]:
+    """
+    Picks the points splitting an audio into segments of `min_seconds` to `max_seconds`.
+
+    Segments are split in the middle of silences, so no word is cut, taking the latest silence
+    before a segment exceeds `max_seconds`. Segments without any silence are split after
+    `max_seconds`.
+
+    Parameters
+    ----------
+    silences : list[tuple[float, float]]
+        The start and end of every silence, in seconds.
+    duration : float
+        The duration of the audio, in seconds.
+    min_seconds : float
+        The minimum duration of the segments (except the last one).
+    max_seconds : float
+        The maximum duration of the segments.
+
+    Returns
+    -------
+    list[float]
+        The split points, in seconds.
+    """
+    points, last_point, candidate = [], 0.0, None
+    for point in [(start + end) / 2 for start, end in silences] + [duration]:
+        while point - last_point > max_seconds:
+            last_point = candidate if candidate is not None else last_point + max_seconds
+            points.append(last_point)
+            candidate = None
+        if point - last_point >= min_seconds:
+            candidate = point
+    return points
+
+
+def _read_segment(audio_path: str, start: float, end: float) -> bytes:
+    """
+    Reads the 16-bit samples of the segment `start` to `end` (in seconds) of a 16kHz mono WAV
+    file.
+    """
+    with wave.open(audio_path, 'rb') as audio_file:
+        audio_file.setpos(int(start * SAMPLE_RATE))
+        return audio_file.readframes(int((end - start) * SAMPLE_RATE))
+
+
+def _get_segment_wav(audio_path: str, start: float, end: float) -> io.BytesIO:
+    """
+    Extracts the segment `start` to `end` (in seconds) of a 16kHz mono WAV file as a WAV file.
+    """
+    segment_file = io.BytesIO()
+    with wave.open(segment_file, 'wb') as segment:
+        segment.setnchannels(1)
+        segment.setsampwidth(2)
+        segment.setframerate(SAMPLE_RATE)
+        segment.writeframes(_read_segment(audio_path, start, end))
+    segment_file.seek(0)
+    return segment_file
+
+
+def _transcribe_segment(
+    audio_path: str,
+    start: float,
+    end: float,
+    model_spec: dict[str, str],
+    beam_size: int,
+) -> tuple[list[tuple[float, float, str]], str, float]:
+    """
+    Transcribes the segment `start` to `end` (in seconds) of a 16kHz mono WAV file, in a worker
+    process.
+
+    Returns the transcribed segments (relative to `start`), the detected language and its
+    probability.
+    """
+    frames = _read_segment(audio_path, start, end)
+    audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+
+    model = get_whisper_model_cache().get(**model_spec)
+    segments, info = model.transcribe(audio, beam_size=beam_size)
+    return (
+        [(segment.start, segment.end, segment.text) for segment in segments],
+        info.language,
+        info.language_probability,
+    )
+
+
+class SegmentedTranscriptionLoader(BaseLoader):
+    """
+    Loader transcribing long audio (or video) files as segments transcribed in parallel.
+
+    The audio track is extracted with ffmpeg and split in the middle of the silences detected
+    by its `silencedetect` filter, into segments of `min_segment_seconds` to
+    `max_segment_seconds`. The segments are transcribed concurrently in a process pool, whose
+    workers keep their transcription models (see WhisperModelCache), and the transcribed
+    segments are yielded in order, with timestamps relative to the whole file. The documents
+    have the same metadata as those of FasterWhisperParser.
+
+    By default, the segments are transcribed in the process pool of the shared LoaderExecutor,
+    whose size bounds the speedup; outside of the application, a pool is started for each load.
+
+    Attributes
+    ----------
+    file_path : str
+        The path to the audio file.
+    parser : CachedFasterWhisperParser
+        The parser describing the transcription model and the decoding settings.
+    min_segment_seconds : float
+        The minimum duration of the segments.
+    max_segment_seconds : float
+        The maximum duration of the segments.
+    silence_threshold_db : float
+        The volume under which the audio is considered silent, in dB.
+    min_silence_seconds : float
+        The minimum duration of the silences at which the audio can be split.
+    executor : Executor or None
+        The process pool transcribing the segments, or None to use the default one.
+    """
+
+    DEFAULT_MIN_SEGMENT_SECONDS = 30.0
+    DEFAULT_MAX_SEGMENT_SECONDS = 120.0
+    DEFAULT_SILENCE_THRESHOLD_DB = -35.0
+    DEFAULT_MIN_SILENCE_SECONDS = 0.5
+
+    def __init__(
+        self,
+        file_path: str,
+        parser: CachedFasterWhisperParser = None,
+        min_segment_seconds: float = DEFAULT_MIN_SEGMENT_SECONDS,
+        max_segment_seconds: float = DEFAULT_MAX_SEGMENT_SECONDS,
+        silence_threshold_db: float = DEFAULT_SILENCE_THRESHOLD_DB,
+        min_silence_seconds: float = DEFAULT_MIN_SILENCE_SECONDS,
+        executor: Executor | None = None,
+    ) -> None:
+        """
+        Initializes the SegmentedTranscriptionLoader.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the audio file.
+        parser : CachedFasterWhisperParser, optional
+            The parser describing the transcription model and the decoding settings (default
+            is None, which uses the default model).
+        min_segment_seconds : float, optional
+            The minimum duration of the segments (default is 30).
+        max_segment_seconds : float, optional
+            The maximum duration of the segments (default is 120).
+        silence_threshold_db : float, optional
+            The volume under which the audio is considered silent, in dB (default is -35).
+        min_silence_seconds : float, optional
+            The minimum duration of the silences at which the audio can be split (default is
+            0.5).
+        executor : Executor, optional
+            The process pool transcribing the segments (default is None, which uses the process
+            pool of the shared LoaderExecutor).
+        """
+        self.file_path = file_path
+        self.parser = parser or CachedFasterWhisperParser()
+        self.min_segment_seconds = min_segment_seconds
+        self.max_segment_seconds = max_segment_seconds
+        self.silence_threshold_db = silence_threshold_db
+        self.min_silence_seconds = min_silence_seconds
+        self.executor = executor
+
+    def lazy_load(self) -> Iterator[Document]:
+        """
+        Transcribes the segments in the pool and yields the transcribed segments in order.
+
+        Yields
+        ------
+        Document
+            The transcribed segments, in order.
+        """
+        with tempfile.TemporaryDirectory() as directory, self._get_executor() as executor:
+            audio_path, segments = self._split_audio(directory)
+            futures = self._submit_segments(executor, audio_path, segments)
+            try:
+                for (start, _), future in zip(segments, futures):
+                    yield from self._get_documents(start, *future.result())
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    async def alazy_load(self) -> AsyncIterator[Document]:
+        """
+        Transcribes the segments in the pool and yields the transcribed segments in order,
+        without blocking the event loop.
+
+        Yields
+        ------
+        Document
+            The transcribed segments, in order.
+        """
+        with tempfile.TemporaryDirectory() as directory, self._get_executor() as executor:
+            audio_path, segments = await asyncio.to_thread(self._split_audio, directory)
+            futures = self._submit_segments(executor, audio_path, segments)
+            try:
+                for (start, _), future in zip(segments, futures):
+                    for document in self._get_documents(start, *await asyncio.wrap_future(future)):
+                        yield document
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _split_audio(self, directory: str) -> tuple[str, list[tuple[float, float]]]:
+        audio_path = os.path.join(directory, 'audio.wav')
+        subprocess.run(
+            [
+                'ffmpeg', '-nostdin', '-loglevel', 'error', '-i', self.file_path,
+                '-vn', '-ac', '1', '-ar', str(SAMPLE_RATE), '-c:a', 'pcm_s16le', audio_path,
+            ],
+            check=True,
+            capture_output=True,
+        )
+        with wave.open(audio_path, 'rb') as audio_file:
+            duration = audio_file.getnframes() / audio_file.getframerate()
+
+        silence_filter = (
+            f"silencedetect=noise={self.silence_threshold_db}dB:d={self.min_silence_seconds}"
+        )
+        result = subprocess.run(
+            [
+                'ffmpeg', '-nostdin', '-hide_banner', '-i', audio_path,
+                '-af', silence_filter, '-f', 'null', '-',
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        points = get_split_points(
+            silences=parse_silences(result.stderr, duration=duration),
+            duration=duration,
+            min_seconds=self.min_segment_seconds,
+            max_seconds=self.max_segment_seconds,
+        )
+        bounds = [0.0, *points, duration]
+        return audio_path, list(zip(bounds[:-1], bounds[1:]))
+
+    def _submit_segments(
+        self,
+        executor: Executor,
+        audio_path: str,
+        segments: list[tuple[float, float]],
+    ) -> list[Future]:
+        model_spec = self.parser.get_model_spec()
+        return [
+            executor.submit(
+                _transcribe_segment, audio_path, start, end, model_spec, self.parser.beam_size
+            )
+            for start, end in segments
+        ]
+
+    def _get_documents(
+        self,
+        offset: float,
+        segments: list[tuple[float, float, str]],
+        language: str,
+        language_probability: float,
+    ) -> list[Document]:
+        return [
+            Document(
+                page_content=text,
+                metadata={
+                    "source": self.file_path,
+                    "timestamps": "[%.2fs -> %.2fs]" % (offset + start, offset + end),
+                    "language": language,
+                    "probability": "%d%%" % round(language_probability * 100),
+                },
+            )
+            for start, end, text in segments
+        ]
+
+    @contextmanager
+    def _get_executor(self) -> Iterator[Executor]:
+        if self.executor is not None:
+            yield self.executor
+            return
+
+        # imported here as the executor module refers to this loader
+        from app.loaders.executor import LoaderExecutor
+
+        loader_executor = get_or_create_resource('loader_executor', LoaderExecutor)
+        try:
+            yield loader_executor.process_pool
+        finally:
+            if get_resource_registry() is None:
+                loader_executor.close()
+
+
+class RemoteSegmentedTranscriptionLoader(SegmentedTranscriptionLoader):
+    """
+    Loader transcribing long audio (or video) files as segments transcribed concurrently by an
+    OpenAI-compatible transcription server, such as the `faster-whisper-server` service.
+
+    The audio is split at silences like SegmentedTranscriptionLoader does (with ffmpeg, in the
+    application), but the segments are sent to the transcription server (see
+    RemoteTranscriptionLoader), at most `max_concurrency` at once, instead of being transcribed
+    by the application workers. The transcribed segments are yielded in order, as soon as they
+    (and the segments before them) are transcribed, with timestamps relative to the whole file.
+
+    Attributes
+    ----------
+    file_path : str
+        The path to the audio file.
+    transcriber : RemoteTranscriptionLoader
+        The loader sending the segments to the transcription server.
+    max_concurrency : int
+        The maximum number of segments transcribed concurrently.
+    min_segment_seconds : float
+        The minimum duration of the segments.
+    max_segment_seconds : float
+        The maximum duration of the segments.
+    silence_threshold_db : float
+        The volume under which the audio is considered silent, in dB.
+    min_silence_seconds : float
+        The minimum duration of the silences at which the audio can be split.
+    """
+
+    DEFAULT_MAX_CONCURRENCY = 4
+
+    def __init__(
+        self,
+        file_path: str,
+        base_url: str = RemoteTranscriptionLoader.DEFAULT_BASE_URL,
+        model: str = RemoteTranscriptionLoader.DEFAULT_MODEL,
+        language: str | None = None,
+        timeout: float = RemoteTranscriptionLoader.DEFAULT_TIMEOUT,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        **kwargs,
+    ) -> None:
+        """
+        Initializes the RemoteSegmentedTranscriptionLoader.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the audio file.
+        base_url : str, optional
+            The base URL of the transcription server (default is
+            'http://faster-whisper-server:9000').
+        model : str, optional
+            The transcription model requested to the server (default is
+            'Systran/faster-whisper-large-v3').
+        language : str, optional
+            The language of the audio, e.g. 'en' (default is None, which lets the server detect
+            it for each segment).
+        timeout : float, optional
+            The timeout of the transcription requests, in seconds (default is 600).
+        max_concurrency : int, optional
+            The maximum number of segments transcribed concurrently (default is 4).
+        **kwargs : dict
+            The segmentation settings of SegmentedTranscriptionLoader (e.g.
+            `max_segment_seconds`).
+        """
+        super().__init__(file_path, **kwargs)
+        self.transcriber = RemoteTranscriptionLoader(
+            file_path, base_url=base_url, model=model, language=language, timeout=timeout
+        )
+        self.max_concurrency = max_concurrency
+
+    def lazy_load(self) -> Iterator[Document]:
+        """
+        Transcribes the segments one after the other and yields the transcribed segments in
+        order.
+
+        Yields
+        ------
+        Document
+            The transcribed segments, in order.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            audio_path, segments = self._split_audio(directory)
+            for index, (start, end) in enumerate(segments):
+                transcription = self.transcriber.transcribe(
+                    _get_segment_wav(audio_path, start, end), file_name=f"segment-{index}.wav"
+                )
+                yield from self.transcriber._get_documents(transcription, offset=start)
+
+    async def alazy_load(self) -> AsyncIterator[Document]:
+        """
+        Transcribes the segments concurrently and yields the transcribed segments in order,
+        without blocking the event loop.
+
+        Yields
+        ------
+        Document
+            The transcribed segments, in order.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _transcribe(audio_path: str, index: int, start: float, end: float) -> dict:
+            async with semaphore:
+                segment = await asyncio.to_thread(_get_segment_wav, audio_path, start, end)
+                return await self.transcriber.atranscribe(
+                    segment, file_name=f"segment-{index}.wav"
+                )
+
+        with tempfile.TemporaryDirectory() as directory:
+            audio_path, segments = await asyncio.to_thread(self._split_audio, directory)
+            tasks = [
+                asyncio.create_task(_transcribe(audio_path, index, start, end))
+                for index, (start, end) in enumerate(segments)
+            ]
+            try:
+                for (start, _), task in zip(segments, tasks):
+                    for document in self.transcriber._get_documents(await task, offset=start):
+                        yield document
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
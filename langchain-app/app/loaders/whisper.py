@@ -0,0 +1,246 @@
+import io
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Iterator
+
+from langchain_core.document_loaders import BaseBlobParser
+from langchain_core.document_loaders.blob_loaders import Blob
+from langchain_core.documents.base import Document
+from langchain_community.document_loaders.parsers.audio import _get_audio_from_blob
+
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
+
+
+logger = logging.getLogger(__name__)
+
+_model_cache: "WhisperModelCache | None" = None
+
+
+class WhisperModelCache:
+    """
+    Size-bounded cache of loaded faster-whisper models, shared by the transcriptions of a process.
+
+    Models are keyed by their size, device and compute type, and loaded on first use. Once
+    `max_models` models are loaded, the least recently used one is dropped before loading
+    another one, so the memory used by the models stays bounded.
+
+    Attributes
+    ----------
+    max_models : int
+        The maximum number of loaded models.
+    """
+
+    DEFAULT_MAX_MODELS = 2
+
+    def __init__(self, max_models: int = DEFAULT_MAX_MODELS) -> None:
+        """
+        Initializes an empty WhisperModelCache.
+
+        Parameters
+        ----------
+        max_models : int, optional
+            The maximum number of loaded models (default is 2).
+        """
+        self.max_models = max_models
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._models: OrderedDict[tuple[str, str, str], Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, model_size: str, device: str, compute_type: str) -> "WhisperModel":
+        """
+        Retrieves a loaded model, loading it if needed.
+
+        Parameters
+        ----------
+        model_size : str
+            The model size (e.g. 'large-v3') or the path to a converted model.
+        device : str
+            The device running the model ('cpu', 'cuda' or 'auto').
+        compute_type : str
+            The type of the model weights during the computation (e.g. 'int8', 'float16' or
+            'default').
+
+        Returns
+        -------
+        WhisperModel
+            The loaded model.
+        """
+        from faster_whisper import WhisperModel
+
+        key = (model_size, device, compute_type)
+        # models are loaded holding the lock, so concurrent transcriptions never load them twice
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return model
+
+            self.misses += 1
+            while len(self._models) >= self.max_models:
+                self._models.popitem(last=False)
+                self.evictions += 1
+
+            model = WhisperModel(model_size, device=device, compute_type=compute_type)
+            self._models[key] = model
+            return model
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Reports the loaded models, hits, misses and evictions.
+
+        Returns
+        -------
+        dict[str, Any]
+            The cache statistics.
+        """
+        return {
+            'models': [list(key) for key in self._models],
+            'max_models': self.max_models,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+def get_whisper_model_cache() -> WhisperModelCache:
+    """
+    Get the model cache of the current process, creating it on first use.
+
+    Returns
+    -------
+    WhisperModelCache
+        The model cache of the current process.
+    """
+    global _model_cache
+    if _model_cache is None:
+        _model_cache = WhisperModelCache()
+    return _model_cache
+
+
+def preload_whisper_models(models: tuple[dict[str, str], ...]) -> None:
+    """
+    Loads models in the model cache of the current process, e.g. when a worker process starts.
+
+    Models failing to load are logged and skipped (they are loaded again on first use), so a
+    missing model does not prevent the process from starting.
+
+    Parameters
+    ----------
+    models : tuple[dict[str, str], ...]
+        The models to load, as dictionaries with the `model_size`, `device` and `compute_type`
+        keys.
+    """
+    model_cache = get_whisper_model_cache()
+    for model in models:
+        try:
+            model_cache.get(**model)
+        except Exception as error:
+            logger.error("Failed to preload the Whisper model %s: %s", model, error)
+
+
+class CachedFasterWhisperParser(BaseBlobParser):
+    """
+    Transcribes audio files with faster-whisper, using the loaded models of the process.
+
+    Unlike FasterWhisperParser, which loads its model for every blob, models are taken from the
+    WhisperModelCache of the process, so the weights are only loaded once per process. The
+    documents are the same as those of FasterWhisperParser.
+
+    Attributes
+    ----------
+    model_size : str
+        The model size (e.g. 'large-v3') or the path to a converted model.
+    device : str
+        The device running the model ('cpu', 'cuda' or 'auto').
+    compute_type : str
+        The type of the model weights during the computation (e.g. 'int8').
+    beam_size : int
+        The beam size used for decoding.
+    """
+
+    DEFAULT_MODEL_SIZE = 'large-v3'
+    DEFAULT_DEVICE = 'auto'
+    DEFAULT_COMPUTE_TYPE = 'default'
+    DEFAULT_BEAM_SIZE = 5
+
+    def __init__(
+        self,
+        model_size: str = DEFAULT_MODEL_SIZE,
+        device: str = DEFAULT_DEVICE,
+        compute_type: str = DEFAULT_COMPUTE_TYPE,
+        beam_size: int = DEFAULT_BEAM_SIZE,
+    ) -> None:
+        """
+        Initializes the CachedFasterWhisperParser; the model is only loaded when first needed.
+
+        Parameters
+        ----------
+        model_size : str, optional
+            The model size or the path to a converted model (default is 'large-v3').
+        device : str, optional
+            The device running the model: 'cpu', 'cuda', or 'auto' to use a GPU when one is
+            available (default is 'auto').
+        compute_type : str, optional
+            The type of the model weights during the computation, e.g. 'int8' on CPU or
+            'float16' on GPU (default is 'default', the type of the saved weights).
+        beam_size : int, optional
+            The beam size used for decoding (default is 5).
+        """
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.beam_size = beam_size
+
+    def lazy_parse(self, blob: Blob) -> Iterator[Document]:
+        """
+        Transcribes an audio blob, yielding one document per transcribed segment.
+
+        Parameters
+        ----------
+        blob : Blob
+            The audio (or video) blob.
+
+        Yields
+        ------
+        Document
+            The transcribed segments, in order.
+        """
+        audio = _get_audio_from_blob(blob)
+        file_obj = io.BytesIO(audio.export(format="mp3").read())
+
+        model = get_whisper_model_cache().get(
+            model_size=self.model_size, device=self.device, compute_type=self.compute_type
+        )
+        segments, info = model.transcribe(file_obj, beam_size=self.beam_size)
+
+        for segment in segments:
+            yield Document(
+                page_content=segment.text,
+                metadata={
+                    "source": blob.source,
+                    "timestamps": "[%.2fs -> %.2fs]" % (segment.start, segment.end),
+                    "language": info.language,
+                    "probability": "%d%%" % round(info.language_probability * 100),
+                    **blob.metadata,
+                },
+            )
+
+    def get_model_spec(self) -> dict[str, str]:
+        """
+        Describes the model of the parser, as expected by `preload_whisper_models`.
+
+        Returns
+        -------
+        dict[str, str]
+            The model size, device and compute type.
+        """
+        return {
+            'model_size': self.model_size,
+            'device': self.device,
+            'compute_type': self.compute_type,
+        }
@@ -1,7 +1,42 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
 
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.jobs import JobManager
+from app.loaders import LoaderExecutor
+from app.resources import ResourceRegistry, get_or_create_resource, set_resource_registry
+from app.routers.metrics import router as metrics_router
 from app.routers.summarize import router as summarization_router
+from app.strategies.admission import AdmissionRejectedError
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    registry = ResourceRegistry()
+    set_resource_registry(registry)
+    app.state.resources = registry
+    # starts the transcription workers if they preload models (none by default, as videos are
+    # transcribed by the transcription server), so the first requests do not wait for them
+    await get_or_create_resource('loader_executor', LoaderExecutor).start()
+    app.state.job_manager = JobManager()
+    app.state.job_manager.start()
+    yield
+    await app.state.job_manager.aclose()
+    set_resource_registry(None)
+    await registry.aclose()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(summarization_router)
+app.include_router(metrics_router)
+
+
+@app.exception_handler(AdmissionRejectedError)
+async def admission_rejected_handler(request: Request, error: AdmissionRejectedError):
+    return JSONResponse(
+        status_code=error.status_code,
+        content={'detail': str(error), 'backend': error.backend},
+        headers={'Retry-After': '1'},
+    )
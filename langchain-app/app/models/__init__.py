@@ -1,9 +1,11 @@
 from app.models.feedback import FeedbackForm
+from app.models.job import JobStatus
 from app.models.summarize import SummarizeResponse
 from app.models.document_info import DocumentInfo
 
 __all__ = [
     'FeedbackForm',
+    'JobStatus',
     'SummarizeResponse',
     'DocumentInfo',
 ]
@@ -0,0 +1,13 @@
+from app.resources.registry import (
+    ResourceRegistry,
+    get_or_create_resource,
+    get_resource_registry,
+    set_resource_registry,
+)
+
+__all__ = [
+    'ResourceRegistry',
+    'get_or_create_resource',
+    'get_resource_registry',
+    'set_resource_registry',
+]
@@ -0,0 +1,165 @@
+import inspect
+import threading
+from typing import Any, Callable, Hashable, TypeVar
+
+
+T = TypeVar('T')
+
+_registry: "ResourceRegistry | None" = None
+
+
+class ResourceRegistry:
+    """
+    Application-scoped registry of long-lived resources shared across requests.
+
+    Resources such as chat models, cache clients and database clients are created on first use
+    and reused by every subsequent request asking for the same configuration, so connection
+    pools and HTTP sessions are not rebuilt (and leaked) on every call.
+
+    Attributes
+    ----------
+    resources : dict
+        A dictionary mapping `(namespace, key)` tuples to the resources created so far.
+    """
+
+    def __init__(self) -> None:
+        self.resources: dict[tuple[str, Hashable], Any] = {}
+        self._lock = threading.RLock()
+
+    def get_or_create(self, namespace: str, key: Hashable, factory: Callable[[], T]) -> T:
+        """
+        Retrieve the resource registered under `namespace` and `key`, creating it if needed.
+
+        Parameters
+        ----------
+        namespace : str
+            The kind of resource being requested (e.g., 'chatmodel', 'redis').
+        key : Hashable
+            The key identifying the resource configuration within the namespace.
+        factory : Callable[[], T]
+            A callable creating the resource when it is not yet registered.
+
+        Returns
+        -------
+        T
+            The shared resource instance.
+        """
+        with self._lock:
+            if (namespace, key) not in self.resources:
+                self.resources[(namespace, key)] = factory()
+            return self.resources[(namespace, key)]
+
+    def get_resources(self, namespace: str) -> list[Any]:
+        """
+        Retrieve every resource created so far within a namespace.
+
+        Parameters
+        ----------
+        namespace : str
+            The kind of resources to retrieve (e.g., 'store_manager').
+
+        Returns
+        -------
+        list[Any]
+            The resources of the namespace, in creation order.
+        """
+        with self._lock:
+            return [
+                resource for (resource_namespace, _), resource in self.resources.items()
+                if resource_namespace == namespace
+            ]
+
+    async def aclose(self) -> None:
+        """
+        Close every registered resource exposing an `aclose` or `close` method.
+
+        Resources are closed in the reverse order of their creation, so resources depending on
+        others created before them are released first.
+        """
+        with self._lock:
+            resources = list(self.resources.values())
+            self.resources.clear()
+
+        for resource in reversed(resources):
+            close = getattr(resource, 'aclose', None) or getattr(resource, 'close', None)
+            if close is None:
+                continue
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+
+
+def get_resource_registry() -> ResourceRegistry | None:
+    """
+    Get the registry of the running application, or None outside of the application lifespan.
+
+    Returns
+    -------
+    ResourceRegistry or None
+        The current resource registry.
+    """
+    return _registry
+
+
+def set_resource_registry(registry: ResourceRegistry | None) -> None:
+    """
+    Set the registry shared by the factories and builders of the running application.
+
+    Parameters
+    ----------
+    registry : ResourceRegistry or None
+        The registry to use, or None to stop sharing resources.
+    """
+    global _registry
+    _registry = registry
+
+
+def get_or_create_resource(namespace: str, factory: Callable[[], T], *args, **kwargs) -> T:
+    """
+    Retrieve a shared resource from the current registry, creating it if needed.
+
+    The positional and keyword arguments identify the resource configuration. When no registry
+    is active (e.g. outside of the FastAPI application) a new resource is always created.
+
+    Parameters
+    ----------
+    namespace : str
+        The kind of resource being requested (e.g., 'chatmodel', 'redis').
+    factory : Callable[[], T]
+        A callable creating the resource when it is not yet registered.
+    *args, **kwargs
+        The configuration identifying the resource.
+
+    Returns
+    -------
+    T
+        The shared (or newly created) resource instance.
+
+    Examples
+    --------
+    >>> client = get_or_create_resource('redis', lambda: Redis(host='redis'), host='redis')
+    """
+    registry = get_resource_registry()
+    if registry is None:
+        return factory()
+    return registry.get_or_create(namespace, _freeze((args, kwargs)), factory)
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Converts a configuration value into a hashable key.
+
+    Unhashable objects which are not containers are identified by their `id`, which is stable
+    for resources that are themselves kept alive by the registry.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return ('id', id(value))
+    return value
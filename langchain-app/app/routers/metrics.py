@@ -0,0 +1,40 @@
+from fastapi import APIRouter
+
+from app.resources import get_or_create_resource, get_resource_registry
+from app.strategies.admission import AdmissionController
+
+
+router = APIRouter()
+
+
+@router.get("/metrics/admission")
+async def get_admission_metrics():
+    admission_controller = get_or_create_resource('admission_controller', AdmissionController)
+    return admission_controller.get_stats()
+
+
+@router.get("/metrics/storage")
+async def get_storage_metrics():
+    registry = get_resource_registry()
+    store_managers = registry.get_resources('store_manager') if registry is not None else []
+    return [
+        {'store_manager': store_manager.__class__.__name__, **store_manager.get_stats()}
+        for store_manager in store_managers if hasattr(store_manager, 'get_stats')
+    ]
+
+
+@router.get("/metrics/cache")
+async def get_cache_metrics():
+    registry = get_resource_registry()
+    caches = registry.get_resources('cache') if registry is not None else []
+    return [
+        {'cache': cache.__class__.__name__, **cache.get_stats()}
+        for cache in caches if hasattr(cache, 'get_stats')
+    ]
+
+
+@router.get("/metrics/near-duplicates")
+async def get_near_duplicate_metrics():
+    registry = get_resource_registry()
+    indexes = registry.get_resources('near_duplicate_index') if registry is not None else []
+    return [index.get_stats() for index in indexes]
@@ -1,11 +1,23 @@
-from tempfile import NamedTemporaryFile
+import asyncio
+import json
+from typing import AsyncGenerator
 
-import magic
-from fastapi import APIRouter, File, UploadFile
+from fastapi import APIRouter, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
-from app.models import FeedbackForm
+from app.models import FeedbackForm, JobStatus
 from app.factories import StoreManagerFactory
-from app.summarizers.builders import SimmpleSummarizerBuilder, DynamicPromptSummarizerBuilder
+from app.ingestion import SpooledUpload, spool_upload
+from app.jobs import JobQueueFullError
+from app.resources import get_or_create_resource
+from app.summarizers import BaseSummarizer
+from app.summarizers.builders import (
+    DynamicPromptSummarizerBuilder,
+    MapReduceSummarizerBuilder,
+    SimmpleSummarizerBuilder,
+    SummarizerSpec,
+)
 
 
 router = APIRouter()
@@ -13,40 +25,243 @@ router = APIRouter()
 SUMARIZERS = {
     'simple': SimmpleSummarizerBuilder,
     'dynamic-prompt': DynamicPromptSummarizerBuilder,
+    'map-reduce': MapReduceSummarizerBuilder,
 }
+DEFAULT_SUMMARIZER = 'simple'
+# only summarizers supporting pipelining stream section summaries
+DEFAULT_PIPELINED_SUMMARIZER = 'map-reduce'
+
+# loaders yielding the documents of long files while they are still being loaded, so the
+# sections of the document can be summarized in the meantime (videos are still transcribed by
+# the transcription server, segment by segment)
+PIPELINED_LOADER_FROM_MIME_TYPE = {
+    'video/mp4': 'remote-segmented-whisper',
+}
+
+DEFAULT_BATCH_CONCURRENCY = 4
+MAX_BATCH_CONCURRENCY = 16
 
 
 @router.post("/summarize/feedback")
 async def upload_summary_feedback(form: FeedbackForm):
-    storage_manager = StoreManagerFactory().create(store_manager='mongodb')
+    storage_manager = StoreManagerFactory().create(store_manager='async-mongodb')
     await storage_manager.store_summary_feedback(form=form)
     return {'user': form.user, 'document_id': form.document_id}
 
 
 @router.post("/summarize/stream")
-async def stream_summarize(file: UploadFile = File(...)):
-    return await trigger_sumamrization_service(file, execution_strategy='stream')
+async def stream_summarize(
+    file: UploadFile = File(...),
+    summarizer: str | None = Query(None),
+    pipelined: bool = Query(False),
+):
+    if pipelined:
+        summarizer = summarizer or DEFAULT_PIPELINED_SUMMARIZER
+        check_pipelined_summarizer(summarizer)
+        return await trigger_sumamrization_service(
+            file,
+            execution_strategy='pipelined-stream',
+            summarizer=summarizer,
+            loader_from_mime_type=PIPELINED_LOADER_FROM_MIME_TYPE,
+        )
+    return await trigger_sumamrization_service(
+        file, execution_strategy='stream', summarizer=summarizer or DEFAULT_SUMMARIZER
+    )
 
 
 @router.post("/summarize/")
-async def invoke_summarize(file: UploadFile = File(...)):
-    return await trigger_sumamrization_service(file, execution_strategy='invoke')
+async def invoke_summarize(
+    file: UploadFile = File(...),
+    summarizer: str = Query(DEFAULT_SUMMARIZER),
+):
+    return await trigger_sumamrization_service(
+        file, execution_strategy='invoke', summarizer=summarizer
+    )
 
 
-async def trigger_sumamrization_service(file: UploadFile, execution_strategy: str):
-    contents = await file.read()
+@router.post("/summarize/batch")
+async def batch_summarize(
+    files: list[UploadFile] = File(...),
+    max_concurrency: int = Query(DEFAULT_BATCH_CONCURRENCY, ge=1, le=MAX_BATCH_CONCURRENCY),
+    summarizer: str = Query(DEFAULT_SUMMARIZER),
+):
+    check_summarizer(summarizer)
+    uploads = []
+    try:
+        for file in files:
+            uploads.append(await spool_upload(file))
+    except BaseException:
+        for upload in uploads:
+            upload.cleanup()
+        raise
 
-    with NamedTemporaryFile(delete=False) as tmp_file:
-        tmp_file.write(contents)
-        tmp_file.flush()
-        tmp_file.seek(0)  # Ensure the file pointer is at the start
+    return StreamingResponse(
+        _create_batch_stream_generator(
+            uploads, max_concurrency=max_concurrency, summarizer=summarizer
+        ),
+        media_type='application/x-ndjson',
+    )
 
-        service = (
-            SUMARIZERS['simple']()
-            .set_loader(file_type=magic.from_buffer(contents, mime=True), file_path=tmp_file.name)
-            .set_chatmodel(service='ollama', model='llama3.1')
-            .set_execution_strategy(execution_strategy)
-            .build()
+
+@router.post("/summarize/jobs", status_code=202)
+async def submit_summarization_job(
+    request: Request,
+    file: UploadFile = File(...),
+    summarizer: str = Query(DEFAULT_SUMMARIZER),
+) -> JobStatus:
+    check_summarizer(summarizer)
+    upload = await spool_upload(file)
+
+    try:
+        service = build_summarizer(upload, execution_strategy='invoke', summarizer=summarizer)
+        job = request.app.state.job_manager.submit(
+            run=lambda: run_summarization_to_completion(service),
+            on_finish=upload.cleanup,
         )
+    except JobQueueFullError as error:
+        upload.cleanup()
+        raise HTTPException(status_code=429, detail=str(error))
+    except BaseException:
+        upload.cleanup()
+        raise
+
+    return job.get_status()
+
+
+@router.get("/summarize/jobs/{job_id}")
+async def get_summarization_job(request: Request, job_id: str) -> JobStatus:
+    job = request.app.state.job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job.get_status()
+
+
+async def _create_batch_stream_generator(
+    uploads: list[SpooledUpload],
+    max_concurrency: int,
+    summarizer: str = DEFAULT_SUMMARIZER,
+) -> AsyncGenerator[str, None]:
+    """
+    Summarize the uploads concurrently and yield one NDJSON line per file as soon as it finishes.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _summarize(upload: SpooledUpload) -> dict:
+        async with semaphore:
+            try:
+                service = build_summarizer(
+                    upload, execution_strategy='invoke', summarizer=summarizer
+                )
+                result = await run_summarization_to_completion(service)
+                return {'file_name': upload.file_name, **result}
+            except Exception as error:
+                return {'file_name': upload.file_name, 'error': str(error) or repr(error)}
+            finally:
+                upload.cleanup()
+
+    tasks = [asyncio.create_task(_summarize(upload)) for upload in uploads]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield json.dumps(await task) + "\n"
+    finally:
+        for task in tasks:
+            task.cancel()
+        for upload in uploads:
+            upload.cleanup()
+
+
+async def trigger_sumamrization_service(
+    file: UploadFile,
+    execution_strategy: str,
+    summarizer: str = DEFAULT_SUMMARIZER,
+    loader_from_mime_type: dict[str, str] | None = None,
+):
+    check_summarizer(summarizer)
+    upload = await spool_upload(file)
+
+    try:
+        service = build_summarizer(
+            upload,
+            execution_strategy=execution_strategy,
+            summarizer=summarizer,
+            loader=(loader_from_mime_type or {}).get(upload.mime_type),
+        )
+        response = await service.process_summary_generation()
+    except BaseException:
+        upload.cleanup()
+        raise
+
+    # streamed responses still read the spooled file after returning, so it is only removed
+    # once the response has been fully sent
+    response.background = BackgroundTask(upload.cleanup)
+    return response
+
+
+def check_summarizer(summarizer: str) -> None:
+    """
+    Reject requests for unknown summarizers before the upload is spooled.
+    """
+    if summarizer not in SUMARIZERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid summarizer '{summarizer}'. Valid summarizers are: {list(SUMARIZERS)}",
+        )
+
+
+def check_pipelined_summarizer(summarizer: str) -> None:
+    """
+    Reject pipelined requests for summarizers which cannot summarize sections while the
+    document is loaded, as they would only answer once it is entirely loaded.
+    """
+    check_summarizer(summarizer)
+    if not get_summarizer_spec(summarizer).summarizer_class.SUPPORTS_PIPELINING:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Summarizer '{summarizer}' does not support pipelining, use "
+                f"'{DEFAULT_PIPELINED_SUMMARIZER}' instead"
+            ),
+        )
+
+
+def get_summarizer_spec(summarizer: str) -> SummarizerSpec:
+    """
+    Get the spec of the requested summarizer, built once and shared by every request.
+    """
+    return get_or_create_resource(
+        'summarizer_spec',
+        lambda: (
+            SUMARIZERS[summarizer]()
+            .set_chatmodel(service='ollama', model='llama3.1')
+            .build_spec()
+        ),
+        summarizer,
+    )
+
+
+def build_summarizer(
+    upload: SpooledUpload,
+    execution_strategy: str,
+    summarizer: str = DEFAULT_SUMMARIZER,
+    loader: str | None = None,
+) -> BaseSummarizer:
+    """
+    Build the summarizer handling a spooled upload with the given execution strategy and loader
+    (the default loader of the file type if None).
+    """
+    return get_summarizer_spec(summarizer).build(
+        execution_strategy=execution_strategy,
+        file_type=upload.mime_type,
+        file_path=upload.file_path,
+        loader=loader,
+        content_hash=upload.content_hash,
+    )
+
 
-        return await service.process_summary_generation()
+async def run_summarization_to_completion(service: BaseSummarizer) -> dict:
+    """
+    Run the summarization pipeline of a summarizer built with the 'invoke' execution strategy
+    and return the content of its response.
+    """
+    response = await service.process_summary_generation()
+    return json.loads(response.body)
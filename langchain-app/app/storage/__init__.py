@@ -1,7 +1,9 @@
 from app.storage.base_store_manager import BaseStoreManager
 from app.storage.mongodb import MongoDBStoreManager
+from app.storage.async_mongodb import AsyncMongoDBStoreManager
 
 __all__ = [
+    'AsyncMongoDBStoreManager',
     'BaseStoreManager',
     'MongoDBStoreManager',
 ]
@@ -0,0 +1,502 @@
+import asyncio
+import logging
+import os
+from contextlib import suppress
+from typing import Any, BinaryIO
+from gridfs import AsyncGridFSBucket, NoFile
+from pymongo import AsyncMongoClient, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from pymongo.operations import UpdateOne
+from pymongo.results import BulkWriteResult
+
+from app.models import FeedbackForm
+from app.storage.mongodb import MongoDBStoreManager
+from app.storage.originals import (
+    DEFAULT_COMPRESSION,
+    AsyncCompressingReader,
+    decompress,
+    get_stream_hash,
+)
+from app.storage.write_behind import OnResult, WriteBehindBuffer
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMongoDBStoreManager(MongoDBStoreManager):
+    """
+    MongoDB-based store manager relying on the asynchronous PyMongo client.
+
+    Unlike `MongoDBStoreManager`, every database call is awaited, so storing large documents
+    does not block the event loop. The client keeps a connection pool shared by every request
+    using this store manager.
+
+    In write-behind mode, summary and feedback writes are queued and flushed in batches by a
+    `WriteBehindBuffer`, so responses do not wait on the database; original documents are stored
+    in the background before their summary is queued. Queued writes are not visible to reads
+    until flushed, and feedback for unknown summaries is silently ignored.
+
+    Attributes
+    ----------
+    database_name : str
+        The name of the MongoDB database used for storing summaries.
+    collection_name : str
+        The name of the MongoDB collection used for storing summaries.
+    client : AsyncMongoClient
+        The asynchronous MongoDB client used to connect to the database.
+    db : AsyncDatabase
+        The MongoDB database instance.
+    originals : AsyncGridFSBucket
+        The GridFS bucket holding the original documents.
+    compression : str
+        The compression format of newly stored original documents ('zstd' or 'gzip').
+    write_behind_buffer : WriteBehindBuffer or None
+        The buffer of pending writes, if write-behind mode is enabled.
+    """
+
+    DEFAULT_MAX_POOL_SIZE = 100
+    DEFAULT_MIN_POOL_SIZE = 0
+
+    def __init__(
+        self,
+        user: str = 'root',
+        password: str = 'password',
+        port: str = '27017',
+        database_name: str = 'summary_database',
+        collection_name: str = 'summaries',
+        originals_bucket_name: str = MongoDBStoreManager.DEFAULT_ORIGINALS_BUCKET_NAME,
+        compression: str = DEFAULT_COMPRESSION,
+        max_pool_size: int = DEFAULT_MAX_POOL_SIZE,
+        min_pool_size: int = DEFAULT_MIN_POOL_SIZE,
+        write_behind: bool = False,
+        write_behind_batch_size: int = WriteBehindBuffer.DEFAULT_MAX_BATCH_SIZE,
+        write_behind_flush_interval: float = WriteBehindBuffer.DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        """
+        Initializes the AsyncMongoDBStoreManager with database, collection and pool settings.
+
+        Parameters
+        ----------
+        user : str, optional
+            The username for connecting to MongoDB (default is 'root').
+        password : str, optional
+            The password for connecting to MongoDB (default is 'password').
+        port : str, optional
+            The port for connecting to MongoDB (default is '27017').
+        database_name : str, optional
+            The name of the MongoDB database to use (default is 'summary_database').
+        collection_name : str, optional
+            The name of the MongoDB collection to use (default is 'summaries').
+        originals_bucket_name : str, optional
+            The name of the GridFS bucket storing the original documents (default is
+            'originals').
+        compression : str, optional
+            The compression format of the original documents, 'zstd' or 'gzip' (default is
+            'zstd' if the `zstandard` package is installed, 'gzip' otherwise).
+        max_pool_size : int, optional
+            The maximum number of pooled connections (default is 100).
+        min_pool_size : int, optional
+            The minimum number of pooled connections kept open (default is 0).
+        write_behind : bool, optional
+            Whether to queue writes and flush them in batches (default is False).
+        write_behind_batch_size : int, optional
+            The number of queued writes triggering a flush (default is 100).
+        write_behind_flush_interval : float, optional
+            The maximum time, in seconds, a write stays queued (default is 0.5).
+        """
+        connection_string = self.get_connection_string(user=user, password=password, port=port)
+        self.database_name = database_name
+        self.collection_name = collection_name
+        self.originals_bucket_name = originals_bucket_name
+        self.compression = compression
+        self.client = AsyncMongoClient(
+            connection_string, maxPoolSize=max_pool_size, minPoolSize=min_pool_size
+        )
+        self.db = self.client[self.database_name]
+        self.originals = AsyncGridFSBucket(self.db, bucket_name=originals_bucket_name)
+        self._has_indexes = False
+        # summaries stored in the background in write-behind mode, along with their original
+        self._background_stores: set[asyncio.Task] = set()
+        self.write_behind_buffer = (
+            WriteBehindBuffer(
+                collection=self.db[self.collection_name],
+                max_batch_size=write_behind_batch_size,
+                flush_interval=write_behind_flush_interval,
+            )
+            if write_behind else None
+        )
+
+    async def aclose(self) -> None:
+        """
+        Flushes the queued writes, then closes the MongoDB client and its connection pool.
+        """
+        await asyncio.gather(*self._background_stores, return_exceptions=True)
+        if self.write_behind_buffer is not None:
+            await self.write_behind_buffer.aclose()
+        await self.client.close()
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Reports the statistics of the write-behind buffer.
+
+        Returns
+        -------
+        dict[str, Any]
+            The write-behind buffer statistics (along with the number of summaries whose original
+            document is still being stored), or None if write-behind mode is disabled.
+        """
+        return {
+            'write_behind': (
+                {
+                    **self.write_behind_buffer.get_stats(),
+                    'background_stores': len(self._background_stores),
+                }
+                if self.write_behind_buffer is not None else None
+            ),
+        }
+
+    async def _get_summary_document_by_id(self, document_id: str) -> dict[str, Any]:
+        """
+        Retrieves a summary document from MongoDB by its document ID.
+
+        Parameters
+        ----------
+        document_id : str
+            The ID of the document to retrieve.
+
+        Returns
+        -------
+        dict[str, Any]
+            The MongoDB document associated with the given document ID.
+        """
+        collection = self.db[self.collection_name]
+        return await collection.find_one(self._get_summary_filter(document_id))
+
+    async def _ensure_indexes(self) -> None:
+        """
+        Creates the indexes of the summaries and original documents collections on first use.
+        """
+        if not self._has_indexes:
+            for collection_name, indexes in self._get_indexes().items():
+                await self.db[collection_name].create_indexes(indexes)
+            self._has_indexes = True
+
+    async def get_summary(self, **kwargs):
+        """
+        Retrieves a summary from MongoDB.
+
+        This is a wrapper method for `_get_summary_document_by_id`.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            Keyword arguments used to find the summary document.
+
+        Returns
+        -------
+        dict[str, Any]
+            The summary document.
+        """
+        return await self._get_summary_document_by_id(**kwargs)
+
+    async def get_summary_by_content_key(self, content_key: str) -> dict[str, Any] | None:
+        """
+        Retrieves a summary previously stored for the given content key.
+
+        The original document (nor the bytes embedded by older summaries) is not fetched, as
+        only the summary is needed to reuse it.
+
+        Parameters
+        ----------
+        content_key : str
+            The content key computed by the summarizer.
+
+        Returns
+        -------
+        dict[str, Any] or None
+            The summary document or None if no summary was stored for the content key.
+        """
+        await self._ensure_indexes()
+        collection = self.db[self.collection_name]
+        return await collection.find_one(**self._get_content_key_query(content_key))
+
+    async def store_summary(
+        self,
+        _id: str,
+        summary: str,
+        metadata: dict,
+        document_path: str,
+        content_key: str = None,
+        content_hash: str = None,
+    ) -> str:
+        """
+        Stores a summary and its metadata in MongoDB.
+
+        The method references the original document by its content hash, streaming it from
+        `document_path` to GridFS only if it was not stored yet. It then stores the generated
+        summary and its metadata along with the hash of the original. The summary is written
+        with a single upsert, which leaves an already stored summary with the same `_id`
+        untouched; in that case the reference to the original is released.
+
+        In write-behind mode, the method returns right away: the document is opened, so it can
+        still be read once `document_path` is removed, and both the original and the summary
+        are stored in the background, the summary upsert being queued. The reference to the
+        original is released once the queued upsert is flushed without upserting the summary
+        (or dropped), and kept when a failed flush leaves it unknown whether the summary was
+        written.
+
+        Parameters
+        ----------
+        _id : str
+            The unique identifier of the document (usually from the model execution).
+        summary : str
+            The summary generated by the language model (LLM).
+        metadata : dict
+            Metadata associated with the summary, including details about the document.
+        document_path : str
+            The path to the original document (e.g., PDF or other types).
+        content_key : str, optional
+            The content key under which the summary can be retrieved later (default is None).
+        content_hash : str, optional
+            The SHA-256 hash of the original document, computed from the file if None (default
+            is None).
+
+        Returns
+        -------
+        str
+            The ID of the stored document (typically the same as `_id`).
+        """
+        await self._ensure_indexes()
+        summary_fields = {
+            '_id': _id, 'summary': summary, 'metadata': metadata, 'content_key': content_key,
+        }
+        if self.write_behind_buffer is not None:
+            # the open document stays readable once the spooled upload is cleaned up
+            task = asyncio.create_task(
+                self._store_summary_in_background(
+                    document=open(document_path, 'rb'),
+                    content_hash=content_hash,
+                    **summary_fields,
+                )
+            )
+            self._background_stores.add(task)
+            task.add_done_callback(self._background_stores.discard)
+            return _id
+
+        with open(document_path, 'rb') as document:
+            original_document_hash = await self._store_original_document(
+                document=document, content_hash=content_hash
+            )
+        write_result = await self._write(
+            self._get_summary_upsert(
+                original_document_hash=original_document_hash, **summary_fields
+            )
+        )
+        if not write_result.upserted_count:
+            await self._release_original_document(original_document_hash)
+        return _id
+
+    async def _store_summary_in_background(
+        self,
+        document: BinaryIO,
+        content_hash: str | None,
+        **summary_fields,
+    ) -> None:
+        """
+        Stores the original document, then queues the summary upsert, closing the document
+        once it is stored.
+
+        Parameters
+        ----------
+        document : BinaryIO
+            The original document, opened in binary mode.
+        content_hash : str or None
+            The SHA-256 hash of the original document, computed from the document if None.
+        **summary_fields : dict
+            The `_id`, `summary`, `metadata` and `content_key` of the summary.
+        """
+        try:
+            with document:
+                original_document_hash = await self._store_original_document(
+                    document=document, content_hash=content_hash
+                )
+        except Exception as error:
+            logger.error(
+                "Dropped summary '%s' after failing to store its original document: %r",
+                summary_fields['_id'], error,
+            )
+            return
+
+        async def _release_unless_upserted(upserted: bool | None) -> None:
+            if upserted is False:
+                await self._release_original_document(original_document_hash)
+
+        await self._write(
+            self._get_summary_upsert(
+                original_document_hash=original_document_hash, **summary_fields
+            ),
+            on_result=_release_unless_upserted,
+        )
+
+    async def get_original_document(self, content_hash: str) -> bytes | None:
+        """
+        Retrieves and decompresses an original document by its content hash.
+
+        Parameters
+        ----------
+        content_hash : str
+            The SHA-256 hash of the original document.
+
+        Returns
+        -------
+        bytes or None
+            The original document, or None if no document is stored for the content hash.
+        """
+        files = self.db[self._get_originals_files_collection_name()]
+        original = await files.find_one(self._get_original_document_filter(content_hash))
+        if original is None:
+            return None
+        download_stream = await self.originals.open_download_stream(original["_id"])
+        data = await download_stream.read()
+        return await asyncio.to_thread(
+            decompress, data, compression=original["metadata"].get("compression")
+        )
+
+    async def _store_original_document(
+        self,
+        document: BinaryIO,
+        content_hash: str = None,
+    ) -> str:
+        """
+        Adds a reference to an original document, compressing and streaming it to GridFS chunk
+        by chunk if no document with the same content hash is stored yet.
+
+        Parameters
+        ----------
+        document : BinaryIO
+            The original document, opened in binary mode and read from its start.
+        content_hash : str, optional
+            The SHA-256 hash of the original document, computed from the document if None
+            (default is None).
+
+        Returns
+        -------
+        str
+            The content hash of the original document.
+        """
+        if content_hash is None:
+            content_hash = await asyncio.to_thread(get_stream_hash, document)
+            document.seek(0)
+        if await self._add_original_document_reference(content_hash):
+            return content_hash
+
+        # the size is read from the open document, whose path may already be removed
+        upload = self._get_original_document_upload(
+            content_hash=content_hash,
+            document_path=document.name,
+            size=os.fstat(document.fileno()).st_size,
+        )
+        try:
+            await self.originals.upload_from_stream_with_id(
+                source=AsyncCompressingReader(document, compression=self.compression),
+                **upload,
+            )
+        except DuplicateKeyError:
+            # the same document was stored concurrently, only its chunks were written
+            with suppress(NoFile):
+                await self.originals.delete(upload['file_id'])
+            await self._add_original_document_reference(content_hash)
+        return content_hash
+
+    async def _add_original_document_reference(self, content_hash: str) -> bool:
+        """
+        Increments the reference count of an original document.
+
+        Parameters
+        ----------
+        content_hash : str
+            The SHA-256 hash of the original document.
+
+        Returns
+        -------
+        bool
+            True if the original document is stored, otherwise False.
+        """
+        files = self.db[self._get_originals_files_collection_name()]
+        update_result = await files.update_one(
+            self._get_original_document_filter(content_hash),
+            self._get_original_document_reference_update(increment=1),
+        )
+        return update_result.matched_count > 0
+
+    async def _release_original_document(self, content_hash: str) -> None:
+        """
+        Decrements the reference count of an original document, deleting it once unreferenced.
+
+        Parameters
+        ----------
+        content_hash : str
+            The SHA-256 hash of the original document.
+        """
+        files = self.db[self._get_originals_files_collection_name()]
+        original = await files.find_one_and_update(
+            self._get_original_document_filter(content_hash),
+            self._get_original_document_reference_update(increment=-1),
+            return_document=ReturnDocument.AFTER,
+        )
+        if not self._is_original_document_unreferenced(original):
+            return
+        delete_result = await files.delete_one(
+            self._get_unreferenced_original_document_filter(original)
+        )
+        if delete_result.deleted_count:
+            with suppress(NoFile):
+                await self.originals.delete(original["_id"])
+
+    async def store_summary_feedback(self, form: FeedbackForm) -> None:
+        """
+        Stores user feedback for a summary in MongoDB.
+
+        This method updates the summary document with feedback provided in the form. In
+        write-behind mode the update is queued and missing documents are not reported.
+
+        Parameters
+        ----------
+        form : FeedbackForm
+            The feedback form containing user feedback on the summary.
+
+        Raises
+        ------
+        ValueError
+            If no document is found matching the provided feedback form's `document_id`.
+        """
+        update_result = await self._write(self._get_feedback_update(form=form))
+
+        if update_result is not None and update_result.matched_count == 0:
+            raise ValueError(f"Failed to update document with ObjectId '{form.document_id}'")
+
+    async def _write(
+        self,
+        operation: UpdateOne,
+        on_result: OnResult | None = None,
+    ) -> BulkWriteResult | None:
+        """
+        Executes a write operation right away, or queues it in write-behind mode.
+
+        Parameters
+        ----------
+        operation : UpdateOne
+            The write operation.
+        on_result : OnResult, optional
+            The coroutine function awaited with whether the queued operation upserted a document,
+            or None if unknown, once it is flushed (default is None).
+
+        Returns
+        -------
+        BulkWriteResult or None
+            The result of the write, or None if it was queued.
+        """
+        if self.write_behind_buffer is not None:
+            await self.write_behind_buffer.add(operation, on_result=on_result)
+            return None
+        return await self.db[self.collection_name].bulk_write([operation])
@@ -12,7 +12,9 @@ class BaseStoreManager(ABC):
     -------
     get_summary()
         Abstract method to retrieve a summary from the database.
-    store_summary(_id, summary, metadata, document)
+    get_summary_by_content_key(content_key)
+        Abstract method to retrieve a summary previously stored for the same content key.
+    store_summary(_id, summary, metadata, document_path, content_key, content_hash)
         Abstract method to store a summary and its associated metadata in the database.
     store_summary_feedback(form)
         Abstract method to store user feedback on the generated summary.
@@ -31,14 +33,43 @@ class BaseStoreManager(ABC):
         pass
 
     @abstractmethod
-    def store_summary(self, _id: str, summary: str, metadata: dict, document: bytes) -> str:
+    def get_summary_by_content_key(self, content_key: str) -> dict | None:
+        """
+        Retrieve a summary previously stored for the given content key.
+
+        The content key identifies the original document bytes along with the summarizer
+        configuration, so a stored summary can be reused instead of generating it again.
+
+        Parameters
+        ----------
+        content_key : str
+            The content key computed by the summarizer.
+
+        Returns
+        -------
+        dict or None
+            The stored summary (with, at least, its `_id` and `summary`) or None if no summary
+            was stored for the content key.
+        """
+        pass
+
+    @abstractmethod
+    def store_summary(
+        self,
+        _id: str,
+        summary: str,
+        metadata: dict,
+        document_path: str,
+        content_key: str = None,
+        content_hash: str = None,
+    ) -> str:
         """
         Store a summary and its related metadata in the database.
 
         This method saves the generated summary produced by the LLM, along with its associated
-        metadata and the original document in byte form. The `_id` parameter is the identifier
-        returned by the BaseModel execution, encapsulated within an `AIMessage` object, which
-        results from a model invocation.
+        metadata and the original document read from `document_path`. The `_id` parameter is the
+        identifier returned by the BaseModel execution, encapsulated within an `AIMessage` object,
+        which results from a model invocation.
 
         Parameters
         ----------
@@ -50,8 +81,14 @@ class BaseStoreManager(ABC):
         metadata : dict
             A dictionary containing information about the summary generation, including metadata
             about the original document, class, generation metadata, and other relevant details.
-        document : bytes
-            The original document in byte format (e.g. a PDF, audio, or other file).
+        document_path : str
+            The path to the original document (e.g. a PDF, audio, or other file), which should
+            be streamed to the database rather than read into memory at once.
+        content_key : str, optional
+            The content key under which the summary can be retrieved later (default is None).
+        content_hash : str, optional
+            The hash of the original document bytes, allowing the document to be stored once
+            for every summary generated from it (default is None).
 
         Returns
         -------
@@ -0,0 +1,179 @@
+import asyncio
+import hashlib
+import zlib
+from typing import BinaryIO
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# zstd compresses faster and better than gzip, which is used when `zstandard` is not installed
+DEFAULT_COMPRESSION = 'zstd' if zstandard is not None else 'gzip'
+DEFAULT_READ_SIZE_IN_BYTES = 1024 * 1024  # 1MB
+ZSTD_COMPRESSION_LEVEL = 3
+GZIP_WBITS = 31  # zlib window size producing gzip-framed data
+
+
+def get_compressor(compression: str = DEFAULT_COMPRESSION):
+    """
+    Creates an incremental compressor (with `compress` and `flush` methods).
+
+    Parameters
+    ----------
+    compression : str, optional
+        The compression format, 'zstd' or 'gzip' (default is 'zstd' if available).
+
+    Returns
+    -------
+    Any
+        The compressor object.
+
+    Raises
+    ------
+    ValueError
+        If the compression format is not supported.
+    """
+    if compression == 'zstd' and zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_COMPRESSION_LEVEL).compressobj()
+    if compression == 'gzip':
+        return zlib.compressobj(wbits=GZIP_WBITS)
+    raise ValueError(f"Unsupported compression '{compression}'")
+
+
+def decompress(data: bytes, compression: str | None) -> bytes:
+    """
+    Decompresses data compressed by a compressor from `get_compressor`.
+
+    Parameters
+    ----------
+    data : bytes
+        The compressed data.
+    compression : str or None
+        The compression format, 'zstd', 'gzip' or None for uncompressed data.
+
+    Returns
+    -------
+    bytes
+        The decompressed data.
+
+    Raises
+    ------
+    ValueError
+        If the compression format is not supported.
+    """
+    if compression is None:
+        return data
+    if compression == 'zstd' and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    if compression == 'gzip':
+        return zlib.decompress(data, wbits=GZIP_WBITS)
+    raise ValueError(f"Unsupported compression '{compression}'")
+
+
+def get_file_hash(file_path: str) -> str:
+    """
+    Computes the SHA-256 hex digest of a file, reading it in chunks.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the file.
+
+    Returns
+    -------
+    str
+        The SHA-256 hex digest of the file contents.
+    """
+    with open(file_path, 'rb') as file:
+        return get_stream_hash(file)
+
+
+def get_stream_hash(stream: BinaryIO) -> str:
+    """
+    Computes the SHA-256 hex digest of a binary stream, reading it in chunks from its current
+    position to its end.
+
+    Parameters
+    ----------
+    stream : BinaryIO
+        The binary stream.
+
+    Returns
+    -------
+    str
+        The SHA-256 hex digest of the stream contents.
+    """
+    hasher = hashlib.sha256()
+    while chunk := stream.read(DEFAULT_READ_SIZE_IN_BYTES):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class CompressingReader:
+    """
+    File-like object compressing a binary stream as it is read, so it can be streamed to GridFS
+    without holding the whole (compressed) document in memory.
+
+    Attributes
+    ----------
+    source : BinaryIO
+        The binary stream being compressed.
+    compression : str
+        The compression format.
+    size : int
+        The number of uncompressed bytes read from the source so far.
+    """
+
+    def __init__(
+        self,
+        source: BinaryIO,
+        compression: str = DEFAULT_COMPRESSION,
+        read_size: int = DEFAULT_READ_SIZE_IN_BYTES,
+    ) -> None:
+        self.source = source
+        self.compression = compression
+        self.size = 0
+        self._read_size = read_size
+        self._compressor = get_compressor(compression)
+        self._buffer = bytearray()
+        self._exhausted = False
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Reads up to `size` compressed bytes, or every remaining compressed byte if negative.
+
+        Parameters
+        ----------
+        size : int, optional
+            The maximum number of bytes to return (default is -1).
+
+        Returns
+        -------
+        bytes
+            The compressed bytes, empty once the source is exhausted.
+        """
+        while not self._exhausted and (size < 0 or len(self._buffer) < size):
+            chunk = self.source.read(self._read_size)
+            if chunk:
+                self.size += len(chunk)
+                self._buffer += self._compressor.compress(chunk)
+            else:
+                self._buffer += self._compressor.flush()
+                self._exhausted = True
+
+        size = len(self._buffer) if size < 0 else size
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+class AsyncCompressingReader(CompressingReader):
+    """
+    CompressingReader reading and compressing in a worker thread, for the asynchronous GridFS
+    bucket, so the event loop is not blocked.
+    """
+
+    async def read(self, size: int = -1) -> bytes:
+        return await asyncio.to_thread(super().read, size)
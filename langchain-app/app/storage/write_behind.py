@@ -0,0 +1,290 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Collection
+
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import BulkWriteError
+from pymongo.operations import UpdateOne
+
+
+logger = logging.getLogger(__name__)
+
+# called once a queued operation is written (or dropped) with whether it upserted a document,
+# or None if unknown
+OnResult = Callable[[bool | None], Awaitable[None]]
+
+
+class WriteBehindBuffer:
+    """
+    Buffers MongoDB write operations and flushes them in batches with `bulk_write`.
+
+    Operations are flushed, in submission order, as soon as `max_batch_size` of them are
+    pending or every `flush_interval` seconds, whichever comes first. Once `max_queue_size`
+    operations are pending, adding more waits for a flush, bounding the memory used by the
+    buffer.
+
+    Operations of a failed flush are put back at the head of the queue, so they keep their
+    order, and retried after an exponential backoff; they are only dropped (and logged) once
+    they failed `max_retries` retries. Operations rejected by the server (e.g. invalid updates)
+    are dropped right away, as retrying them would fail again. The `on_result` callback of an
+    operation, if any, is awaited once it is written or dropped, with whether it upserted a
+    document; that is unknown (None) when a failed flush might have written it already.
+
+    Attributes
+    ----------
+    collection : AsyncCollection
+        The collection the operations are written to.
+    max_batch_size : int
+        The number of pending operations triggering a flush, and the size of each bulk write.
+    flush_interval : float
+        The maximum time, in seconds, an operation stays pending.
+    max_queue_size : int
+        The number of pending operations above which adding more waits for a flush.
+    max_retries : int
+        The number of times the operations of a failed flush are retried before being dropped.
+    retry_backoff : float
+        The time, in seconds, waited before the first retry, doubled for each following one.
+    """
+
+    DEFAULT_MAX_BATCH_SIZE = 100
+    DEFAULT_FLUSH_INTERVAL = 0.5
+    DEFAULT_MAX_QUEUE_SIZE = 10_000
+    DEFAULT_MAX_RETRIES = 3
+    DEFAULT_RETRY_BACKOFF = 0.5
+
+    def __init__(
+        self,
+        collection: AsyncCollection,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    ) -> None:
+        """
+        Initializes the WriteBehindBuffer; the flushing task starts with the first operation.
+
+        Parameters
+        ----------
+        collection : AsyncCollection
+            The collection the operations are written to.
+        max_batch_size : int, optional
+            The number of pending operations triggering a flush (default is 100).
+        flush_interval : float, optional
+            The maximum time, in seconds, an operation stays pending (default is 0.5).
+        max_queue_size : int, optional
+            The number of pending operations above which adding more waits for a flush
+            (default is 10000).
+        max_retries : int, optional
+            The number of times the operations of a failed flush are retried before being
+            dropped (default is 3).
+        retry_backoff : float, optional
+            The time, in seconds, waited before the first retry, doubled for each following one
+            (default is 0.5).
+        """
+        self.collection = collection
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.flushes = 0
+        self.flushed_operations = 0
+        self.retried_operations = 0
+        self.dropped_operations = 0
+        self.last_error = None
+        self.last_flush_latency_seconds = 0.0
+        self.max_flush_latency_seconds = 0.0
+        self.total_flush_latency_seconds = 0.0
+        # pending operations along with the number of failed flushes they were part of and their
+        # result callback
+        self._pending: list[tuple[UpdateOne, int, OnResult | None]] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    async def add(self, operation: UpdateOne, on_result: OnResult | None = None) -> None:
+        """
+        Queues a write operation to be flushed later.
+
+        Parameters
+        ----------
+        operation : UpdateOne
+            The write operation.
+        on_result : OnResult, optional
+            The coroutine function awaited, once the operation is written or dropped, with
+            whether it upserted a document, or None if unknown (default is None).
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+        self._pending.append((operation, 0, on_result))
+        if self.queue_depth >= self.max_batch_size:
+            self._flush_requested.set()
+        if self.queue_depth >= self.max_queue_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """
+        Writes every pending operation, in batches of at most `max_batch_size` operations.
+
+        Failed batches are retried after a backoff until they are written or dropped, so this
+        waits for at most about `retry_backoff * 2 ** max_retries` seconds per failing batch.
+        """
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+
+                started_at = time.perf_counter()
+                try:
+                    write_result = await self.collection.bulk_write(
+                        [operation for operation, _, _ in batch], ordered=True
+                    )
+                    self.flushed_operations += len(batch)
+                    await self._notify(batch, upserted_indexes=write_result.upserted_ids.keys())
+                except BulkWriteError as error:
+                    self.last_error = repr(error)
+                    await self._handle_write_error(batch, error)
+                except Exception as error:
+                    self.last_error = repr(error)
+                    retry_delay = await self._requeue_failed_batch(batch, error)
+                    if retry_delay is not None:
+                        self._record_flush(latency_seconds=time.perf_counter() - started_at)
+                        await asyncio.sleep(retry_delay)
+                        continue
+                self._record_flush(latency_seconds=time.perf_counter() - started_at)
+
+    async def aclose(self) -> None:
+        """
+        Stops the flushing task and writes the operations still pending.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Reports the buffer settings, the number of pending operations and the flush latencies.
+
+        Returns
+        -------
+        dict[str, Any]
+            The buffer statistics.
+        """
+        return {
+            'max_batch_size': self.max_batch_size,
+            'flush_interval': self.flush_interval,
+            'max_queue_size': self.max_queue_size,
+            'queue_depth': self.queue_depth,
+            'flushes': self.flushes,
+            'flushed_operations': self.flushed_operations,
+            'retried_operations': self.retried_operations,
+            'dropped_operations': self.dropped_operations,
+            'last_error': self.last_error,
+            'last_flush_latency_seconds': self.last_flush_latency_seconds,
+            'avg_flush_latency_seconds': (
+                self.total_flush_latency_seconds / self.flushes if self.flushes else 0.0
+            ),
+            'max_flush_latency_seconds': self.max_flush_latency_seconds,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+    async def _handle_write_error(
+        self,
+        batch: list[tuple[UpdateOne, int, OnResult | None]],
+        error: BulkWriteError,
+    ) -> None:
+        # the operations of an ordered bulk write are written up to the first rejected one,
+        # which would be rejected again, and the following ones are not attempted
+        write_errors = error.details.get('writeErrors') or []
+        if not write_errors:
+            await self._requeue_failed_batch(batch, error)
+            return
+
+        failed_index = write_errors[0]['index']
+        self.flushed_operations += failed_index
+        self._pending[:0] = batch[failed_index + 1:]
+        await self._notify(
+            batch[:failed_index],
+            upserted_indexes=[upsert['index'] for upsert in error.details.get('upserted', [])],
+        )
+        await self._drop(batch[failed_index:failed_index + 1], error, rejected=True)
+
+    async def _requeue_failed_batch(
+        self,
+        batch: list[tuple[UpdateOne, int, OnResult | None]],
+        error: Exception,
+    ) -> float | None:
+        # returns the delay before retrying the batch, or None if it was dropped
+        attempts = max(operation_attempts for _, operation_attempts, _ in batch) + 1
+        if attempts > self.max_retries:
+            await self._drop(batch, error, rejected=False)
+            return None
+
+        logger.warning(
+            "Failed to flush %d write operations (attempt %d), retrying: %r",
+            len(batch), attempts, error,
+        )
+        self.retried_operations += len(batch)
+        self._pending[:0] = [
+            (operation, attempts, on_result) for operation, _, on_result in batch
+        ]
+        return self.retry_backoff * 2 ** (attempts - 1)
+
+    async def _drop(
+        self,
+        batch: list[tuple[UpdateOne, int, OnResult | None]],
+        error: Exception,
+        rejected: bool,
+    ) -> None:
+        self.dropped_operations += len(batch)
+        logger.error(
+            "Dropped %d write operations after %r: %s",
+            len(batch), error, [operation for operation, _, _ in batch],
+        )
+        # operations rejected by the server were not written, unlike those of failed flushes
+        await self._notify(batch, upserted_indexes=(), failed=not rejected)
+
+    async def _notify(
+        self,
+        batch: list[tuple[UpdateOne, int, OnResult | None]],
+        upserted_indexes: Collection[int],
+        failed: bool = False,
+    ) -> None:
+        # the indexes are those of the upserting operations within the batch; operations of
+        # failed flushes might have been written without their result being received
+        for index, (_, attempts, on_result) in enumerate(batch):
+            if on_result is None:
+                continue
+            if index in upserted_indexes:
+                upserted = True
+            elif attempts or failed:
+                upserted = None
+            else:
+                upserted = False
+            try:
+                await on_result(upserted)
+            except Exception as error:
+                logger.warning("Write operation result callback failed: %r", error)
+
+    def _record_flush(self, latency_seconds: float) -> None:
+        self.flushes += 1
+        self.last_flush_latency_seconds = latency_seconds
+        self.total_flush_latency_seconds += latency_seconds
+        self.max_flush_latency_seconds = max(self.max_flush_latency_seconds, latency_seconds)
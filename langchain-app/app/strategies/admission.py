@@ -0,0 +1,280 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+
+# maps the `_llm_type` of the chat models created by the ChatModelFactory to their service name
+BACKEND_FROM_LLM_TYPE = {
+    'chat-ollama': 'ollama',
+    'chat-google-generative-ai': 'google-genai',
+    'vertexai': 'google-vertex',
+}
+
+
+class AdmissionRejectedError(Exception):
+    """
+    Raised when a generation is not admitted by the limiter of its backend.
+
+    Attributes
+    ----------
+    backend : str
+        The backend which rejected the generation.
+    status_code : int
+        The HTTP status code to answer with: 429 when the queue is full, 503 when the generation
+        waited in the queue for too long.
+    """
+
+    def __init__(self, backend: str, message: str, status_code: int) -> None:
+        super().__init__(message)
+        self.backend = backend
+        self.status_code = status_code
+
+
+class AdmissionTicket:
+    """
+    A generation slot granted by a BackendLimiter, released at most once.
+    """
+
+    def __init__(self, limiter: "BackendLimiter | None" = None) -> None:
+        self._limiter = limiter
+
+    def release(self) -> None:
+        """
+        Releases the slot, handing it over to the next queued generation (if any).
+        """
+        if self._limiter is not None:
+            limiter, self._limiter = self._limiter, None
+            limiter._release()
+
+
+class BackendLimiter:
+    """
+    First-in, first-out limiter of the concurrent generations sent to a single backend.
+
+    Generations over `max_concurrency` wait in a queue holding at most `max_queue_size` of them
+    for up to `max_wait_seconds`; anything beyond that is rejected with AdmissionRejectedError.
+
+    Attributes
+    ----------
+    backend : str
+        The name of the backend (e.g., 'ollama').
+    max_concurrency : int
+        The maximum number of concurrent generations.
+    max_queue_size : int
+        The maximum number of generations waiting for a slot.
+    max_wait_seconds : float
+        The maximum time a generation waits for a slot.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        max_concurrency: int,
+        max_queue_size: int,
+        max_wait_seconds: float,
+    ) -> None:
+        self.backend = backend
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.max_wait_seconds = max_wait_seconds
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.total_wait_seconds = 0.0
+        self.max_observed_wait_seconds = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(not waiter.done() for waiter in self._waiters)
+
+    async def acquire(self) -> AdmissionTicket:
+        """
+        Waits for a generation slot.
+
+        Returns
+        -------
+        AdmissionTicket
+            The ticket which must be released once the generation is over.
+
+        Raises
+        ------
+        AdmissionRejectedError
+            If the queue is full (429) or no slot was freed within `max_wait_seconds` (503).
+        """
+        if self.in_flight < self.max_concurrency and not self.queue_depth:
+            self.in_flight += 1
+            self._record_admission(wait_seconds=0.0)
+            return AdmissionTicket(self)
+
+        if self.queue_depth >= self.max_queue_size:
+            self.rejected_queue_full += 1
+            raise AdmissionRejectedError(
+                backend=self.backend,
+                message=f"Too many pending generations for '{self.backend}', try again later",
+                status_code=429,
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, timeout=self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            self.rejected_timeout += 1
+            raise AdmissionRejectedError(
+                backend=self.backend,
+                message=(
+                    f"No '{self.backend}' generation slot freed up within "
+                    f"{self.max_wait_seconds}s, try again later"
+                ),
+                status_code=503,
+            ) from None
+        except asyncio.CancelledError:
+            # the slot may have been handed over right before the cancellation
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+        self._record_admission(wait_seconds=time.perf_counter() - started_at)
+        return AdmissionTicket(self)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Holds a generation slot for the duration of the context.
+        """
+        ticket = await self.acquire()
+        try:
+            yield
+        finally:
+            ticket.release()
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Reports the limiter settings, its current load and the observed waiting times.
+
+        Returns
+        -------
+        dict[str, Any]
+            The limiter statistics.
+        """
+        return {
+            'max_concurrency': self.max_concurrency,
+            'max_queue_size': self.max_queue_size,
+            'max_wait_seconds': self.max_wait_seconds,
+            'in_flight': self.in_flight,
+            'queue_depth': self.queue_depth,
+            'admitted': self.admitted,
+            'rejected_queue_full': self.rejected_queue_full,
+            'rejected_timeout': self.rejected_timeout,
+            'avg_wait_seconds': self.total_wait_seconds / self.admitted if self.admitted else 0.0,
+            'max_wait_seconds_observed': self.max_observed_wait_seconds,
+        }
+
+    def _record_admission(self, wait_seconds: float) -> None:
+        self.admitted += 1
+        self.total_wait_seconds += wait_seconds
+        self.max_observed_wait_seconds = max(self.max_observed_wait_seconds, wait_seconds)
+
+    def _release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # the slot is handed over, `in_flight` is unchanged
+                return
+        self.in_flight -= 1
+
+
+class AdmissionController:
+    """
+    Per-backend admission control of the generations sent to the chat model services.
+
+    Attributes
+    ----------
+    limiters : dict
+        A dictionary mapping backend names (str) to their BackendLimiter.
+    """
+
+    DEFAULT_LIMITS = {
+        'ollama': {'max_concurrency': 2, 'max_queue_size': 16, 'max_wait_seconds': 60.0},
+        'google-genai': {'max_concurrency': 8, 'max_queue_size': 64, 'max_wait_seconds': 30.0},
+        'google-vertex': {'max_concurrency': 8, 'max_queue_size': 64, 'max_wait_seconds': 30.0},
+    }
+
+    def __init__(self, limits: dict[str, dict[str, Any]] | None = None) -> None:
+        """
+        Initializes the AdmissionController with one limiter per configured backend.
+
+        Parameters
+        ----------
+        limits : dict, optional
+            A dictionary mapping backend names to the keyword arguments of their BackendLimiter,
+            overriding the defaults of the corresponding backends (default is None).
+        """
+        limits = {**self.DEFAULT_LIMITS, **(limits or {})}
+        self.limiters = {
+            backend: BackendLimiter(backend=backend, **backend_limits)
+            for backend, backend_limits in limits.items()
+        }
+
+    def get_backend(self, chatmodel: BaseChatModel) -> str | None:
+        """
+        Resolves the backend name of a chat model.
+
+        Parameters
+        ----------
+        chatmodel : BaseChatModel
+            The chat model sending the generations.
+
+        Returns
+        -------
+        str or None
+            The backend name, or None if the chat model type is unknown.
+        """
+        return BACKEND_FROM_LLM_TYPE.get(chatmodel._llm_type)
+
+    async def acquire(self, chatmodel: BaseChatModel) -> AdmissionTicket:
+        """
+        Waits for a generation slot on the backend of the chat model.
+
+        Chat models without a configured limiter are admitted right away.
+
+        Parameters
+        ----------
+        chatmodel : BaseChatModel
+            The chat model sending the generation.
+
+        Returns
+        -------
+        AdmissionTicket
+            The ticket which must be released once the generation is over.
+
+        Raises
+        ------
+        AdmissionRejectedError
+            If the generation is rejected by the backend limiter.
+        """
+        limiter = self.limiters.get(self.get_backend(chatmodel))
+        if limiter is None:
+            return AdmissionTicket()
+        return await limiter.acquire()
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Reports the statistics of every backend limiter.
+
+        Returns
+        -------
+        dict[str, dict[str, Any]]
+            A dictionary mapping backend names to their limiter statistics.
+        """
+        return {backend: limiter.get_stats() for backend, limiter in self.limiters.items()}
@@ -3,13 +3,35 @@ from typing import Any, AsyncGenerator, AsyncIterator, Dict
 from abc import ABC, abstractmethod
 
 from fastapi.responses import StreamingResponse, Response
+from starlette.types import Receive, Scope, Send
 from langchain_core.documents.base import Document
 from langchain_core.messages.ai import AIMessageChunk, AIMessage
 from langchain_core.runnables.base import Runnable
 
+from app.strategies.admission import AdmissionTicket
 from app.summarizers import BaseSummarizer
 
 
+class TicketStreamingResponse(StreamingResponse):
+    """
+    Streaming response releasing a generation slot once it is over.
+
+    The stream generator releases the slot as soon as the summary is generated, but it never
+    runs when the client disconnects before the response starts; the slot is then released
+    when the response ends (releasing a ticket twice does nothing).
+    """
+
+    def __init__(self, content: AsyncIterator[str], ticket: AdmissionTicket, **kwargs) -> None:
+        super().__init__(content, **kwargs)
+        self.ticket = ticket
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.ticket.release()
+
+
 class BaseExecutionStrategy(ABC):
     """
     Abstract base class for execution strategies that handle the running of a summarizer
@@ -21,8 +43,14 @@ class BaseExecutionStrategy(ABC):
         Executes a runnable task with the provided keyword arguments.
     process_summary_generation(summarizer, content, file_name)
         Asynchronously processes summary generation for the provided content.
+    replay_summary(summary, summary_id)
+        Returns a previously stored summary in the same format as a generated one.
     """
 
+    # pipelined strategies summarize the documents of pipelining summarizers while they are
+    # still being loaded, so they receive an asynchronous iterator instead of a list
+    PIPELINED = False
+
     @abstractmethod
     def run(self, runnable: Runnable, **kwargs) -> Any:
         """
@@ -68,6 +96,25 @@ class BaseExecutionStrategy(ABC):
         """
         pass
 
+    @abstractmethod
+    def replay_summary(self, summary: str, summary_id: str) -> Response | StreamingResponse:
+        """
+        Returns a previously stored summary in the same format as a generated one.
+
+        Parameters
+        ----------
+        summary : str
+            The stored summary.
+        summary_id : str
+            The ID of the stored summary.
+
+        Returns
+        -------
+        Response or StreamingResponse
+            The response containing the stored summary.
+        """
+        pass
+
 
 class StreamingStrategy(BaseExecutionStrategy):
     """
@@ -79,6 +126,8 @@ class StreamingStrategy(BaseExecutionStrategy):
         Executes a runnable task and returns an asynchronous iterator over message chunks.
     process_summary_generation(summarizer, content)
         Asynchronously processes summary generation and streams the result.
+    replay_summary(summary, summary_id)
+        Streams a previously stored summary as a single chunk.
     """
 
     def run(self, runnable: Runnable, **kwargs) -> AsyncIterator[AIMessageChunk]:
@@ -107,8 +156,8 @@ class StreamingStrategy(BaseExecutionStrategy):
         """
         Asynchronously processes the summary generation and streams the result.
 
-        This method uses the summarizer to load content, generate the summary in chunks, and
-        stream the summary back to the client as a JSON response.
+        This method uses the summarizer to generate the summary of the loaded content in chunks,
+        and stream the summary back to the client as a JSON response.
 
         Parameters
         ----------
@@ -122,27 +171,124 @@ class StreamingStrategy(BaseExecutionStrategy):
         StreamingResponse
             A streaming response containing chunks of the generated summary and metadata.
         """
-        content_to_summarize = summarizer.loader.load()
-        summary_chunks = []
+        # the slot is acquired before answering so rejections are reported with a status code
+        ticket = await summarizer.acquire_generation_slot()
+        return TicketStreamingResponse(
+            self._stream_summary(summarizer, content=content, ticket=ticket),
+            ticket=ticket,
+            media_type='application/json',
+        )
 
+    def replay_summary(self, summary: str, summary_id: str) -> StreamingResponse:
+        """
+        Streams a previously stored summary as a single chunk followed by the summary ID.
+
+        Parameters
+        ----------
+        summary : str
+            The stored summary.
+        summary_id : str
+            The ID of the stored summary.
+
+        Returns
+        -------
+        StreamingResponse
+            A streaming response with the same frames as a generated summary.
+        """
         async def _create_stream_generator() -> AsyncGenerator[Dict[str, Any], None]:
-            async for chunk in summarizer.summarize(content=content_to_summarize):
+            yield json.dumps({"content": summary})
+            yield json.dumps({"content": "", "summary_id": summary_id})
+
+        return StreamingResponse(_create_stream_generator(), media_type='application/json')
+
+    async def _stream_summary(
+        self,
+        summarizer: BaseSummarizer,
+        content: list[Document],
+        ticket: AdmissionTicket,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Streams the chunks of the summary, releasing the generation slot once it is generated,
+        then stores the summary and sends its ID.
+        """
+        summary_chunks = []
+        try:
+            async for chunk in summarizer.summarize(content=content):
                 summary_chunks.append(chunk)
                 yield json.dumps({"content": chunk.content})
+        finally:
+            ticket.release()
 
-            summary_metadata = summarizer.get_metadata(
-                file=summarizer.get_file_path_from_loader(),
-                generation_metadata=summary_chunks[-1]
-            )
+        summary_id = await summarizer.store_generated_summary(
+            _id=summary_chunks[-1].id,
+            summary=summarizer._get_summary_from_chunks(summary_chunks),
+            generation_metadata=summary_chunks[-1],
+        )
 
-            summary_id = await summarizer.store_manager.store_summary(
-                _id=summary_chunks[-1].id,
-                summary=summarizer._get_summary_from_chunks(summary_chunks),
-                metadata=summary_metadata,
-                document=summarizer.get_original_document_as_bytes(),
-            )
+        yield json.dumps({"content": "", "summary_id": summary_id})
 
-            yield json.dumps({"content": "", "summary_id": summary_id})
+
+class PipelinedStreamingStrategy(StreamingStrategy):
+    """
+    Execution strategy streaming the summaries of the sections of a document while it is still
+    being loaded (e.g. transcribed), followed by the final summary.
+
+    The response starts as soon as the documents start being loaded, with one
+    `{"section": <index>, "section_summary": <summary>}` frame per section, in order, then the
+    frames of StreamingStrategy for the final summary. Summarizers which cannot summarize
+    sections (see `BaseSummarizer.SUPPORTS_PIPELINING`) are streamed as with StreamingStrategy.
+
+    As the response starts before the final summary waits for its generation slot, admission
+    rejections interrupt the stream instead of being reported with a status code.
+
+    Methods
+    -------
+    process_summary_generation(summarizer, content)
+        Streams the section summaries while the content is loaded, then the final summary.
+    """
+
+    PIPELINED = True
+
+    async def process_summary_generation(
+        self,
+        summarizer: BaseSummarizer,
+        content: AsyncIterator[Document] | list[Document],
+    ) -> StreamingResponse:
+        """
+        Streams the summaries of the sections of the content while it is loaded, then the final
+        summary.
+
+        Parameters
+        ----------
+        summarizer : BaseSummarizer
+            The summarizer instance responsible for generating the summary.
+        content : AsyncIterator[Document] or list[Document]
+            The documents to summarize, as they are loaded, or already loaded for summarizers
+            which do not support pipelining.
+
+        Returns
+        -------
+        StreamingResponse
+            A streaming response containing the section summaries, the chunks of the final
+            summary and metadata.
+        """
+        if isinstance(content, list):
+            return await super().process_summary_generation(summarizer, content=content)
+
+        async def _create_stream_generator() -> AsyncGenerator[str, None]:
+            index = 0
+            async for section_summary in summarizer.summarize_sections(content):
+                yield json.dumps({"section": index, "section_summary": section_summary})
+                index += 1
+
+            ticket = await summarizer.acquire_generation_slot()
+            try:
+                async for frame in self._stream_summary(
+                    summarizer, content=summarizer.loaded_content, ticket=ticket
+                ):
+                    yield frame
+            finally:
+                ticket.release()
 
         return StreamingResponse(_create_stream_generator(), media_type='application/json')
 
@@ -157,6 +303,8 @@ class InvokeStrategy(BaseExecutionStrategy):
         Executes a runnable task and returns the complete AI message.
     process_summary_generation(summarizer, content)
         Asynchronously processes summary generation and returns the full result.
+    replay_summary(summary, summary_id)
+        Returns a previously stored summary.
     """
 
     def run(self, runnable: Runnable, **kwargs) -> AIMessage:
@@ -200,19 +348,36 @@ class InvokeStrategy(BaseExecutionStrategy):
         Response
             A JSON response containing the generated summary and metadata.
         """
-        summary = await summarizer.summarize(content=summarizer.loader.load())
+        ticket = await summarizer.acquire_generation_slot()
+        try:
+            summary = await summarizer.summarize(content=content)
+        finally:
+            ticket.release()
 
-        summary_metadata = summarizer.get_metadata(
-            file=summarizer.get_file_path_from_loader(),
-            generation_metadata=summary
-        )
-
-        summary_id = await summarizer.store_manager.store_summary(
+        summary_id = await summarizer.store_generated_summary(
             _id=summary.id,
             summary=summary.content,
-            metadata=summary_metadata,
-            document=summarizer.get_original_document_as_bytes(),
+            generation_metadata=summary,
         )
 
         content = json.dumps({'content': summary.content, 'summary_id': summary_id})
         return Response(content=content, media_type='application/json')
+
+    def replay_summary(self, summary: str, summary_id: str) -> Response:
+        """
+        Returns a previously stored summary along with its ID.
+
+        Parameters
+        ----------
+        summary : str
+            The stored summary.
+        summary_id : str
+            The ID of the stored summary.
+
+        Returns
+        -------
+        Response
+            A JSON response with the same content as a generated summary.
+        """
+        content = json.dumps({'content': summary, 'summary_id': summary_id})
+        return Response(content=content, media_type='application/json')
@@ -1,9 +1,11 @@
 from app.summarizers.base import BaseSummarizer
 from app.summarizers.simple_summarizer import SimmpleSummarizer
 from app.summarizers.dynamic_prompts import DynamicPromptSummarizer
+from app.summarizers.map_reduce import MapReduceSummarizer
 
 __all__ = [
     'BaseSummarizer',
     'SimmpleSummarizer',
     'DynamicPromptSummarizer',
+    'MapReduceSummarizer',
 ]
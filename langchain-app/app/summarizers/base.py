@@ -1,12 +1,20 @@
+import asyncio
+import hashlib
+import json
 from abc import ABC, abstractmethod
 from typing import Any, AsyncIterator, Dict
 
 from fastapi.responses import StreamingResponse, Response
 from langchain_core.document_loaders import BaseLoader
 from langchain_core.documents.base import Document
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages.ai import AIMessageChunk, AIMessage
 
+from app.loaders import LoaderExecutor
+from app.resources import get_or_create_resource
 from app.storage import BaseStoreManager
+from app.strategies.admission import AdmissionController, AdmissionTicket
+from app.summarizers.near_duplicates import NearDuplicate, NearDuplicateIndex
 
 
 class BaseSummarizer(ABC):
@@ -21,13 +29,27 @@ class BaseSummarizer(ABC):
         Instance of the store manager handling storage-related operations.
     execution_strategy : BaseExecutionStrategy
         Strategy for executing the summarization process.
+    content_hash : str, optional
+        The hash of the original document bytes, used to reuse previously stored summaries.
+    near_duplicate_threshold : float or None, optional
+        The minimum similarity between the text of two documents for the summary of one to be
+        reused for the other, or None to only reuse summaries of identical documents.
     """
 
+    # bump whenever the prompts change in a way that should invalidate the stored summaries
+    PROMPT_VERSION = 1
+    # whether the summarizer can summarize sections of the documents while they are loaded
+    # (see `summarize_sections`), as pipelined execution strategies do
+    SUPPORTS_PIPELINING = False
+    DEFAULT_NEAR_DUPLICATE_THRESHOLD = NearDuplicateIndex.DEFAULT_THRESHOLD
+
     def __init__(
         self,
         loader: BaseLoader,
         store_manager: BaseStoreManager,
         execution_strategy: "BaseExecutionStrategy",
+        content_hash: str = None,
+        near_duplicate_threshold: float | None = DEFAULT_NEAR_DUPLICATE_THRESHOLD,
     ) -> None:
         """
         Initialize the BaseSummarizer with a loader, store manager, and execution strategy.
@@ -40,10 +62,20 @@ class BaseSummarizer(ABC):
             The store manager responsible for managing summary storage and retrieval.
         execution_strategy : BaseExecutionStrategy
             Defines the strategy to be used for executing the summarization process.
+        content_hash : str, optional
+            The hash of the original document bytes (default is None, which disables the reuse
+            of stored summaries).
+        near_duplicate_threshold : float or None, optional
+            The minimum similarity between the text of two documents for the summary of one to
+            be reused for the other (default is 0.9), or None to disable the near-duplicate
+            lookup.
         """
         self.loader = loader
         self.store_manager = store_manager
         self.execution_strategy = execution_strategy
+        self.content_hash = content_hash
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self._near_duplicate_signature = None
 
     @abstractmethod
     def get_metadata(self, file: str, generation_metadata: dict) -> dict[str, Any]:
@@ -81,34 +113,269 @@ class BaseSummarizer(ABC):
         """
         pass
 
+    def get_fingerprint(self) -> dict[str, Any]:
+        """
+        Describes the summarizer configuration which determines the generated summary.
+
+        Subclasses should extend it with the chat models and any other setting influencing the
+        summary, so documents summarized with different configurations are not mixed up.
+
+        Returns
+        -------
+        dict[str, Any]
+            A JSON-serializable dictionary describing the summarizer configuration.
+        """
+        return {
+            'summarizer': self.__class__.__name__,
+            'prompt_version': self.PROMPT_VERSION,
+        }
+
+    def get_content_key(self) -> str | None:
+        """
+        Computes the key identifying summaries of the current document by this configuration.
+
+        Returns
+        -------
+        str or None
+            The hash of the document bytes combined with the summarizer fingerprint, or None if
+            the document hash is unknown.
+        """
+        if self.content_hash is None:
+            return None
+        fingerprint = json.dumps(self.get_fingerprint(), sort_keys=True)
+        return hashlib.sha256(f"{self.content_hash}:{fingerprint}".encode()).hexdigest()
+
+    def get_fingerprint_key(self) -> str:
+        """
+        Computes a key identifying the summarizer configuration.
+
+        Returns
+        -------
+        str
+            The hash of the summarizer fingerprint.
+        """
+        fingerprint = json.dumps(self.get_fingerprint(), sort_keys=True)
+        return hashlib.sha256(fingerprint.encode()).hexdigest()
+
     async def process_summary_generation(self) -> Response | StreamingResponse:
         """
         Asynchronously processes the generation of a summary using the execution strategy.
 
-        This method loads the content from the loader and then invokes the
-        execution strategy to handle the summarization process.
+        If a summary of the same document bytes was already stored for the same summarizer
+        configuration, it is replayed by the execution strategy without loading the document or
+        calling the chat model. Otherwise, this method loads the content from the loader (once,
+        outside of the event loop) and replays the summary of a near-duplicate document, if
+        any, while the pre-summary work started by `prefetch` runs in the meantime. Only then does
+        it invoke the execution strategy to handle the summarization process.
+
+        With a pipelined execution strategy, summarizers supporting pipelining hand the documents
+        to the execution strategy as they are loaded instead; the near-duplicate lookup, which
+        needs the whole text, is then skipped.
 
         Returns
         -------
         Response or StreamingResponse
             A FastAPI response or streaming response object containing the summary.
         """
+        content_key = self.get_content_key()
+        if content_key is not None:
+            stored_summary = await self.store_manager.get_summary_by_content_key(content_key)
+            if stored_summary is not None:
+                return self.execution_strategy.replay_summary(
+                    summary=stored_summary['summary'],
+                    summary_id=stored_summary['_id'],
+                )
+
+        if self.SUPPORTS_PIPELINING and self.execution_strategy.PIPELINED:
+            return await self.execution_strategy.process_summary_generation(
+                summarizer=self,
+                content=self.alazy_load_content(),
+            )
+
+        content = await self.load_content()
+
+        self.prefetch(content=content)
+        near_duplicate = await self.find_near_duplicate(content=content)
+        if near_duplicate is not None:
+            self.cancel_prefetch()
+            return self.execution_strategy.replay_summary(
+                summary=near_duplicate.summary,
+                summary_id=near_duplicate.summary_id,
+            )
+
+        await self.prepare(content=content)
+
         return await self.execution_strategy.process_summary_generation(
             summarizer=self,
-            content=self.loader.load(),
+            content=content,
+        )
+
+    async def find_near_duplicate(self, content: list[Document]) -> NearDuplicate | None:
+        """
+        Looks for the stored summary of a near-duplicate of the loaded document.
+
+        The MinHash signature of the text is computed outside of the event loop and kept, so
+        the document can be indexed once its summary is stored.
+
+        Parameters
+        ----------
+        content : list[Document]
+            The loaded documents to summarize.
+
+        Returns
+        -------
+        NearDuplicate or None
+            The summary of the most similar document summarized by the same configuration, or
+            None if there is none (or the near-duplicate lookup is disabled).
+        """
+        if self.near_duplicate_threshold is None:
+            return None
+
+        near_duplicate_index = self.get_near_duplicate_index()
+        self._near_duplicate_signature = await asyncio.to_thread(
+            near_duplicate_index.get_signature, self._get_text_from_content(content)
+        )
+        if self._near_duplicate_signature is None:
+            return None
+        return near_duplicate_index.query(
+            scope=self.get_fingerprint_key(), signature=self._near_duplicate_signature
+        )
+
+    def get_near_duplicate_index(self) -> NearDuplicateIndex:
+        """
+        Retrieves the near-duplicate index shared by the summarizers with the same threshold.
+
+        Returns
+        -------
+        NearDuplicateIndex
+            The near-duplicate index.
+        """
+        return get_or_create_resource(
+            'near_duplicate_index', NearDuplicateIndex, threshold=self.near_duplicate_threshold
         )
 
-    def get_original_document_as_bytes(self) -> bytes:
+    def prefetch(self, content: list[Document]) -> None:
+        """
+        Starts the pre-summary work worth overlapping with the near-duplicate lookup.
+
+        The work must run in tasks, which `prepare` awaits and `cancel_prefetch` cancels when a
+        near-duplicate summary is replayed instead, so it should be cheap compared to the
+        generation of the summary. Does nothing by default.
+
+        Parameters
+        ----------
+        content : list[Document]
+            The loaded documents to summarize.
+        """
+        pass
+
+    def cancel_prefetch(self) -> None:
+        """
+        Cancels the pre-summary work started by `prefetch`. Does nothing by default.
+        """
+        pass
+
+    async def prepare(self, content: list[Document]) -> None:
+        """
+        Runs the pre-summary work which does not need the summarization chat model.
+
+        It is called before the execution strategy waits for a generation slot, so slow
+        preliminary steps (e.g. calls to other models) do not hold the slot. Does nothing by
+        default.
+
+        Parameters
+        ----------
+        content : list[Document]
+            The loaded documents to summarize.
+        """
+        pass
+
+    async def load_content(self) -> list[Document]:
+        """
+        Loads the documents from the loader without blocking the event loop.
+
+        The loader runs in the thread or process pool of the shared LoaderExecutor.
+
+        Returns
+        -------
+        list[Document]
+            The loaded documents.
+        """
+        loader_executor = get_or_create_resource('loader_executor', LoaderExecutor)
+        return await loader_executor.load(self.loader)
+
+    def alazy_load_content(self) -> AsyncIterator[Document]:
+        """
+        Loads the documents from the loader lazily, without blocking the event loop.
+
+        Returns
+        -------
+        AsyncIterator[Document]
+            The documents, as they are loaded.
+        """
+        loader_executor = get_or_create_resource('loader_executor', LoaderExecutor)
+        return loader_executor.alazy_load(self.loader)
+
+    async def acquire_generation_slot(self) -> AdmissionTicket:
+        """
+        Waits for a generation slot on the backend of the summarizer chat model.
+
+        Returns
+        -------
+        AdmissionTicket
+            The ticket which must be released once the generation is over.
+
+        Raises
+        ------
+        AdmissionRejectedError
+            If the backend limiter rejects the generation (queue full or waited for too long).
+        """
+        admission_controller = get_or_create_resource('admission_controller', AdmissionController)
+        return await admission_controller.acquire(self.chatmodel)
+
+    async def store_generated_summary(
+        self,
+        _id: str,
+        summary: str,
+        generation_metadata: AIMessage | AIMessageChunk,
+    ) -> str:
         """
-        Retrieves the original document as bytes from the file path provided by the loader.
+        Stores a generated summary along with its metadata and the original document, and
+        indexes the document for the near-duplicate lookup.
+
+        Parameters
+        ----------
+        _id : str
+            The identifier of the message produced by the chat model.
+        summary : str
+            The complete generated summary.
+        generation_metadata : AIMessage or AIMessageChunk
+            The (last) message produced by the chat model, holding the generation metadata.
 
         Returns
         -------
-        bytes
-            The contents of the original document in bytes.
+        str
+            The ID of the stored summary.
         """
-        with open(self.get_file_path_from_loader(), 'rb') as file:
-            return file.read()
+        summary_id = await self.store_manager.store_summary(
+            _id=_id,
+            summary=summary,
+            metadata=self.get_metadata(
+                file=self.get_file_path_from_loader(),
+                generation_metadata=generation_metadata,
+            ),
+            document_path=self.get_file_path_from_loader(),
+            content_key=self.get_content_key(),
+            content_hash=self.content_hash,
+        )
+        if self._near_duplicate_signature is not None:
+            self.get_near_duplicate_index().add(
+                scope=self.get_fingerprint_key(),
+                signature=self._near_duplicate_signature,
+                summary_id=summary_id,
+                summary=summary,
+            )
+        return summary_id
 
     def get_file_path_from_loader(self) -> str:
         """
@@ -154,6 +421,26 @@ class BaseSummarizer(ABC):
         """
         return "".join([chunk.content for chunk in summary_chunks])
 
+    def _get_chatmodel_fingerprint(self, chatmodel: BaseChatModel) -> dict[str, Any]:
+        """
+        Describes the chat model settings relevant to the generated summary.
+
+        Parameters
+        ----------
+        chatmodel : BaseChatModel
+            The chat model to describe.
+
+        Returns
+        -------
+        dict[str, Any]
+            A dictionary with the chat model type, model name and temperature.
+        """
+        return {
+            'type': chatmodel._llm_type,
+            'model': getattr(chatmodel, 'model', None) or getattr(chatmodel, 'model_name', None),
+            'temperature': getattr(chatmodel, 'temperature', None),
+        }
+
     def _get_base_metadata(self, file: str, generation_metadata: Dict) -> Dict[str, Any]:
         """
         Constructs the base metadata for a file, including summarizer and loader information.
@@ -174,6 +461,7 @@ class BaseSummarizer(ABC):
         del response_metadata["message"]
         return {
             'input_file': file,
+            'content_hash': self.content_hash,
             'summarizer': self.__class__.__name__,
             'loader': repr(self.loader),
             **response_metadata,
@@ -1,9 +1,13 @@
+from app.summarizers.builders.spec import SummarizerSpec
 from app.summarizers.builders.base import BaseBuilder
 from app.summarizers.builders.dynamic_prompts import DynamicPromptSummarizerBuilder
 from app.summarizers.builders.simple_summarizer import SimmpleSummarizerBuilder
+from app.summarizers.builders.map_reduce import MapReduceSummarizerBuilder
 
 __all__ = [
     'BaseBuilder',
     'DynamicPromptSummarizerBuilder',
+    'MapReduceSummarizerBuilder',
     'SimmpleSummarizerBuilder',
+    'SummarizerSpec',
 ]
@@ -13,6 +13,8 @@ from app.factories import (
 )
 from app.storage import BaseStoreManager
 from app.strategies.execution import BaseExecutionStrategy
+from app.summarizers import BaseSummarizer
+from app.summarizers.builders.spec import SummarizerSpec
 
 
 class BaseBuilder(ABC):
@@ -21,42 +23,96 @@ class BaseBuilder(ABC):
     and execution strategies for the Summarizer object.
     """
 
-    DEFAULT_CACHE_SERVICE = 'redis'
+    DEFAULT_CACHE_SERVICE = 'tiered'
     DEFAULT_CACHE_HOST = 'redis'
     DEFAULT_CACHE_PORT = 6379
-    DEFAULT_STORE_MANAGER_SERVICE = 'mongodb'
+    DEFAULT_STORE_MANAGER_SERVICE = 'async-mongodb'
 
     def __init__(self) -> None:
         """
-        Initializes the BaseBuilder with default cache, store manager and execution strategy.
+        Initializes the BaseBuilder without creating any component.
 
-        Sets up default instances of the cache, store manager, and execution strategy.
+        The default cache, store manager and execution strategy are only created at build time
+        and only if they were not set beforehand, so overridden components are never created.
         """
         self.loader = None
-        self.cache = self._create_default_cache()
-        self.store_manager = self._create_default_store_manager()
-        self.execution_strategy = self._create_default_execution_strategy()
+        self.content_hash = None
+        self.cache = None
+        self.store_manager = None
+        self.execution_strategy = None
+        self.near_duplicate_threshold = BaseSummarizer.DEFAULT_NEAR_DUPLICATE_THRESHOLD
 
     @abstractmethod
     def build():
         """Abstract method for building the necessary components."""
         pass
 
-    def get_init_params(self):
+    @abstractmethod
+    def build_spec(self) -> SummarizerSpec:
+        """Abstract method for building a reusable spec of the summarizer components."""
+        pass
+
+    def get_init_params(self) -> dict:
         """
         Retrieves the initialized parameters required to create the summarizer or other components.
 
         Returns
         -------
         dict
-            A dictionary containing the loader, store manager, and execution strategy.
+            A dictionary containing the shared components, the loader and the execution strategy.
+        """
+        return {**self.get_shared_params(), **self.get_request_params()}
+
+    def get_shared_params(self) -> dict:
+        """
+        Retrieves the parameters which can be shared by summarizers built for different requests.
+
+        Components which were not set are created from their defaults.
+
+        Returns
+        -------
+        dict
+            A dictionary containing the store manager and the near-duplicate threshold.
         """
+        if self.store_manager is None:
+            self.store_manager = self._create_default_store_manager()
         return {
-            'loader': self.loader,
             'store_manager': self.store_manager,
+            'near_duplicate_threshold': self.near_duplicate_threshold,
+        }
+
+    def get_request_params(self) -> dict:
+        """
+        Retrieves the parameters specific to a single summarization request.
+
+        Components which were not set are created from their defaults.
+
+        Returns
+        -------
+        dict
+            A dictionary containing the loader, the content hash and the execution strategy.
+        """
+        if self.execution_strategy is None:
+            self.execution_strategy = self._create_default_execution_strategy()
+        return {
+            'loader': self.loader,
+            'content_hash': self.content_hash,
             'execution_strategy': self.execution_strategy,
         }
 
+    def get_cache(self) -> BaseCache:
+        """
+        Retrieves the cache, creating the default one if no cache was set.
+
+        Returns
+        -------
+        BaseCache
+            The cache used by the chat models created by this builder.
+        """
+        if self.cache is None:
+            self.cache = self._create_default_cache()
+        return self.cache
+
     def set_store_manager(self, store_manager: str | BaseStoreManager, **kwargs):
         """
         Sets the store manager, either by creating a new instance or using an existing one.
@@ -101,7 +157,12 @@ class BaseBuilder(ABC):
         )
         return self
 
-    def set_loader(self, file_type: str = None, file_path: str = None, loader: BaseLoader = None):
+    def set_loader(
+        self,
+        file_type: str = None,
+        file_path: str = None,
+        loader: str | BaseLoader = None,
+    ):
         """
         Sets the loader, either by creating a new instance or using an existing one.
 
@@ -111,8 +172,9 @@ class BaseBuilder(ABC):
             The type of file to load (default is None).
         file_path : str, optional
             The path to the file to load (default is None).
-        loader : BaseLoader, optional
-            An instance of BaseLoader (default is None).
+        loader : str or BaseLoader, optional
+            The name of the loader or an instance of BaseLoader (default is None, which uses
+            the default loader of the file type).
 
         Returns
         -------
@@ -120,11 +182,46 @@ class BaseBuilder(ABC):
             Returns the current instance of BaseBuilder for method chaining.
         """
         self.loader = (
-            loader if loader is not None
-            else LoaderFactory().create(file_type=file_type, file_path=file_path)
+            loader if isinstance(loader, BaseLoader)
+            else LoaderFactory().create(file_type=file_type, file_path=file_path, loader=loader)
         )
         return self
 
+    def set_content_hash(self, content_hash: str):
+        """
+        Sets the hash of the original document bytes, enabling the reuse of stored summaries.
+
+        Parameters
+        ----------
+        content_hash : str
+            The hash of the original document bytes (e.g. `SpooledUpload.content_hash`).
+
+        Returns
+        -------
+        BaseBuilder
+            Returns the current instance of BaseBuilder for method chaining.
+        """
+        self.content_hash = content_hash
+        return self
+
+    def set_near_duplicate_threshold(self, threshold: float | None):
+        """
+        Sets the minimum similarity for the summary of a near-duplicate document to be reused.
+
+        Parameters
+        ----------
+        threshold : float or None
+            The minimum estimated Jaccard similarity (between 0 and 1) between the text of two
+            documents, or None to disable the near-duplicate lookup.
+
+        Returns
+        -------
+        BaseBuilder
+            Returns the current instance of BaseBuilder for method chaining.
+        """
+        self.near_duplicate_threshold = threshold
+        return self
+
     def set_execution_strategy(self, execution_strategy: str | BaseExecutionStrategy):
         """
         Sets the execution strategy, either by creating a new instance or using an existing one.
@@ -165,7 +262,7 @@ class BaseBuilder(ABC):
         """
         return (
             chatmodel if isinstance(chatmodel, BaseChatModel)
-            else ChatModelFactory().create(chatmodel=service, cache=self.cache, **kwargs)
+            else ChatModelFactory().create(chatmodel=service, cache=self.get_cache(), **kwargs)
         )
 
     def _create_default_store_manager(self) -> BaseStoreManager:
@@ -1,7 +1,10 @@
 from langchain_core.language_models.chat_models import BaseChatModel
 
+from app.caches import DocumentInfoCache
+from app.factories import CacheFactory
 from app.summarizers import DynamicPromptSummarizer
 from app.summarizers.builders import BaseBuilder
+from app.summarizers.builders.spec import SummarizerSpec
 
 
 class DynamicPromptSummarizerBuilder(BaseBuilder):
@@ -20,16 +23,25 @@ class DynamicPromptSummarizerBuilder(BaseBuilder):
         'model': 'gemini-1.5-flash',
         'temperature': 0,
     }
+    DEFAULT_DOCUMENT_INFO_CACHE_SERVICE = 'document-info'
 
     def __init__(self) -> None:
         """
-        Initializes the DynamicPromptSummarizerBuilder with default chat and extraction models.
+        Initializes the DynamicPromptSummarizerBuilder with default chat and extraction model
+        settings.
 
-        Sets up the default instances of the chat model and extraction chat model.
+        Both chat models are only created at build time, from the settings provided by the
+        setters or from the defaults.
         """
         super().__init__()
-        self.chatmodel = self._create_default_chatmodel()
-        self.extraction_chatmodel = self._create_default_extraction_chatmodel()
+        self.chatmodel = None
+        self.chatmodel_service = self.DEFAULT_CHATMODEL_SERVICE
+        self.chatmodel_kwargs = self.DEFAULT_CHATMODEL_KWARGS
+        self.extraction_chatmodel = None
+        self.extraction_chatmodel_service = self.DEFAULT_EXTRACTION_CHATMODEL_SERVICE
+        self.extraction_chatmodel_kwargs = self.DEFAULT_EXTRACTION_CHATMODEL_KWARGS
+        self.extraction_timeout = DynamicPromptSummarizer.DEFAULT_EXTRACTION_TIMEOUT
+        self.document_info_cache = None
 
     def build(self) -> DynamicPromptSummarizer:
         """
@@ -45,23 +57,52 @@ class DynamicPromptSummarizerBuilder(BaseBuilder):
         """
         return DynamicPromptSummarizer(**self.get_init_params())
 
-    def get_init_params(self) -> dict:
+    def build_spec(self) -> SummarizerSpec:
         """
-        Retrieves the initialization parameters for building the `DynamicPromptSummarizer`.
+        Builds a reusable spec of the `DynamicPromptSummarizer` shared components.
 
-        Includes the chat model, extraction chat model, and other parameters like loader,
-        store manager, and execution strategy.
+        Returns
+        -------
+        SummarizerSpec
+            The spec from which a `DynamicPromptSummarizer` can be built for each request.
+        """
+        return SummarizerSpec(
+            summarizer_class=DynamicPromptSummarizer, params=self.get_shared_params()
+        )
+
+    def get_shared_params(self) -> dict:
+        """
+        Retrieves the shared initialization parameters for building the `DynamicPromptSummarizer`.
+
+        Includes the chat model, extraction chat model, document info cache, and other
+        parameters like the store manager.
 
         Returns
         -------
         dict
-            A dictionary of parameters needed to initialize the `DynamicPromptSummarizer`.
+            A dictionary of shared parameters needed to initialize the `DynamicPromptSummarizer`.
         """
+        if self.chatmodel is None:
+            self.chatmodel = self._create_chatmodel(
+                service=self.chatmodel_service, **self.chatmodel_kwargs
+            )
+        if self.extraction_chatmodel is None:
+            self.extraction_chatmodel = self._create_chatmodel(
+                service=self.extraction_chatmodel_service, **self.extraction_chatmodel_kwargs
+            )
+        if self.document_info_cache is None:
+            self.document_info_cache = CacheFactory().create(
+                cache=self.DEFAULT_DOCUMENT_INFO_CACHE_SERVICE,
+                host=self.DEFAULT_CACHE_HOST,
+                port=self.DEFAULT_CACHE_PORT,
+            )
         params = {
             "chatmodel": self.chatmodel,
             "extraction_chatmodel": self.extraction_chatmodel,
+            "extraction_timeout": self.extraction_timeout,
+            "document_info_cache": self.document_info_cache,
         }
-        params.update(super().get_init_params())
+        params.update(super().get_shared_params())
         return params
 
     def set_chatmodel(self, service: str, chatmodel: BaseChatModel = None, **kwargs):
@@ -69,7 +110,7 @@ class DynamicPromptSummarizerBuilder(BaseBuilder):
         Sets the chat model, either by using an existing chat model instance or creating one.
 
         Combines the default chat model keyword arguments with any additional keyword arguments
-        passed in.
+        passed in. The chat model is only created at build time.
 
         Parameters
         ----------
@@ -85,9 +126,9 @@ class DynamicPromptSummarizerBuilder(BaseBuilder):
         DynamicPromptSummarizerBuilder
             The current instance of the builder, allowing method chaining.
         """
-        combined_kwargs = {**self.DEFAULT_CHATMODEL_KWARGS, **kwargs}
-        chatmodel = self._create_chatmodel(service=service, chatmodel=chatmodel, **combined_kwargs)
         self.chatmodel = chatmodel
+        self.chatmodel_service = service
+        self.chatmodel_kwargs = {**self.DEFAULT_CHATMODEL_KWARGS, **kwargs}
         return self
 
     def set_extraction_chatmodel(self, service: str, chatmodel: BaseChatModel = None, **kwargs):
@@ -95,7 +136,7 @@ class DynamicPromptSummarizerBuilder(BaseBuilder):
         Sets the extraction chat model, either by using an existing instance or creating one.
 
         Combines the default extraction chat model keyword arguments with any additional keyword
-        arguments passed in.
+        arguments passed in. The extraction chat model is only created at build time.
 
         Parameters
         ----------
@@ -111,19 +152,47 @@ class DynamicPromptSummarizerBuilder(BaseBuilder):
         DynamicPromptSummarizerBuilder
             The current instance of the builder, allowing method chaining.
         """
-        combined_kwargs = {**self.DEFAULT_EXTRACTION_CHATMODEL_KWARGS, **kwargs}
-        self.extraction_chatmodel = self._create_chatmodel(
-            service=service, chatmodel=chatmodel, **combined_kwargs
-        )
+        self.extraction_chatmodel = chatmodel
+        self.extraction_chatmodel_service = service
+        self.extraction_chatmodel_kwargs = {**self.DEFAULT_EXTRACTION_CHATMODEL_KWARGS, **kwargs}
         return self
 
-    def _create_default_chatmodel(self) -> BaseChatModel:
-        return self._create_chatmodel(
-            service=self.DEFAULT_CHATMODEL_SERVICE, **self.DEFAULT_CHATMODEL_KWARGS
-        )
+    def set_extraction_timeout(self, extraction_timeout: float):
+        """
+        Sets the maximum time spent extracting structured information from the document.
+
+        Parameters
+        ----------
+        extraction_timeout : float
+            The timeout, in seconds, after which default document information is used.
+
+        Returns
+        -------
+        DynamicPromptSummarizerBuilder
+            The current instance of the builder, allowing method chaining.
+        """
+        self.extraction_timeout = extraction_timeout
+        return self
+
+    def set_document_info_cache(self, cache: str | DocumentInfoCache, **kwargs):
+        """
+        Sets the cache of the extracted structured information, either by creating a new
+        instance or using an existing one.
+
+        Parameters
+        ----------
+        cache : str or DocumentInfoCache
+            The name of the cache service or an instance of DocumentInfoCache.
+        **kwargs : dict
+            Additional keyword arguments for creating a new cache instance.
 
-    def _create_default_extraction_chatmodel(self) -> BaseChatModel:
-        return self._create_chatmodel(
-            service=self.DEFAULT_EXTRACTION_CHATMODEL_SERVICE,
-            **self.DEFAULT_EXTRACTION_CHATMODEL_KWARGS
+        Returns
+        -------
+        DynamicPromptSummarizerBuilder
+            The current instance of the builder, allowing method chaining.
+        """
+        self.document_info_cache = (
+            cache if isinstance(cache, DocumentInfoCache)
+            else CacheFactory().create(cache=cache, **kwargs)
         )
+        return self
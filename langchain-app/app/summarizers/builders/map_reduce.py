@@ -0,0 +1,211 @@
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from app.caches import ChunkSummaryCache
+from app.factories import CacheFactory
+from app.summarizers import MapReduceSummarizer
+from app.summarizers.builders import BaseBuilder
+from app.summarizers.builders.spec import SummarizerSpec
+
+
+class MapReduceSummarizerBuilder(BaseBuilder):
+    """
+    Builder class for creating a `MapReduceSummarizer` instance with configurable chat model,
+    chunk size, concurrency and context sizing.
+    """
+
+    DEFAULT_CHATMODEL_SERVICE = 'ollama'
+    DEFAULT_CHATMODEL_KWARGS = {
+        'model': 'llama3.1',
+        'base_url': 'http://ollama-server:11434',
+    }
+    DEFAULT_CHUNK_SUMMARY_CACHE_SERVICE = 'chunk-summary'
+
+    def __init__(self) -> None:
+        """
+        Initializes the MapReduceSummarizerBuilder with the default chat model and chunking
+        settings.
+
+        The chat model is only created at build time, from the settings provided by
+        `set_chatmodel` or from the defaults.
+        """
+        super().__init__()
+        self.chatmodel = None
+        self.chatmodel_service = self.DEFAULT_CHATMODEL_SERVICE
+        self.chatmodel_kwargs = self.DEFAULT_CHATMODEL_KWARGS
+        self.chunk_size = MapReduceSummarizer.DEFAULT_CHUNK_SIZE
+        self.max_concurrency = MapReduceSummarizer.DEFAULT_MAX_CONCURRENCY
+        self.incremental = True
+        self.chunk_summary_cache = None
+        self.context_sizing = True
+        self.max_context_size = MapReduceSummarizer.DEFAULT_MAX_CONTEXT_SIZE
+
+    def build(self) -> MapReduceSummarizer:
+        """
+        Builds and returns a `MapReduceSummarizer` instance.
+
+        Returns
+        -------
+        MapReduceSummarizer
+            The configured `MapReduceSummarizer` instance.
+        """
+        return MapReduceSummarizer(**self.get_init_params())
+
+    def build_spec(self) -> SummarizerSpec:
+        """
+        Builds a reusable spec of the `MapReduceSummarizer` shared components.
+
+        Returns
+        -------
+        SummarizerSpec
+            The spec from which a `MapReduceSummarizer` can be built for each request.
+        """
+        return SummarizerSpec(
+            summarizer_class=MapReduceSummarizer, params=self.get_shared_params()
+        )
+
+    def get_shared_params(self) -> dict:
+        """
+        Retrieves the shared initialization parameters for building the `MapReduceSummarizer`.
+
+        Includes the chat model, the chunking settings, the chunk summary cache (in incremental
+        mode), the context sizing settings, and other parameters like the store manager.
+
+        Returns
+        -------
+        dict
+            A dictionary of shared parameters needed to initialize the `MapReduceSummarizer`.
+        """
+        if self.chatmodel is None:
+            self.chatmodel = self._create_chatmodel(
+                service=self.chatmodel_service, **self.chatmodel_kwargs
+            )
+        if self.incremental and self.chunk_summary_cache is None:
+            self.chunk_summary_cache = CacheFactory().create(
+                cache=self.DEFAULT_CHUNK_SUMMARY_CACHE_SERVICE,
+                host=self.DEFAULT_CACHE_HOST,
+                port=self.DEFAULT_CACHE_PORT,
+            )
+        params = {
+            "chatmodel": self.chatmodel,
+            "chunk_size": self.chunk_size,
+            "max_concurrency": self.max_concurrency,
+            "chunk_summary_cache": self.chunk_summary_cache if self.incremental else None,
+            "context_sizing": self.context_sizing,
+            "max_context_size": self.max_context_size,
+        }
+        params.update(super().get_shared_params())
+        return params
+
+    def set_chatmodel(self, service: str, chatmodel: BaseChatModel = None, **kwargs):
+        """
+        Sets the chat model, either by using an existing chat model instance or creating one.
+
+        Combines the default chat model keyword arguments with any additional keyword arguments
+        passed in. The chat model is only created at build time.
+
+        Parameters
+        ----------
+        service : str
+            The name of the chat model service to use.
+        chatmodel : BaseChatModel, optional
+            An existing instance of `BaseChatModel`, if available (default is None).
+        **kwargs : dict
+            Additional keyword arguments to customize the chat model configuration.
+
+        Returns
+        -------
+        MapReduceSummarizerBuilder
+            The current instance of the builder, allowing method chaining.
+        """
+        self.chatmodel = chatmodel
+        self.chatmodel_service = service
+        self.chatmodel_kwargs = {**self.DEFAULT_CHATMODEL_KWARGS, **kwargs}
+        return self
+
+    def set_chunk_size(self, chunk_size: int):
+        """
+        Sets the maximum number of (estimated) tokens per chunk.
+
+        Parameters
+        ----------
+        chunk_size : int
+            The maximum number of tokens per chunk. With context sizing, the context window of
+            Ollama chat models is sized for it (and it is reduced if it does not fit in the
+            largest context window).
+
+        Returns
+        -------
+        MapReduceSummarizerBuilder
+            The current instance of the builder, allowing method chaining.
+        """
+        self.chunk_size = chunk_size
+        return self
+
+    def set_max_concurrency(self, max_concurrency: int):
+        """
+        Sets the maximum number of partial summaries generated concurrently.
+
+        Parameters
+        ----------
+        max_concurrency : int
+            The maximum number of concurrent generations per document.
+
+        Returns
+        -------
+        MapReduceSummarizerBuilder
+            The current instance of the builder, allowing method chaining.
+        """
+        self.max_concurrency = max_concurrency
+        return self
+
+    def set_incremental(self, incremental: bool, cache: str | ChunkSummaryCache = None, **kwargs):
+        """
+        Enables or disables the incremental mode, in which the partial summaries are cached so
+        new revisions of a document only summarize their changed chunks again.
+
+        Parameters
+        ----------
+        incremental : bool
+            Whether to enable the incremental mode (enabled by default).
+        cache : str or ChunkSummaryCache, optional
+            The name of the cache service or an instance of ChunkSummaryCache (default is None,
+            which uses the default chunk summary cache).
+        **kwargs : dict
+            Additional keyword arguments for creating a new cache instance.
+
+        Returns
+        -------
+        MapReduceSummarizerBuilder
+            The current instance of the builder, allowing method chaining.
+        """
+        self.incremental = incremental
+        if cache is not None:
+            self.chunk_summary_cache = (
+                cache if isinstance(cache, ChunkSummaryCache)
+                else CacheFactory().create(cache=cache, **kwargs)
+            )
+        return self
+
+    def set_context_sizing(self, context_sizing: bool, max_context_size: int = None):
+        """
+        Configures the sizing of the context window and output budget of Ollama chat models
+        from the chunk size.
+
+        Parameters
+        ----------
+        context_sizing : bool
+            Whether to size the context window and output budget from the chunk size (enabled
+            by default).
+        max_context_size : int, optional
+            The largest context window supported by the chat model (default is None, which keeps
+            the current value).
+
+        Returns
+        -------
+        MapReduceSummarizerBuilder
+            The current instance of the builder, allowing method chaining.
+        """
+        self.context_sizing = context_sizing
+        if max_context_size is not None:
+            self.max_context_size = max_context_size
+        return self
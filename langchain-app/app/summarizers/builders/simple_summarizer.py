@@ -2,6 +2,7 @@ from langchain_core.language_models.chat_models import BaseChatModel
 
 from app.summarizers import SimmpleSummarizer
 from app.summarizers.builders import BaseBuilder
+from app.summarizers.builders.spec import SummarizerSpec
 
 
 class SimmpleSummarizerBuilder(BaseBuilder):
@@ -18,13 +19,18 @@ class SimmpleSummarizerBuilder(BaseBuilder):
 
     def __init__(self) -> None:
         """
-        Initializes the SimmpleSummarizerBuilder with the default chat model.
+        Initializes the SimmpleSummarizerBuilder with the default chat model settings.
 
-        Sets up the default chat model and initializes the `has_system_msg_support` flag.
+        The chat model is only created at build time, from the settings provided by
+        `set_chatmodel` or from the defaults.
         """
         super().__init__()
-        self.chatmodel = self._create_default_chatmodel()
+        self.chatmodel = None
+        self.chatmodel_service = self.DEFAULT_CHATMODEL_SERVICE
+        self.chatmodel_kwargs = self.DEFAULT_CHATMODEL_KWARGS
         self.has_system_msg_support = False
+        self.context_sizing = True
+        self.max_context_size = SimmpleSummarizer.DEFAULT_MAX_CONTEXT_SIZE
 
     def build(self) -> SimmpleSummarizer:
         """
@@ -40,23 +46,40 @@ class SimmpleSummarizerBuilder(BaseBuilder):
         """
         return SimmpleSummarizer(**self.get_init_params())
 
-    def get_init_params(self) -> dict:
+    def build_spec(self) -> SummarizerSpec:
         """
-        Retrieves the initialization parameters for building the `SimmpleSummarizer`.
+        Builds a reusable spec of the `SimmpleSummarizer` shared components.
 
-        Includes the chat model, system message support, and other parameters like loader,
-        store manager, and execution strategy.
+        Returns
+        -------
+        SummarizerSpec
+            The spec from which a `SimmpleSummarizer` can be built for each request.
+        """
+        return SummarizerSpec(summarizer_class=SimmpleSummarizer, params=self.get_shared_params())
+
+    def get_shared_params(self) -> dict:
+        """
+        Retrieves the shared initialization parameters for building the `SimmpleSummarizer`.
+
+        Includes the chat model, system message support, the context sizing settings, and other
+        parameters like the store manager.
 
         Returns
         -------
         dict
-            A dictionary of parameters needed to initialize the `SimmpleSummarizer`.
+            A dictionary of shared parameters needed to initialize the `SimmpleSummarizer`.
         """
+        if self.chatmodel is None:
+            self.chatmodel = self._create_chatmodel(
+                service=self.chatmodel_service, **self.chatmodel_kwargs
+            )
         params = {
             "chatmodel": self.chatmodel,
             "has_system_msg_support": self.has_system_msg_support,
+            "context_sizing": self.context_sizing,
+            "max_context_size": self.max_context_size,
         }
-        params.update(super().get_init_params())
+        params.update(super().get_shared_params())
         return params
 
     def set_chatmodel(self, service: str, chatmodel: BaseChatModel = None, **kwargs):
@@ -64,7 +87,7 @@ class SimmpleSummarizerBuilder(BaseBuilder):
         Sets the chat model, either by using an existing chat model instance or creating one.
 
         Combines the default chat model keyword arguments with any additional keyword arguments
-        passed in.
+        passed in. The chat model is only created at build time.
 
         Parameters
         ----------
@@ -80,10 +103,9 @@ class SimmpleSummarizerBuilder(BaseBuilder):
         SimmpleSummarizerBuilder
             The current instance of the builder, allowing method chaining.
         """
-        combined_kwargs = {**self.DEFAULT_CHATMODEL_KWARGS, **kwargs}
-        self.chatmodel = self._create_chatmodel(
-            service=service, chatmodel=chatmodel, **combined_kwargs
-        )
+        self.chatmodel = chatmodel
+        self.chatmodel_service = service
+        self.chatmodel_kwargs = {**self.DEFAULT_CHATMODEL_KWARGS, **kwargs}
         return self
 
     def set_system_msg_support(self, has_system_msg_support: bool):
@@ -103,7 +125,26 @@ class SimmpleSummarizerBuilder(BaseBuilder):
         self.has_system_msg_support = has_system_msg_support
         return self
 
-    def _create_default_chatmodel(self) -> BaseChatModel:
-        return self._create_chatmodel(
-            service=self.DEFAULT_CHATMODEL_SERVICE, **self.DEFAULT_CHATMODEL_KWARGS
-        )
+    def set_context_sizing(self, context_sizing: bool, max_context_size: int = None):
+        """
+        Configures the sizing of the context window and output budget of Ollama chat models
+        for each document.
+
+        Parameters
+        ----------
+        context_sizing : bool
+            Whether to size the context window and output budget for each document (enabled by
+            default).
+        max_context_size : int, optional
+            The largest context window supported by the chat model (default is None, which keeps
+            the current value).
+
+        Returns
+        -------
+        SimmpleSummarizerBuilder
+            The current instance of the builder, allowing method chaining.
+        """
+        self.context_sizing = context_sizing
+        if max_context_size is not None:
+            self.max_context_size = max_context_size
+        return self
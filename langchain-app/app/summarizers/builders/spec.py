@@ -0,0 +1,82 @@
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from langchain_core.document_loaders import BaseLoader
+
+from app.factories import ExecutionStrategyFactory, LoaderFactory
+from app.strategies.execution import BaseExecutionStrategy
+from app.summarizers import BaseSummarizer
+
+
+@dataclass(frozen=True)
+class SummarizerSpec:
+    """
+    Frozen description of a summarizer pipeline, built once and stamped out per request.
+
+    The spec holds the components shared by every request (chat models, cache, store manager),
+    so building a summarizer from it only creates the per-request loader and execution strategy.
+
+    Attributes
+    ----------
+    summarizer_class : type[BaseSummarizer]
+        The summarizer class instantiated by `build`.
+    params : Mapping[str, Any]
+        The shared initialization parameters passed to the summarizer class.
+    """
+
+    summarizer_class: type[BaseSummarizer]
+    params: Mapping[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, 'params', MappingProxyType(dict(self.params)))
+
+    def build(
+        self,
+        execution_strategy: str | BaseExecutionStrategy,
+        file_type: str = None,
+        file_path: str = None,
+        loader: str | BaseLoader = None,
+        content_hash: str = None,
+    ) -> BaseSummarizer:
+        """
+        Builds a summarizer for a single request from the shared components of the spec.
+
+        Parameters
+        ----------
+        execution_strategy : str or BaseExecutionStrategy
+            The name of the execution strategy or an instance of BaseExecutionStrategy.
+        file_type : str, optional
+            The MIME type of the file to load (default is None).
+        file_path : str, optional
+            The path to the file to load (default is None).
+        loader : str or BaseLoader, optional
+            The name of the loader of `file_type` and `file_path`, or an instance of BaseLoader
+            used instead of them (default is None, which uses the default loader of the file
+            type).
+        content_hash : str, optional
+            The hash of the original document bytes, enabling the reuse of stored summaries
+            (default is None).
+
+        Returns
+        -------
+        BaseSummarizer
+            The summarizer instance for the request.
+
+        Examples
+        --------
+        >>> spec = SimmpleSummarizerBuilder().set_chatmodel(service='ollama').build_spec()
+        >>> summarizer = spec.build('invoke', file_type='application/pdf', file_path='/tmp/a.pdf')
+        """
+        return self.summarizer_class(
+            loader=(
+                loader if isinstance(loader, BaseLoader)
+                else LoaderFactory().create(file_type=file_type, file_path=file_path, loader=loader)
+            ),
+            execution_strategy=(
+                execution_strategy if isinstance(execution_strategy, BaseExecutionStrategy)
+                else ExecutionStrategyFactory().create(strategy=execution_strategy)
+            ),
+            content_hash=content_hash,
+            **self.params,
+        )
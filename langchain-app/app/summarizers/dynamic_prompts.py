@@ -1,14 +1,25 @@
+import asyncio
+import hashlib
+import json
+import logging
 from typing import Any, AsyncIterator, Dict
 
 from langchain_core.documents.base import Document
 from langchain_core.messages.ai import AIMessageChunk, AIMessage
 from langchain.chat_models.base import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
 
+from app.caches import DocumentInfoCache
 from app.models import DocumentInfo
+from app.resources import get_or_create_resource
+from app.strategies.admission import AdmissionController
 from app.summarizers import BaseSummarizer
 
 
+logger = logging.getLogger(__name__)
+
+
 class DynamicPromptSummarizer(BaseSummarizer):
     """
     Summarizer that dynamically generates prompts for both extraction and summarization
@@ -21,14 +32,25 @@ class DynamicPromptSummarizer(BaseSummarizer):
         The main chat model used for generating summaries.
     extraction_chatmodel : BaseChatModel
         The chat model used for extracting structured information from the documents.
+    extraction_timeout : float, optional
+        The maximum time, in seconds, spent extracting the structured information before
+        falling back to default values.
+    document_info_cache : DocumentInfoCache, optional
+        The cache of the extracted structured information, reused across summarization models.
     **kwargs : dict
         Additional keyword arguments passed to the BaseSummarizer.
     """
 
+    DEFAULT_EXTRACTION_TIMEOUT = 30.0
+    # bump whenever the extraction prompt changes in a way that should invalidate cached results
+    EXTRACTION_PROMPT_VERSION = 1
+
     def __init__(
         self,
         chatmodel: BaseChatModel,
         extraction_chatmodel: BaseChatModel,
+        extraction_timeout: float = DEFAULT_EXTRACTION_TIMEOUT,
+        document_info_cache: DocumentInfoCache = None,
         **kwargs,
     ) -> None:
         """
@@ -40,12 +62,21 @@ class DynamicPromptSummarizer(BaseSummarizer):
             The main chat model used for summarization.
         extraction_chatmodel : BaseChatModel
             The chat model used for extracting structured information from documents.
+        extraction_timeout : float, optional
+            The maximum time, in seconds, spent extracting the structured information before
+            falling back to default values (default is 30).
+        document_info_cache : DocumentInfoCache, optional
+            The cache of the extracted structured information (default is None, which disables
+            the caching).
         **kwargs : dict
             Additional keyword arguments passed to the BaseSummarizer.
         """
         super().__init__(**kwargs)
         self.chatmodel = chatmodel
         self.extraction_chatmodel = extraction_chatmodel
+        self.extraction_timeout = extraction_timeout
+        self.document_info_cache = document_info_cache
+        self._document_info = None
 
     @property
     def extraction_prompt(self) -> ChatPromptTemplate:
@@ -117,15 +148,151 @@ class DynamicPromptSummarizer(BaseSummarizer):
 
     @property
     def summarization_chain(self):
-        return self.summarization_prompt | self.chatmodel
+        return (
+            RunnableLambda(self._get_summarization_inputs)
+            | self.summarization_prompt
+            | self.chatmodel
+        )
+
+    def get_default_document_info(self) -> Dict[str, Any]:
+        """
+        Structured information used when the extraction fails or times out.
+
+        Returns
+        -------
+        dict[str, Any]
+            A dictionary with every `DocumentInfo` attribute set to None.
+        """
+        return dict.fromkeys(DocumentInfo.__fields__)
+
+    async def extract_document_info(self, text: str) -> Dict[str, Any]:
+        """
+        Asynchronously extracts structured information from the text with the extraction chain.
+
+        The extraction waits for a slot on the backend of the extraction chat model, like the
+        summary generations. Results are cached by the document info cache (if any), so the
+        same text is only extracted once by the same extraction model, whatever the
+        summarization model. If the extraction fails or takes longer than `extraction_timeout`,
+        the default values from `get_default_document_info` are returned instead (and not
+        cached), so the summary is still generated. The time spent waiting for a slot counts
+        towards the timeout, and rejected extractions fall back to the default values as well.
+
+        Parameters
+        ----------
+        text : str
+            The document text.
+
+        Returns
+        -------
+        dict[str, Any]
+            The extracted `DocumentInfo` attributes.
+        """
+        cache_key = None
+        if self.document_info_cache is not None:
+            cache_key = self.get_document_info_cache_key(text)
+            cached_document_info = await self.document_info_cache.get(cache_key)
+            if cached_document_info is not None:
+                return cached_document_info
+
+        async def _extract() -> DocumentInfo | None:
+            admission_controller = get_or_create_resource(
+                'admission_controller', AdmissionController
+            )
+            ticket = await admission_controller.acquire(self.extraction_chatmodel)
+            try:
+                return await self.extraction_chain.ainvoke({"text": text})
+            finally:
+                ticket.release()
+
+        try:
+            document_info = await asyncio.wait_for(_extract(), timeout=self.extraction_timeout)
+        except Exception as error:
+            logger.warning("Falling back to default document info: %r", error)
+            return self.get_default_document_info()
+
+        if document_info is None:
+            return self.get_default_document_info()
+        if cache_key is not None:
+            await self.document_info_cache.set(cache_key, document_info.dict())
+        return document_info.dict()
+
+    def get_document_info_cache_key(self, text: str) -> str:
+        """
+        Computes the key of the structured information extracted from a text.
+
+        The key covers the text, the extraction model and the version of the `DocumentInfo`
+        schema and extraction prompt, but not the summarization model.
+
+        Parameters
+        ----------
+        text : str
+            The document text.
+
+        Returns
+        -------
+        str
+            The document info cache key.
+        """
+        return self.document_info_cache.get_key(
+            text_hash=hashlib.sha256(text.encode()).hexdigest(),
+            extraction_chatmodel=self._get_chatmodel_fingerprint(self.extraction_chatmodel),
+            schema_hash=hashlib.sha256(
+                json.dumps(DocumentInfo.schema(), sort_keys=True).encode()
+            ).hexdigest(),
+            extraction_prompt_version=self.EXTRACTION_PROMPT_VERSION,
+        )
+
+    def prefetch(self, content: list[Document]) -> None:
+        """
+        Starts the structured information extraction as soon as the documents are loaded.
+
+        The extraction (or its document info cache lookup) runs as a task, concurrently with the
+        near-duplicate lookup and the wait for a generation slot, and is awaited by the
+        summarization chain.
+
+        Parameters
+        ----------
+        content : list[Document]
+            The loaded documents to summarize.
+        """
+        self._document_info = asyncio.create_task(
+            self.extract_document_info(self._get_text_from_content(content=content))
+        )
+
+    def cancel_prefetch(self) -> None:
+        """
+        Cancels the structured information extraction when a near-duplicate summary is replayed.
+        """
+        if self._document_info is not None:
+            self._document_info.cancel()
+            self._document_info = None
+
+    async def prepare(self, content: list[Document]) -> None:
+        """
+        Starts the structured information extraction before the generation slot is acquired,
+        unless it was already started by `prefetch`.
+
+        Parameters
+        ----------
+        content : list[Document]
+            The loaded documents to summarize.
+        """
+        if self._document_info is None:
+            self.prefetch(content=content)
+
+    async def _get_summarization_inputs(self, text: str) -> Dict[str, Any]:
+        if self._document_info is None:
+            self._document_info = asyncio.create_task(self.extract_document_info(text))
+        return {"text": text, **await self._document_info}
 
     def summarize(self, content: list[Document]) -> AsyncIterator[AIMessageChunk] | AIMessage:
         """
         Summarizes the provided documents after extracting structured information.
 
         The text content is first extracted from the documents, then structured information
-        is extracted using the extraction chain. Finally, the summarization chain is invoked
-        to generate the final summary.
+        is asynchronously extracted using the extraction chain (unless it was already started by
+        `prefetch` or `prepare`). Finally, the summarization prompt and chat model generate the
+        final summary.
 
         Parameters
         ----------
@@ -138,11 +305,24 @@ class DynamicPromptSummarizer(BaseSummarizer):
             An asynchronous iterator over message chunks or a complete AI message.
         """
         text = self._get_text_from_content(content=content)
-        structured_information = self.extraction_chain.invoke({"text": text})
-        return self.execution_strategy.run(
-            runnable=self.summarization_chain,
-            kwargs={"text": text, **structured_information.dict()},
-        )
+        return self.execution_strategy.run(runnable=self.summarization_chain, input=text)
+
+    def get_fingerprint(self) -> Dict[str, Any]:
+        """
+        Describes the summarizer configuration, including the summarization and extraction
+        chat models.
+
+        Returns
+        -------
+        dict[str, Any]
+            A JSON-serializable dictionary describing the summarizer configuration.
+        """
+        fingerprint = super().get_fingerprint()
+        fingerprint.update({
+            'chatmodel': self._get_chatmodel_fingerprint(self.chatmodel),
+            'extraction_chatmodel': self._get_chatmodel_fingerprint(self.extraction_chatmodel),
+        })
+        return fingerprint
 
     def get_metadata(self, file: str, generation_metadata: Dict) -> Dict[str, Any]:
         """
@@ -171,5 +351,6 @@ class DynamicPromptSummarizer(BaseSummarizer):
             'extraction_chatmodel': repr(self.extraction_chatmodel),
             "extraction_prompt": repr(self.extraction_prompt),
             "structured_straction_schema": DocumentInfo.__class__.__name__,
+            "extraction_timeout": self.extraction_timeout,
         })
         return metadata
@@ -0,0 +1,504 @@
+import asyncio
+import hashlib
+import logging
+from typing import Any, AsyncIterator, Dict
+
+from langchain_core.documents.base import Document
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages.ai import AIMessageChunk, AIMessage
+from langchain_core.prompt_values import PromptValue
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
+from langchain_ollama import ChatOllama
+
+from app.caches import ChunkSummaryCache
+from app.resources import get_or_create_resource
+from app.strategies.admission import AdmissionController
+from app.summarizers import BaseSummarizer
+from app.summarizers.tokens import (
+    estimate_tokens,
+    get_context_size,
+    group_by_token_budget,
+    split_text,
+    split_text_content_defined,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class MapReduceSummarizer(BaseSummarizer):
+    """
+    Summarizer for documents exceeding the context of the chat model.
+
+    The text is split into token-budgeted chunks which are summarized concurrently (map). The
+    partial summaries are then combined, group by group, until they fit in a single chunk
+    (reduce), and the final summary is generated from them by the execution strategy. Documents
+    fitting in a single chunk are summarized directly.
+
+    In pipelined mode (see `summarize_sections`), the documents are summarized section by
+    section while they are still being loaded, e.g. transcribed, and the summaries of the
+    sections are available before the final summary.
+
+    In incremental mode, enabled by a chunk summary cache, chunk and group boundaries are
+    content-defined and every partial summary is cached by the hash of its input text. A new
+    revision of a document then only summarizes its changed chunks, and the groups of partial
+    summaries containing them, again.
+
+    With context sizing, the context window (`num_ctx`) and the output budget (`num_predict`) of
+    Ollama chat models are sized from the chunk size, which bounds the input of every
+    generation, so chunks are never truncated by the default context window of Ollama. Chunk
+    sizes too large for `max_context_size` are reduced to fit.
+
+    Parameters
+    ----------
+    chatmodel : BaseChatModel
+        The chat model generating the partial and final summaries.
+    chunk_size : int, optional
+        The maximum number of (estimated) tokens per chunk, and per group of partial summaries
+        combined at once.
+    max_concurrency : int, optional
+        The maximum number of partial summaries generated concurrently.
+    chunk_summary_cache : ChunkSummaryCache, optional
+        The cache of the partial summaries, enabling the incremental mode.
+    context_sizing : bool, optional
+        Whether to size the context window and output budget of Ollama chat models from the
+        chunk size.
+    max_context_size : int, optional
+        The largest context window supported by the chat model.
+    **kwargs : dict
+        Additional keyword arguments passed to the BaseSummarizer.
+    """
+
+    SUPPORTS_PIPELINING = True
+    DEFAULT_CHUNK_SIZE = 3000
+    DEFAULT_MAX_CONCURRENCY = 4
+    DEFAULT_MAX_CONTEXT_SIZE = 131072  # context length of llama3.1
+    # summaries are asked to keep the key points only, so they are well under their input
+    OUTPUT_BUDGET_RATIO = 0.5
+    MIN_OUTPUT_TOKENS = 256
+    CONTEXT_SIZE_MARGIN = 0.1
+
+    def __init__(
+        self,
+        chatmodel: BaseChatModel,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        chunk_summary_cache: ChunkSummaryCache = None,
+        context_sizing: bool = True,
+        max_context_size: int = DEFAULT_MAX_CONTEXT_SIZE,
+        **kwargs,
+    ) -> None:
+        """
+        Initializes the MapReduceSummarizer with the chat model and the chunking settings.
+
+        Parameters
+        ----------
+        chatmodel : BaseChatModel
+            The chat model generating the partial and final summaries.
+        chunk_size : int, optional
+            The maximum number of (estimated) tokens per chunk (default is 3000).
+        max_concurrency : int, optional
+            The maximum number of partial summaries generated concurrently (default is 4).
+        chunk_summary_cache : ChunkSummaryCache, optional
+            The cache of the partial summaries (default is None, which disables the incremental
+            mode).
+        context_sizing : bool, optional
+            Whether to size the context window and output budget of Ollama chat models from the
+            chunk size (default is True).
+        max_context_size : int, optional
+            The largest context window supported by the chat model (default is 131072).
+        **kwargs : dict
+            Additional keyword arguments passed to the BaseSummarizer.
+        """
+        super().__init__(**kwargs)
+        self.chatmodel = chatmodel
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+        self.chunk_summary_cache = chunk_summary_cache
+        self.context_sizing = context_sizing
+        self.max_context_size = max_context_size
+        self.token_budget = None
+        self._sized_chatmodel = None
+        if context_sizing and isinstance(chatmodel, ChatOllama):
+            self._size_chatmodel()
+        self.num_chunks = None
+        self.num_reduce_steps = 0
+        self.num_generated_summaries = 0
+        self.num_cached_summaries = 0
+        self.loaded_content = None
+        self._partial_summaries = None
+
+    @property
+    def map_prompt(self) -> ChatPromptTemplate:
+        return ChatPromptTemplate.from_messages([
+            (
+                "human",
+                """
+                You are an AI specialized in multi-language summaries. Your task is to summarize
+                the provided text by focusing on the key points, central themes, and significant
+                details.
+                """
+            ),
+            (
+                "human",
+                """
+                Follow these additional guidelines to generate the summary:
+                - Produce the summary in the same language as the input text
+                - Keep the tone and style consistent with the original
+                - Do not add introductions, conclusions, or external knowledge
+                - Do not use verbs in the first person
+                """
+            ),
+            ("human", "{text}"),
+        ])
+
+    @property
+    def reduce_prompt(self) -> ChatPromptTemplate:
+        return ChatPromptTemplate.from_messages([
+            (
+                "human",
+                """
+                You are an AI specialized in multi-language summaries. The following texts are
+                the summaries of consecutive sections of a single document. Combine them into a
+                single, coherent summary of the document, keeping the key points, central themes,
+                and significant details, in the order in which they appear.
+                """
+            ),
+            (
+                "human",
+                """
+                Follow these additional guidelines to generate the summary:
+                - Produce the summary in the same language as the input summaries
+                - Merge repeated information instead of listing it twice
+                - Do not add introductions, conclusions, or external knowledge
+                - Do not use verbs in the first person
+                """
+            ),
+            ("human", "{text}"),
+        ])
+
+    @property
+    def runnable(self):
+        return RunnableLambda(self._get_final_prompt) | (self._sized_chatmodel or self.chatmodel)
+
+    @property
+    def is_incremental(self) -> bool:
+        return self.chunk_summary_cache is not None
+
+    async def prepare(self, content: list[Document]) -> None:
+        """
+        Generates the partial summaries (map) and combines them (reduce) until they fit in a
+        single chunk.
+
+        Each generation waits for its own slot on the chat model backend, so the map and reduce
+        steps are done before the execution strategy acquires the slot of the final summary.
+
+        Parameters
+        ----------
+        content : list[Document]
+            The loaded documents to summarize.
+        """
+        self._partial_summaries = await self.map_reduce(self._get_text_from_content(content))
+
+    async def map_reduce(self, text: str) -> list[str]:
+        """
+        Splits a text into chunks, summarizes them concurrently and combines the summaries
+        hierarchically.
+
+        Parameters
+        ----------
+        text : str
+            The document text.
+
+        Returns
+        -------
+        list[str]
+            The text itself if it fits in a single chunk, otherwise the partial summaries to
+            combine into the final summary.
+        """
+        chunks = (
+            split_text_content_defined(text, max_tokens=self.chunk_size) if self.is_incremental
+            else split_text(text, max_tokens=self.chunk_size)
+        )
+        self.num_chunks = len(chunks)
+        if len(chunks) <= 1:
+            return chunks
+
+        summaries = await self._summarize_concurrently(chunks, step='map')
+        return await self.reduce(summaries)
+
+    async def reduce(self, summaries: list[str]) -> list[str]:
+        """
+        Combines partial summaries, group by group, until they fit in a single chunk.
+
+        Parameters
+        ----------
+        summaries : list[str]
+            The partial summaries, in order.
+
+        Returns
+        -------
+        list[str]
+            The partial summaries to combine into the final summary.
+        """
+        while len(summaries) > 1 and estimate_tokens("\n\n".join(summaries)) > self.chunk_size:
+            groups = group_by_token_budget(
+                summaries, max_tokens=self.chunk_size, content_defined=self.is_incremental
+            )
+            summaries = await self._summarize_concurrently(
+                ["\n\n".join(group) for group in groups], step='reduce'
+            )
+            self.num_reduce_steps += 1
+        return summaries
+
+    async def summarize_sections(self, documents: AsyncIterator[Document]) -> AsyncIterator[str]:
+        """
+        Summarizes documents section by section while they are being loaded (map), yielding
+        the summary of each section, in order, as soon as it is generated.
+
+        Sections gather consecutive documents up to `chunk_size` tokens and are summarized
+        concurrently as soon as they are complete, while the next documents are loaded. Once
+        the documents are exhausted, the summaries of the sections are combined (reduce), so the
+        final summary can be generated by `summarize` from the loaded documents, which are kept
+        in `loaded_content`.
+
+        Parameters
+        ----------
+        documents : AsyncIterator[Document]
+            The documents to summarize, in order (e.g. the segments of a transcription).
+
+        Yields
+        ------
+        str
+            The summaries of the sections, in order.
+        """
+        self.loaded_content = []
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = asyncio.Queue()
+
+        def _put_section(section: list[str]) -> None:
+            for text in split_text("".join(section), max_tokens=self.chunk_size):
+                tasks.put_nowait(
+                    asyncio.create_task(self._summarize(text, step='map', semaphore=semaphore))
+                )
+
+        async def _create_sections() -> None:
+            section, section_tokens = [], 0
+            try:
+                async for document in documents:
+                    self.loaded_content.append(document)
+                    text = self._get_text_from_content([document])
+                    tokens = estimate_tokens(text)
+                    if section and section_tokens + tokens > self.chunk_size:
+                        _put_section(section)
+                        section, section_tokens = [], 0
+                    section.append(text)
+                    section_tokens += tokens
+                if section:
+                    _put_section(section)
+            finally:
+                tasks.put_nowait(None)
+
+        producer = asyncio.create_task(_create_sections())
+        summaries = []
+        try:
+            while (task := await tasks.get()) is not None:
+                summaries.append(await task)
+                yield summaries[-1]
+            await producer
+        finally:
+            producer.cancel()
+            while not tasks.empty():
+                task = tasks.get_nowait()
+                if task is not None:
+                    task.cancel()
+
+        self.num_chunks = len(summaries)
+        self._partial_summaries = await self.reduce(summaries)
+
+    def summarize(self, content: list[Document]) -> AsyncIterator[AIMessageChunk] | AIMessage:
+        """
+        Generates the final summary from the partial summaries.
+
+        The partial summaries must have been generated by `prepare` (or `summarize_sections`)
+        beforehand: they need generation slots of their own, which could never be granted
+        while the slot of the final summary is held.
+
+        Parameters
+        ----------
+        content : list[Document]
+            A list of documents to summarize.
+
+        Returns
+        -------
+        AsyncIterator[AIMessageChunk] or AIMessage
+            An asynchronous iterator over the summary chunks or the complete summary message.
+
+        Raises
+        ------
+        RuntimeError
+            If the partial summaries were not generated yet.
+        """
+        if self._partial_summaries is None:
+            raise RuntimeError(
+                "The partial summaries must be generated by `prepare` before the final summary"
+            )
+        text = self._get_text_from_content(content=content)
+        return self.execution_strategy.run(runnable=self.runnable, input=text)
+
+    def get_fingerprint(self) -> Dict[str, Any]:
+        """
+        Describes the summarizer configuration, including the chat model and chunking settings.
+
+        Returns
+        -------
+        dict[str, Any]
+            A JSON-serializable dictionary describing the summarizer configuration.
+        """
+        fingerprint = super().get_fingerprint()
+        fingerprint.update({
+            'chatmodel': self._get_chatmodel_fingerprint(self.chatmodel),
+            'chunk_size': self.chunk_size,
+            'incremental': self.is_incremental,
+        })
+        return fingerprint
+
+    def get_metadata(self, file: str, generation_metadata: Dict) -> Dict[str, Any]:
+        """
+        Generates metadata related to the summarization process, including the chat model,
+        prompts, and the number of chunks and reduce steps.
+
+        Parameters
+        ----------
+        file : str
+            The path or identifier of the file being summarized.
+        generation_metadata : dict
+            A dictionary containing metadata related to the generation process.
+
+        Returns
+        -------
+        dict[str, Any]
+            A dictionary containing metadata for the summarization.
+        """
+        metadata = self._get_base_metadata(file=file, generation_metadata=generation_metadata)
+        metadata.update({
+            'chatmodel': repr(self.chatmodel),
+            'map_prompt': repr(self.map_prompt),
+            'reduce_prompt': repr(self.reduce_prompt),
+            'chunk_size': self.chunk_size,
+            'max_concurrency': self.max_concurrency,
+            'num_chunks': self.num_chunks,
+            'num_reduce_steps': self.num_reduce_steps,
+            'incremental': self.is_incremental,
+            'num_generated_summaries': self.num_generated_summaries,
+            'num_cached_summaries': self.num_cached_summaries,
+        })
+        if self.token_budget is not None:
+            metadata.update(self.token_budget)
+        return metadata
+
+    def _size_chatmodel(self) -> None:
+        """
+        Sizes the context window and output budget of the chat model for the largest input of a
+        generation (a chunk, or a group of partial summaries, and the longest prompt), reducing
+        the chunk size if it does not fit in `max_context_size`.
+        """
+        prompt_tokens = max(
+            estimate_tokens(prompt.format(text=""))
+            for prompt in (self.map_prompt, self.reduce_prompt)
+        )
+        # largest chunk whose prompt, output and estimation margin fit in the context window
+        max_chunk_size = int(
+            (self.max_context_size / (1 + self.CONTEXT_SIZE_MARGIN) - prompt_tokens)
+            / (1 + self.OUTPUT_BUDGET_RATIO)
+        )
+        if self.chunk_size > max_chunk_size:
+            logger.warning(
+                "Chunks of %d tokens exceed the context window of %d tokens, reducing them to "
+                "%d tokens", self.chunk_size, self.max_context_size, max_chunk_size,
+            )
+            self.chunk_size = max_chunk_size
+
+        input_tokens = prompt_tokens + self.chunk_size
+        output_tokens = max(self.MIN_OUTPUT_TOKENS, int(self.chunk_size * self.OUTPUT_BUDGET_RATIO))
+        num_ctx = get_context_size(
+            input_tokens + output_tokens, self.max_context_size, margin=self.CONTEXT_SIZE_MARGIN
+        )
+        num_predict = min(output_tokens, max(num_ctx - input_tokens, self.MIN_OUTPUT_TOKENS))
+
+        self.token_budget = {
+            'estimated_input_tokens': input_tokens,
+            'estimated_output_tokens': output_tokens,
+            'num_ctx': num_ctx,
+            'num_predict': num_predict,
+        }
+        # the copy shares the HTTP clients of the chat model
+        self._sized_chatmodel = self.chatmodel.model_copy(
+            update={'num_ctx': num_ctx, 'num_predict': num_predict}
+        )
+
+    async def _get_final_prompt(self, text: str) -> PromptValue:
+        if self.num_chunks is not None and self.num_chunks <= 1:
+            return await self.map_prompt.ainvoke({"text": text})
+        return await self.reduce_prompt.ainvoke({"text": "\n\n".join(self._partial_summaries)})
+
+    async def _summarize_concurrently(self, texts: list[str], step: str) -> list[str]:
+        """
+        Summarizes texts concurrently, up to `max_concurrency` at once and within the limits
+        of the admission controller of the chat model backend.
+
+        In incremental mode, summaries found in the chunk summary cache are reused.
+
+        Parameters
+        ----------
+        texts : list[str]
+            The texts to summarize.
+        step : str
+            The step of the summaries, 'map' (chunks of the document) or 'reduce' (groups of
+            partial summaries), selecting the prompt.
+
+        Returns
+        -------
+        list[str]
+            The summaries, in the order of the texts.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(
+            *(self._summarize(text, step=step, semaphore=semaphore) for text in texts)
+        )
+
+    async def _summarize(self, text: str, step: str, semaphore: asyncio.Semaphore) -> str:
+        cache_key = self._get_chunk_summary_cache_key(text, step=step)
+        if cache_key is not None:
+            summary = await self.chunk_summary_cache.get(cache_key)
+            if summary is not None:
+                self.num_cached_summaries += 1
+                return summary
+
+        admission_controller = get_or_create_resource('admission_controller', AdmissionController)
+        runnable = (
+            (self.map_prompt if step == 'map' else self.reduce_prompt)
+            | (self._sized_chatmodel or self.chatmodel)
+        )
+        async with semaphore:
+            ticket = await admission_controller.acquire(self.chatmodel)
+            try:
+                message = await runnable.ainvoke({"text": text})
+            finally:
+                ticket.release()
+
+        self.num_generated_summaries += 1
+        if cache_key is not None:
+            await self.chunk_summary_cache.set(cache_key, message.content)
+        return message.content
+
+    def _get_chunk_summary_cache_key(self, text: str, step: str) -> str | None:
+        if self.chunk_summary_cache is None:
+            return None
+        return self.chunk_summary_cache.get_key(
+            text_hash=hashlib.sha256(text.encode()).hexdigest(),
+            step=step,
+            chatmodel=self._get_chatmodel_fingerprint(self.chatmodel),
+            prompt_version=self.PROMPT_VERSION,
+        )
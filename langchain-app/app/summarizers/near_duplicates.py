@@ -0,0 +1,263 @@
+import re
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+SHINGLE_BATCH_SIZE = 4096  # bounds the (shingles x permutations) matrix computed at once
+
+
+@dataclass(frozen=True)
+class NearDuplicate:
+    """
+    A stored summary whose document is similar to the queried one.
+
+    Attributes
+    ----------
+    summary_id : str
+        The ID of the stored summary.
+    summary : str
+        The stored summary.
+    similarity : float
+        The estimated Jaccard similarity between the shingles of both documents.
+    """
+
+    summary_id: str
+    summary: str
+    similarity: float
+
+
+def get_band_parameters(threshold: float, num_perm: int) -> tuple[int, int]:
+    """
+    Picks the number of LSH bands and rows per band whose similarity threshold, approximated by
+    `(1 / bands) ** (1 / rows)`, is closest to `threshold`.
+
+    Parameters
+    ----------
+    threshold : float
+        The target similarity threshold.
+    num_perm : int
+        The number of MinHash permutations.
+
+    Returns
+    -------
+    tuple[int, int]
+        The number of bands and the number of rows per band.
+    """
+    return min(
+        ((num_perm // rows, rows) for rows in range(1, num_perm + 1)),
+        key=lambda params: abs((1 / params[0]) ** (1 / params[1]) - threshold),
+    )
+
+
+class NearDuplicateIndex:
+    """
+    In-memory index of MinHash signatures of summarized documents, finding stored summaries of
+    near-duplicate documents (e.g. the same report re-exported with a different date).
+
+    Documents are represented by their set of word shingles, whose Jaccard similarity is
+    estimated by MinHash signatures computed locally with numpy. Signatures are split in bands
+    hashed into buckets (locality-sensitive hashing), so a query only compares the signatures
+    sharing a bucket with it instead of the whole index. The oldest entries are evicted once
+    `max_entries` is reached.
+
+    Entries are partitioned by scope (e.g. the summarizer configuration), so documents are only
+    matched against documents summarized by the same configuration.
+
+    Attributes
+    ----------
+    threshold : float
+        The minimum estimated similarity of near-duplicates.
+    num_perm : int
+        The number of MinHash permutations (the size of the signatures).
+    shingle_size : int
+        The number of consecutive words per shingle.
+    max_entries : int
+        The maximum number of indexed documents.
+    bands : int
+        The number of LSH bands.
+    rows : int
+        The number of signature values per band.
+    """
+
+    DEFAULT_THRESHOLD = 0.9
+    DEFAULT_NUM_PERM = 128
+    DEFAULT_SHINGLE_SIZE = 5
+    DEFAULT_MAX_ENTRIES = 10_000
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        seed: int = 1,
+    ) -> None:
+        """
+        Initializes an empty NearDuplicateIndex.
+
+        Parameters
+        ----------
+        threshold : float, optional
+            The minimum estimated similarity of near-duplicates (default is 0.9).
+        num_perm : int, optional
+            The number of MinHash permutations (default is 128).
+        shingle_size : int, optional
+            The number of consecutive words per shingle (default is 5).
+        max_entries : int, optional
+            The maximum number of indexed documents (default is 10000).
+        seed : int, optional
+            The seed of the MinHash permutations (default is 1).
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        self.bands, self.rows = get_band_parameters(threshold=threshold, num_perm=num_perm)
+        self.lookups = 0
+        self.hits = 0
+        self.compared_candidates = 0
+
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._entries: OrderedDict[int, tuple[str, np.ndarray, str, str]] = OrderedDict()
+        self._buckets: dict[tuple[str, int, bytes], set[int]] = {}
+        self._next_entry_id = 0
+
+    def get_signature(self, text: str) -> np.ndarray | None:
+        """
+        Computes the MinHash signature of a text; CPU-bound, so long texts should be handled
+        outside of the event loop.
+
+        Parameters
+        ----------
+        text : str
+            The text of the document.
+
+        Returns
+        -------
+        np.ndarray or None
+            The signature, or None if the text has no words.
+        """
+        words = re.findall(r"\w+", text.lower())
+        if not words:
+            return None
+
+        shingles = {
+            " ".join(words[i:i + self.shingle_size])
+            for i in range(max(1, len(words) - self.shingle_size + 1))
+        }
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode()) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+
+        signature = np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for start in range(0, len(hashes), SHINGLE_BATCH_SIZE):
+                batch = hashes[start:start + SHINGLE_BATCH_SIZE, np.newaxis]
+                permuted = ((batch * self._a + self._b) % MERSENNE_PRIME) & MAX_HASH
+                np.minimum(signature, permuted.min(axis=0), out=signature)
+        return signature
+
+    def query(self, scope: str, signature: np.ndarray) -> NearDuplicate | None:
+        """
+        Finds the most similar indexed document above the similarity threshold.
+
+        Parameters
+        ----------
+        scope : str
+            The scope of the documents to match against.
+        signature : np.ndarray
+            The signature of the queried document.
+
+        Returns
+        -------
+        NearDuplicate or None
+            The stored summary of the most similar document, or None if no indexed document is
+            similar enough.
+        """
+        self.lookups += 1
+        candidates = set()
+        for band_key in self._get_band_keys(scope, signature):
+            candidates.update(self._buckets.get(band_key, ()))
+
+        best_match = None
+        for entry_id in candidates:
+            _, entry_signature, summary_id, summary = self._entries[entry_id]
+            similarity = float(np.mean(entry_signature == signature))
+            if similarity >= self.threshold and (
+                best_match is None or similarity > best_match.similarity
+            ):
+                best_match = NearDuplicate(summary_id, summary, similarity)
+
+        self.compared_candidates += len(candidates)
+        self.hits += best_match is not None
+        return best_match
+
+    def add(self, scope: str, signature: np.ndarray, summary_id: str, summary: str) -> None:
+        """
+        Indexes a summarized document, evicting the oldest entry if the index is full.
+
+        Parameters
+        ----------
+        scope : str
+            The scope of the document.
+        signature : np.ndarray
+            The signature of the document.
+        summary_id : str
+            The ID of the stored summary.
+        summary : str
+            The stored summary.
+        """
+        while len(self._entries) >= self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+        entry_id = self._next_entry_id
+        self._next_entry_id += 1
+        self._entries[entry_id] = (scope, signature, summary_id, summary)
+        for band_key in self._get_band_keys(scope, signature):
+            self._buckets.setdefault(band_key, set()).add(entry_id)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Reports the index settings, its size and the lookup outcomes.
+
+        Returns
+        -------
+        dict[str, Any]
+            The index statistics.
+        """
+        return {
+            'threshold': self.threshold,
+            'bands': self.bands,
+            'rows': self.rows,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'lookups': self.lookups,
+            'hits': self.hits,
+            'avg_compared_candidates': (
+                self.compared_candidates / self.lookups if self.lookups else 0.0
+            ),
+        }
+
+    def _get_band_keys(self, scope: str, signature: np.ndarray) -> list[tuple[str, int, bytes]]:
+        return [
+            (scope, band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def _remove(self, entry_id: int) -> None:
+        scope, signature, _, _ = self._entries.pop(entry_id)
+        for band_key in self._get_band_keys(scope, signature):
+            bucket = self._buckets[band_key]
+            bucket.discard(entry_id)
+            if not bucket:
+                del self._buckets[band_key]
@@ -1,3 +1,4 @@
+import logging
 from typing import Any, AsyncIterator, Dict
 
 from langchain_core.documents.base import Document
@@ -5,8 +6,13 @@ from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages.ai import AIMessageChunk, AIMessage
 from langchain_core.runnables.base import Runnable
 from langchain.prompts import ChatPromptTemplate
+from langchain_ollama import ChatOllama
 
 from app.summarizers import BaseSummarizer
+from app.summarizers.tokens import estimate_tokens, get_context_size
+
+
+logger = logging.getLogger(__name__)
 
 
 class SimmpleSummarizer(BaseSummarizer):
@@ -14,17 +20,40 @@ class SimmpleSummarizer(BaseSummarizer):
     A simple summarizer that generates document summaries using a chat model with an optional
     system message prompt. Inherits from BaseSummarizer.
 
+    With context sizing, the context window (`num_ctx`) and the output budget (`num_predict`) of
+    Ollama chat models are sized for each document from the estimated tokens of the prompt and
+    of the summary (about `SUMMARY_LENGTH_RATIO` of the text, as asked in the prompt), so short
+    documents do not pay for a large context window and long ones are not truncated.
+
     Parameters
     ----------
     chatmodel : BaseChatModel
         The chat model responsible for generating summaries.
     has_system_msg_support : bool, optional
         Indicates if the chat model supports system messages (default is False).
+    context_sizing : bool, optional
+        Whether to size the context window and output budget of Ollama chat models for each
+        document (default is True).
+    max_context_size : int, optional
+        The largest context window supported by the chat model.
     **kwargs : dict
         Additional keyword arguments passed to the BaseSummarizer.
     """
 
-    def __init__(self, chatmodel: BaseChatModel, has_system_msg_support: bool = False, **kwargs):
+    DEFAULT_MAX_CONTEXT_SIZE = 131072  # context length of llama3.1
+    SUMMARY_LENGTH_RATIO = 0.3
+    # the summaries often exceed the requested length, so the output budget has some slack
+    OUTPUT_BUDGET_FACTOR = 1.5
+    MIN_OUTPUT_TOKENS = 256
+
+    def __init__(
+        self,
+        chatmodel: BaseChatModel,
+        has_system_msg_support: bool = False,
+        context_sizing: bool = True,
+        max_context_size: int = DEFAULT_MAX_CONTEXT_SIZE,
+        **kwargs,
+    ):
         """
         Initializes the SimmpleSummarizer with the specified chat model and message type support.
 
@@ -34,11 +63,20 @@ class SimmpleSummarizer(BaseSummarizer):
             The chat model used to generate summaries.
         has_system_msg_support : bool, optional
             Flag to indicate if the chat model supports system messages (default is False).
+        context_sizing : bool, optional
+            Whether to size the context window and output budget of Ollama chat models for each
+            document (default is True).
+        max_context_size : int, optional
+            The largest context window supported by the chat model (default is 131072).
         **kwargs : dict
             Additional keyword arguments passed to the BaseSummarizer.
         """
         self.chatmodel = chatmodel
         self.has_system_msg_support = has_system_msg_support
+        self.context_sizing = context_sizing
+        self.max_context_size = max_context_size
+        self.token_budget = None
+        self._sized_chatmodel = None
         super().__init__(**kwargs)
 
     @property
@@ -76,7 +114,44 @@ class SimmpleSummarizer(BaseSummarizer):
 
     @property
     def runnable(self, **kwargs) -> Runnable:
-        return self.prompt | self.chatmodel
+        return self.prompt | (self._sized_chatmodel or self.chatmodel)
+
+    async def prepare(self, content: list[Document]) -> None:
+        """
+        Sizes the context window and output budget of the chat model for the loaded documents.
+
+        Parameters
+        ----------
+        content : list[Document]
+            The loaded documents to summarize.
+        """
+        if not self.context_sizing or not isinstance(self.chatmodel, ChatOllama):
+            return
+
+        text_tokens = estimate_tokens(self._get_text_from_content(content=content))
+        input_tokens = estimate_tokens(self.prompt.format(text="")) + text_tokens
+        output_tokens = max(
+            self.MIN_OUTPUT_TOKENS,
+            int(text_tokens * self.SUMMARY_LENGTH_RATIO * self.OUTPUT_BUDGET_FACTOR),
+        )
+        num_ctx = get_context_size(input_tokens + output_tokens, self.max_context_size)
+        if input_tokens + output_tokens > num_ctx:
+            logger.warning(
+                "Document of ~%d tokens exceeds the context window of %d tokens; use the "
+                "map-reduce summarizer to summarize it entirely", text_tokens, num_ctx,
+            )
+        num_predict = min(output_tokens, max(num_ctx - input_tokens, self.MIN_OUTPUT_TOKENS))
+
+        self.token_budget = {
+            'estimated_input_tokens': input_tokens,
+            'estimated_output_tokens': output_tokens,
+            'num_ctx': num_ctx,
+            'num_predict': num_predict,
+        }
+        # the copy shares the HTTP clients of the chat model
+        self._sized_chatmodel = self.chatmodel.model_copy(
+            update={'num_ctx': num_ctx, 'num_predict': num_predict}
+        )
 
     def summarize(self, content: list[Document]) -> AsyncIterator[AIMessageChunk] | AIMessage:
         """
@@ -96,10 +171,27 @@ class SimmpleSummarizer(BaseSummarizer):
         text = self._get_text_from_content(content=content)
         return self.execution_strategy.run(runnable=self.runnable, input=text)
 
+    def get_fingerprint(self) -> Dict[str, Any]:
+        """
+        Describes the summarizer configuration, including the chat model and the message type.
+
+        Returns
+        -------
+        dict[str, Any]
+            A JSON-serializable dictionary describing the summarizer configuration.
+        """
+        fingerprint = super().get_fingerprint()
+        fingerprint.update({
+            'chatmodel': self._get_chatmodel_fingerprint(self.chatmodel),
+            'has_system_msg_support': self.has_system_msg_support,
+        })
+        return fingerprint
+
     def get_metadata(self, file: str, generation_metadata: Dict) -> Dict[str, Any]:
         """
         Generates metadata related to the summarization process, including model, prompt,
-        and system message support information.
+        system message support information and, with context sizing, the estimated tokens
+        (next to the actual ones reported by the chat model) and the chat model budget.
 
         Parameters
         ----------
@@ -119,5 +211,8 @@ class SimmpleSummarizer(BaseSummarizer):
             'chatmodel': repr(self.chatmodel),
             'prompt': repr(self.prompt),
             'has_system_msg_support': self.has_system_msg_support,
+            'context_sizing': self.context_sizing,
         })
+        if self.token_budget is not None:
+            metadata.update(self.token_budget)
         return metadata
@@ -0,0 +1,209 @@
+import math
+import re
+import zlib
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+
+# rough average for the tokenizers of the supported models, which avoids downloading (or
+# loading) a tokenizer for every chat model
+CHARS_PER_TOKEN = 4
+# characters outside of ASCII (e.g. Cyrillic or CJK scripts) are split into more tokens, so
+# every additional UTF-8 byte of a character adds this fraction of a token to the estimate
+TOKENS_PER_EXTRA_BYTE = 0.4
+# texts are measured in fractions of tokens, as integers, so the measures of the parts of a
+# text add up exactly to the measure of the text
+TOKEN_UNITS = 20
+UNITS_PER_CHAR = TOKEN_UNITS // CHARS_PER_TOKEN
+UNITS_PER_EXTRA_BYTE = round(TOKEN_UNITS * TOKENS_PER_EXTRA_BYTE)
+# a content-defined chunk ends after about one paragraph in this many, once it is large enough
+CONTENT_DEFINED_BOUNDARY_DIVISOR = 4
+MIN_CONTEXT_SIZE = 2048
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of tokens of a text from its length.
+
+    Characters encoded with several UTF-8 bytes count for more tokens, so texts in non-Latin
+    scripts (about 0.65 token per character for Cyrillic and 1 for CJK) are not undercounted.
+
+    Parameters
+    ----------
+    text : str
+        The text.
+
+    Returns
+    -------
+    int
+        The estimated number of tokens.
+    """
+    return math.ceil(_estimate_token_units(text) / TOKEN_UNITS)
+
+
+def _estimate_token_units(text: str) -> int:
+    # the estimated tokens of a text, in 1/TOKEN_UNITS of a token
+    num_chars = len(text)
+    num_extra_bytes = 0 if text.isascii() else len(text.encode('utf-8')) - num_chars
+    return num_chars * UNITS_PER_CHAR + num_extra_bytes * UNITS_PER_EXTRA_BYTE
+
+
+def get_context_size(num_tokens: int, max_context_size: int, margin: float = 0.1) -> int:
+    """
+    Computes the context window fitting a number of (estimated) tokens.
+
+    The size is rounded up to a power of two (and at least `MIN_CONTEXT_SIZE`), so requests of
+    similar sizes share the same context window: backends like Ollama reload the model whenever
+    the context window changes.
+
+    Parameters
+    ----------
+    num_tokens : int
+        The number of tokens of the prompt and of the generation.
+    max_context_size : int
+        The largest context window supported by the model.
+    margin : float, optional
+        The fraction of tokens added to the estimate, absorbing its error (default is 0.1).
+
+    Returns
+    -------
+    int
+        The context window size, at most `max_context_size`.
+    """
+    num_tokens = math.ceil(num_tokens * (1 + margin))
+    context_size = max(MIN_CONTEXT_SIZE, 1 << (num_tokens - 1).bit_length())
+    return min(context_size, max_context_size)
+
+
+def split_text(text: str, max_tokens: int, overlap_tokens: int = 0) -> list[str]:
+    """
+    Splits a text into chunks of at most `max_tokens` (estimated) tokens, preferably at
+    paragraph, then line, then word boundaries.
+
+    Chunks are measured with the token estimate rather than their length, so texts in
+    non-Latin scripts are split into as many chunks as their tokens require.
+
+    Parameters
+    ----------
+    text : str
+        The text to split.
+    max_tokens : int
+        The maximum number of tokens per chunk.
+    overlap_tokens : int, optional
+        The number of tokens shared by consecutive chunks (default is 0).
+
+    Returns
+    -------
+    list[str]
+        The chunks, in order.
+    """
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=max_tokens * TOKEN_UNITS,
+        chunk_overlap=overlap_tokens * TOKEN_UNITS,
+        length_function=_estimate_token_units,
+    )
+    return splitter.split_text(text)
+
+
+def split_text_content_defined(text: str, max_tokens: int, min_tokens: int = None) -> list[str]:
+    """
+    Splits a text into chunks of at most `max_tokens` (estimated) tokens whose boundaries depend
+    on the content of the paragraphs rather than on their position.
+
+    Once a chunk holds `min_tokens`, it ends after any paragraph whose hash is a multiple of
+    `CONTENT_DEFINED_BOUNDARY_DIVISOR`. An edit therefore mostly changes the chunks around it:
+    past the edit, boundaries soon fall on the same paragraphs as before, so the chunks of
+    unchanged sections keep the same text (and hash) from one revision of a document to the next.
+
+    Parameters
+    ----------
+    text : str
+        The text to split.
+    max_tokens : int
+        The maximum number of tokens per chunk.
+    min_tokens : int, optional
+        The number of tokens from which a chunk can end at a content-defined boundary (default
+        is None, which uses half of `max_tokens`).
+
+    Returns
+    -------
+    list[str]
+        The chunks, in order.
+    """
+    min_tokens = max_tokens // 2 if min_tokens is None else min_tokens
+
+    paragraphs = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        if not paragraph.strip():
+            continue
+        if estimate_tokens(paragraph) > max_tokens:
+            paragraphs.extend(split_text(paragraph, max_tokens=max_tokens))
+        else:
+            paragraphs.append(paragraph)
+
+    chunks, chunk, chunk_tokens = [], [], 0
+    for paragraph in paragraphs:
+        paragraph_tokens = estimate_tokens(paragraph)
+        if chunk and chunk_tokens + paragraph_tokens > max_tokens:
+            chunks.append("\n\n".join(chunk))
+            chunk, chunk_tokens = [], 0
+
+        chunk.append(paragraph)
+        chunk_tokens += paragraph_tokens
+        is_boundary = zlib.crc32(paragraph.encode()) % CONTENT_DEFINED_BOUNDARY_DIVISOR == 0
+        if chunk_tokens >= min_tokens and is_boundary:
+            chunks.append("\n\n".join(chunk))
+            chunk, chunk_tokens = [], 0
+
+    if chunk:
+        chunks.append("\n\n".join(chunk))
+    return chunks
+
+
+def group_by_token_budget(
+    texts: list[str],
+    max_tokens: int,
+    content_defined: bool = False,
+) -> list[list[str]]:
+    """
+    Groups consecutive texts so the (estimated) tokens of each group fit in `max_tokens`.
+
+    Every group holds at least two texts (when there are two or more), so repeatedly combining
+    the groups always converges, even if some texts alone exceed the budget. With
+    `content_defined`, groups holding half of the budget also end after any text whose hash is
+    a multiple of `CONTENT_DEFINED_BOUNDARY_DIVISOR` (see `split_text_content_defined`).
+
+    Parameters
+    ----------
+    texts : list[str]
+        The texts to group, in order.
+    max_tokens : int
+        The maximum number of tokens per group.
+    content_defined : bool, optional
+        Whether group boundaries also depend on the content of the texts (default is False).
+
+    Returns
+    -------
+    list[list[str]]
+        The groups of texts, in order.
+    """
+    groups, group, group_tokens = [], [], 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if len(group) >= 2 and group_tokens + tokens > max_tokens:
+            groups.append(group)
+            group, group_tokens = [], 0
+        group.append(text)
+        group_tokens += tokens
+        if (
+            content_defined and len(group) >= 2 and group_tokens >= max_tokens // 2
+            and zlib.crc32(text.encode()) % CONTENT_DEFINED_BOUNDARY_DIVISOR == 0
+        ):
+            groups.append(group)
+            group, group_tokens = [], 0
+
+    if len(group) == 1 and groups:
+        groups[-1].append(group[0])
+    elif group:
+        groups.append(group)
+    return groups